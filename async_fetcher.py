@@ -0,0 +1,139 @@
+from character_list_parser import extract_character_names
+
+from urllib.parse import urlsplit
+import aiohttp
+import asyncio
+import time
+
+
+class HostRateLimiter:
+    """
+    An asyncio rate limiter that spaces out requests to the same host by a fixed interval.
+
+    Args:
+        interval (float): Minimum number of seconds between two requests to one host.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = {}
+
+    async def wait(self, url: str):
+        """
+        Sleeps until a request to the host of the URL is allowed.
+        """
+        host = urlsplit(url).netloc
+        now = time.monotonic()
+
+        # Reserving a slot needs no lock: the event loop does not switch tasks before the await
+        slot = max(now, self._next_slot.get(host, 0.0))
+        self._next_slot[host] = slot + self.interval
+
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class AsyncFetcher:
+    """
+    Fetches pages with a single pooled aiohttp client.
+
+    Use it as an async context manager so the connection pool is opened once and closed at the end.
+
+    Args:
+        concurrency (int): Maximum number of requests in flight.
+        interval (float): Minimum number of seconds between two requests to the same host.
+        timeout (float): Timeout of a single request in seconds.
+    """
+
+    def __init__(self, concurrency: int = 8, interval: float = 0.0, timeout: float = 10):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.rate_limiter = HostRateLimiter(interval)
+        self.client = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.client = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.client.close()
+
+    async def fetch(self, url: str) -> tuple[int, str]:
+        """
+        Downloads a page.
+
+        Args:
+            url (str): URL of the page.
+
+        Returns:
+            int: HTTP status code of the response.
+            str: The body of the response.
+        """
+        async with self._semaphore:
+            await self.rate_limiter.wait(url)
+
+            async with self.client.get(url) as response:
+                return response.status, await response.text()
+
+    async def iter_parsed(self, urls: list[str], parse, executor=None):
+        """
+        Fetches all URLs concurrently and parses every document as soon as it arrives.
+
+        Parsing runs in `executor` (the default thread pool if None), so downloading the
+        remaining pages overlaps with BeautifulSoup work on the ones already received.
+
+        Args:
+            urls (list of str): URLs of the pages.
+            parse (callable): `parse(url, status, text)` called for every downloaded page.
+            executor (concurrent.futures.Executor, optional): Executor to run `parse` in.
+
+        Yields:
+            tuple: (url, result, error) in completion order. `error` is the raised
+            exception, in which case `result` is None.
+        """
+        loop = asyncio.get_running_loop()
+
+        async def fetch_and_parse(url):
+            try:
+                status, text = await self.fetch(url)
+                return url, await loop.run_in_executor(executor, parse, url, status, text), None
+            except Exception as e:
+                return url, None, e
+
+        tasks = [asyncio.create_task(fetch_and_parse(url)) for url in urls]
+
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+async def fetch_character_names_async(fetcher: AsyncFetcher, url: str = "https://www.prydwen.gg/star-rail/characters") -> tuple[list, int | None]:
+    """
+    Async version of `character_list_parser.fetch_character_names`.
+
+    Args:
+        fetcher (AsyncFetcher): An opened fetcher.
+        url (str): URL of the page containing character links.
+
+    Returns:
+        list: A list of unique character.
+        int: HTTP status code of the response.
+    """
+    try:
+        status, text = await fetcher.fetch(url)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"An error occurred while fetching the page: {e}")
+        return [], None
+
+    if status != 200:
+        return [], status
+
+    return extract_character_names(text), status
@@ -0,0 +1,64 @@
+"""
+Measures fetch + parse throughput of the blocking and the async HTTP pipelines against the local fixture server.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_async_fetch [-d fixtures/pages] [-c 8]
+"""
+from fixture_server import start_fixture_server, fixture_names, FIXTURES_DIR
+from http_fetcher import parse_server_rendered_page
+from async_fetcher import AsyncFetcher
+
+import requests
+import argparse
+import asyncio
+import time
+
+
+def bench_blocking(urls: list[str]) -> float:
+    start = time.perf_counter()
+
+    for url in urls:
+        response = requests.get(url)
+        parse_server_rendered_page(url, response.status_code, response.text)
+
+    return time.perf_counter() - start
+
+
+async def bench_async(urls: list[str], concurrency: int) -> float:
+    start = time.perf_counter()
+
+    async with AsyncFetcher(concurrency=concurrency) as fetcher:
+        async for url, _, error in fetcher.iter_parsed(urls, parse_server_rendered_page):
+            if error is not None:
+                print(f"Error for {url}: {error}")
+
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the blocking and async HTTP pipelines offline.")
+    parser.add_argument("-d", "--directory", type=str, default=FIXTURES_DIR, help="Directory with the saved pages.")
+    parser.add_argument("-c", "--concurrency", type=int, default=8, help="Number of requests in flight for the async pipeline.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of times every page is requested.")
+
+    args = parser.parse_args()
+
+    names = fixture_names(args.directory)
+    if not names:
+        raise SystemExit(f"No saved pages found in {args.directory}")
+
+    server = start_fixture_server(args.directory)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    urls = [f"{base_url}/star-rail/characters/{name}" for name in names] * args.repeat
+
+    try:
+        results = {
+            "blocking": bench_blocking(urls),
+            "async": asyncio.run(bench_async(urls, args.concurrency)),
+        }
+    finally:
+        server.shutdown()
+
+    for name, seconds in results.items():
+        print(f"{name:>8}: {len(urls)} pages in {seconds:.2f} s ({len(urls) / seconds:.1f} pages/s)")
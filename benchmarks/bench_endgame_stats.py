@@ -0,0 +1,60 @@
+"""
+Compares building the roster endgame stats table per character (`characteristics_to_df`
+for every character, then `pd.concat`) with `roster_endgame_stats`, which parses the
+strings of all characters in one loop and builds a single frame.
+
+Run from the repository root after saving some characters:
+
+    python -m benchmarks.bench_endgame_stats [-d data] [-r 5] [-s 10]
+"""
+from character_parser import characteristics_to_df
+from stat_rules import roster_endgame_stats, raw_endgame_stats
+from file_io import open_all_results
+
+import pandas as pd
+
+import contextlib
+import argparse
+import time
+import io
+
+
+def per_character(raw_stats: dict) -> pd.DataFrame:
+    frames = []
+    for char, raws in raw_stats.items():
+        frame = characteristics_to_df(raws)
+        frame.insert(0, "character", char)
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def timed(function, *args, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the roster endgame stats table.")
+    parser.add_argument("-d", "--directory", type=str, default="data", help="Directory with the saved character files.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Number of runs.")
+    parser.add_argument("-s", "--scale", type=int, default=1, help="Repeat the roster this many times to simulate a larger one.")
+
+    args = parser.parse_args()
+
+    raw_stats = raw_endgame_stats(open_all_results(args.directory))
+    if not raw_stats:
+        raise SystemExit(f"No saved endgame stats found in {args.directory}")
+
+    raw_stats = {f"{char}#{copy}": raws for copy in range(args.scale) for char, raws in raw_stats.items()}
+    rows = sum(len(raws) for raws in raw_stats.values())
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        loop = timed(per_character, raw_stats, repeat=args.repeat)
+        one_pass = timed(roster_endgame_stats, raw_stats, repeat=args.repeat)
+
+    print(f"{len(raw_stats)} characters, {rows} stats")
+    print(f"   per character: {loop * 1000:8.1f} ms")
+    print(f"        one pass: {one_pass * 1000:8.1f} ms ({loop / one_pass:.1f}x)")
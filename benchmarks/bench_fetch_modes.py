@@ -0,0 +1,54 @@
+"""
+Compares the plain HTTP and the Selenium fetch paths against the local fixture server.
+
+Save some pages first, e.g. `python main.py -c kafka --save-html fixtures/saved`, then run
+from the repository root:
+
+    python -m benchmarks.bench_fetch_modes [-d fixtures/saved] [-r 3]
+"""
+from fixture_server import start_fixture_server, fixture_names, FIXTURES_DIR
+from character_parser import parse_character_page
+from http_fetcher import fetch_character_page
+from driver_session import DriverSession
+
+import requests
+import argparse
+import time
+
+
+def bench_mode(mode: str, base_url: str, names: list[str], repeat: int) -> list[float]:
+    timings = []
+
+    with DriverSession() as session, requests.Session() as http_session:
+        for _ in range(repeat):
+            for name in names:
+                start = time.perf_counter()
+                _, soup = fetch_character_page(f"{base_url}/star-rail/characters/{name}", session, mode, http_session)
+                parse_character_page(soup)
+                timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the HTTP and Selenium fetch paths offline.")
+    parser.add_argument("-d", "--directory", type=str, default=FIXTURES_DIR, help="Directory with the saved pages.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of passes over the saved pages.")
+
+    args = parser.parse_args()
+
+    names = fixture_names(args.directory)
+    if not names:
+        raise SystemExit(f"No saved pages found in {args.directory}")
+
+    server = start_fixture_server(args.directory)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        results = {mode: bench_mode(mode, base_url, names, args.repeat) for mode in ("http", "selenium")}
+    finally:
+        server.shutdown()
+
+    print(f"{len(names)} pages x {args.repeat} passes")
+    for mode, timings in results.items():
+        print(f"{mode:>8}: total {sum(timings):.2f} s, per page {sum(timings) / len(timings) * 1000:.1f} ms")
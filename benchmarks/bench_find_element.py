@@ -0,0 +1,84 @@
+"""
+Benchmarks `find_element_from_page` in isolation and checks that it matches the
+previous seven-scan implementation on every saved page.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_find_element [-d fixtures/pages] [-r 20]
+"""
+from character_parser import find_element_from_page, count_elements, ELEMENTS
+from fixture_server import fixture_names, FIXTURES_DIR
+from text_utils import make_soup, PARSER_BACKENDS
+
+import contextlib
+import argparse
+import time
+import io
+import os
+
+
+def find_element_by_scans(soup):
+    """
+    The previous implementation: one `find_all` over the whole document per element.
+    """
+    element_counts = {element: len(soup.find_all(class_=element)) for element in ELEMENTS}
+    found_elements = {element: count for element, count in element_counts.items() if count > 0}
+
+    return max(found_elements, key=found_elements.get) if found_elements else None
+
+
+def find_element_by_count(soup):
+    found_elements = {element: count for element, count in count_elements(soup).items() if count > 0}
+
+    return max(found_elements, key=found_elements.get) if found_elements else None
+
+
+def cpu_time(function, soup, repeat: int) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        function(soup)
+    return (time.process_time() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark element detection on saved character pages.")
+    parser.add_argument("-d", "--directory", type=str, default=FIXTURES_DIR, help="Directory with the saved pages.")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="Number of runs per page.")
+    parser.add_argument("-p", "--parser", choices=PARSER_BACKENDS, default="html.parser", help="BeautifulSoup backend.")
+
+    args = parser.parse_args()
+
+    names = fixture_names(args.directory)
+    if not names:
+        raise SystemExit(f"No saved pages found in {args.directory}")
+
+    variants = {
+        "seven scans": find_element_by_scans,
+        "single pass": find_element_by_count,
+        "find_element_from_page": find_element_from_page,
+    }
+    totals = dict.fromkeys(variants, 0.0)
+    mismatches = []
+
+    for name in names:
+        with open(os.path.join(args.directory, f"{name}.html"), 'r', encoding='utf-8') as file:
+            soup = make_soup(file.read(), args.parser)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = {variant: function(soup) for variant, function in variants.items()}
+            for variant, function in variants.items():
+                totals[variant] += cpu_time(function, soup, args.repeat)
+
+        if len(set(results.values())) != 1:
+            mismatches.append((name, results))
+
+    print(f"Per page CPU time over {len(names)} pages:")
+    for variant, seconds in totals.items():
+        print(f"{variant:>24}: {seconds / len(names) * 1000:.3f} ms")
+
+    if mismatches:
+        for name, results in mismatches:
+            print(f"Mismatch on {name}: {results}")
+        raise SystemExit(1)
+
+    print("All variants agree on every page.")
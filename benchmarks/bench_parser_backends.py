@@ -0,0 +1,96 @@
+"""
+Compares the BeautifulSoup backends on saved character pages: parse time and peak memory.
+
+Each backend runs in its own process, so the peak RSS of one backend is not
+inflated by another. Run from the repository root:
+
+    python -m benchmarks.bench_parser_backends [-d fixtures/pages] [-r 3]
+"""
+from character_parser import parse_character_page
+from fixture_server import fixture_names, FIXTURES_DIR
+from text_utils import make_soup, PARSER_BACKENDS
+
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import tracemalloc
+import importlib
+import argparse
+import resource
+import time
+import io
+import os
+
+
+def backend_available(backend: str) -> bool:
+    if backend == "html.parser":
+        return True
+
+    try:
+        importlib.import_module(backend)
+        return True
+    except ImportError:
+        return False
+
+
+def bench_backend(backend: str, pages: list[str], repeat: int) -> dict:
+    soup_seconds = 0.0
+    parse_seconds = 0.0
+
+    tracemalloc.start()
+
+    # The parsers report every section they find, keep the output clean
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for html in pages:
+                start = time.perf_counter()
+                soup = make_soup(html, backend)
+                soup_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                parse_character_page(soup)
+                parse_seconds += time.perf_counter() - start
+
+                soup.decompose()
+
+    _, python_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "soup ms": soup_seconds / (len(pages) * repeat) * 1000,
+        "parse ms": parse_seconds / (len(pages) * repeat) * 1000,
+        "python peak MB": python_peak / (1024 * 1024),
+        # ru_maxrss is in KB on Linux; it also covers the C allocations of lxml
+        "peak RSS MB": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BeautifulSoup backends on saved character pages.")
+    parser.add_argument("-d", "--directory", type=str, default=FIXTURES_DIR, help="Directory with the saved pages.")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="Number of passes over the saved pages.")
+
+    args = parser.parse_args()
+
+    names = fixture_names(args.directory)
+    if not names:
+        raise SystemExit(f"No saved pages found in {args.directory}")
+
+    pages = []
+    for name in names:
+        with open(os.path.join(args.directory, f"{name}.html"), 'r', encoding='utf-8') as file:
+            pages.append(file.read())
+
+    print(f"{len(pages)} pages x {args.repeat} passes")
+    print(f"{'backend':<12} {'soup ms':>10} {'parse ms':>10} {'py peak MB':>12} {'RSS MB':>10}")
+
+    for backend in PARSER_BACKENDS:
+        if not backend_available(backend):
+            print(f"{backend:<12} not installed")
+            continue
+
+        # A fresh process per backend keeps the peak memory numbers independent
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(bench_backend, backend, pages, args.repeat).result()
+
+        print(f"{backend:<12} {result['soup ms']:>10.1f} {result['parse ms']:>10.1f} "
+              f"{result['python peak MB']:>12.1f} {result['peak RSS MB']:>10.1f}")
@@ -0,0 +1,261 @@
+"""
+Offline benchmark of the character page parsers with a stored baseline.
+
+The default corpus is the synthetic pages in fixtures/pages (see
+fixtures/synthetic_pages.py), and benchmarks/baseline.json is recorded on it.
+
+Runs `find_element_from_page`, `build_section_index`, every `parse_*` function and
+`characteristics_to_df` over the saved pages and reports the throughput of
+`parse_character_page` in pages per second, the CPU time of every function per page
+and the peak memory of parsing one page. Results are compared with a baseline, and
+the script exits with code 1 if a metric is worse by more than the threshold, or if
+the baseline was recorded on another corpus (by the hash of the pages) or parser, so
+it can run as a CI step.
+
+Timings are compared relative to a calibration loop of plain Python that runs before
+every measured run, so a baseline recorded on a developer machine stays usable on
+CI hardware of a different speed.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parsers --save-baseline      # record the baseline
+    python -m benchmarks.bench_parsers [-t 0.2]             # compare with it
+"""
+from character_parser import (
+    build_section_index,
+    characteristics_to_df,
+    find_element_from_page,
+    parse_character_page,
+    parse_light_cones,
+    parse_planar_sets,
+    parse_relics,
+    parse_stats,
+    parse_synergy,
+    parse_teams,
+    parse_traces_priority,
+)
+from fixture_server import fixture_names, FIXTURES_DIR
+from text_utils import make_soup, PARSER_BACKENDS
+
+import contextlib
+import tracemalloc
+import argparse
+import hashlib
+import json
+import gc
+import time
+import io
+import os
+
+BASELINE_PATH = "benchmarks/baseline.json"
+
+
+def page_functions(soup):
+    """
+    Returns name -> zero-argument callable for every benchmarked function on one page.
+    """
+    char_element = find_element_from_page(soup)
+    sections = build_section_index(soup, char_element)
+    endgame_stats = parse_stats(soup, char_element, sections)[-1]
+    raw_stats = list(endgame_stats["raw"]) if "raw" in endgame_stats else []
+
+    return {
+        "find_element_from_page": lambda: find_element_from_page(soup),
+        "build_section_index": lambda: build_section_index(soup, char_element),
+        "parse_light_cones": lambda: parse_light_cones(soup, char_element, sections),
+        "parse_relics": lambda: parse_relics(soup, char_element, sections),
+        "parse_planar_sets": lambda: parse_planar_sets(soup, char_element, sections),
+        "parse_stats": lambda: parse_stats(soup, char_element, sections),
+        "characteristics_to_df": lambda: characteristics_to_df(raw_stats),
+        "parse_traces_priority": lambda: parse_traces_priority(soup, char_element, sections),
+        "parse_synergy": lambda: parse_synergy(soup, char_element, sections),
+        "parse_teams": lambda: parse_teams(soup, sections),
+    }
+
+
+@contextlib.contextmanager
+def gc_disabled():
+    # Like timeit: a collection triggered by earlier allocations would be charged to whatever runs next
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def cpu_time(function, repeat: int) -> tuple[float, float]:
+    """
+    Returns the CPU time of the fastest run of `function` and of the calibration loop.
+
+    The fastest run is the least disturbed by the rest of the machine. Every run is
+    preceded by a calibration run, so both minimums are taken over the same stretch
+    of time and a slow phase of the machine (CPU clock, noisy neighbours) affects both.
+    """
+    best, best_calibration = float("inf"), float("inf")
+    with gc_disabled():
+        for _ in range(repeat):
+            start = time.process_time()
+            calibration_workload()
+            best_calibration = min(best_calibration, time.process_time() - start)
+
+            start = time.process_time()
+            function()
+            best = min(best, time.process_time() - start)
+    return best, best_calibration
+
+
+def calibration_workload():
+    # String splitting, dictionary updates and small allocations, the kind of work the parsers do
+    counts = {}
+    for i in range(2000):
+        for word in f"item-{i % 97} value {i % 13}".split():
+            counts[word] = counts.get(word, 0) + 1
+    return counts
+
+
+def corpus_hash(directory: str) -> str:
+    """
+    Returns the SHA-256 of the names and contents of all saved pages of a directory.
+    """
+    digest = hashlib.sha256()
+    for name in fixture_names(directory):
+        with open(os.path.join(directory, f"{name}.html"), 'rb') as file:
+            digest.update(name.encode('utf-8') + b"\0" + file.read() + b"\0")
+    return digest.hexdigest()
+
+
+def run_benchmark(directory: str, repeat: int, parser: str) -> dict:
+    """
+    Benchmarks all saved pages of a directory.
+
+    Returns:
+        dict: {"pages", "corpus sha256", "parser", "calibration ms", "pages per second",
+        "peak memory mb", "cpu ms": {function: ms per page}, "relative": {metric: time
+        divided by the calibration time measured alongside it}}. Only "relative" and the
+        peak memory are compared with the baseline, the rest is for reading.
+    """
+    pages = []
+    for name in fixture_names(directory):
+        with open(os.path.join(directory, f"{name}.html"), 'r', encoding='utf-8') as file:
+            pages.append(file.read())
+
+    if not pages:
+        raise SystemExit(f"No saved pages found in {directory}")
+
+    cpu = {}
+    relative = {}
+    peak = 0
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        for html in pages:
+            soup = make_soup(html, parser)
+
+            for name, function in page_functions(soup).items():
+                seconds, calibration = cpu_time(function, repeat)
+                cpu[name] = cpu.get(name, 0.0) + seconds
+                relative[name] = relative.get(name, 0.0) + seconds / calibration / len(pages)
+
+        # Whole pages from HTML to the result dictionary, the fastest pass over the corpus
+        def parse_corpus():
+            for html in pages:
+                parse_character_page(make_soup(html, parser))
+
+        elapsed, calibration = cpu_time(parse_corpus, repeat)
+        relative["corpus"] = elapsed / calibration
+
+        # Measured separately, tracemalloc slows everything down
+        for html in pages:
+            tracemalloc.start()
+            parse_character_page(make_soup(html, parser))
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+    return {
+        "pages": len(pages),
+        "corpus sha256": corpus_hash(directory),
+        "parser": parser,
+        "calibration ms": calibration * 1000,
+        "pages per second": len(pages) / elapsed,
+        "peak memory mb": peak / 1024 / 1024,
+        "cpu ms": {name: seconds / len(pages) * 1000 for name, seconds in cpu.items()},
+        "relative": relative,
+    }
+
+
+def find_regressions(result: dict, baseline: dict, threshold: float, min_ms: float = 0.1) -> list[str]:
+    """
+    Returns a description of every metric that is worse than the baseline by more than `threshold` (0.2 = 20%).
+
+    Timings are compared relative to the calibration loop (the "relative" metrics), and
+    reported in ms of the machine that recorded the baseline. The CPU time of a function
+    also has to grow by more than `min_ms`, so timer noise on functions that take a
+    fraction of a millisecond is not reported.
+    """
+    regressions = []
+    calibration_ms = baseline.get("calibration ms", 0.0)
+
+    def check(name, value, base, min_change=0.0):
+        if not base:
+            return
+        change = (value - base) / base
+        if change > threshold and abs(value - base) > min_change:
+            regressions.append(f"{name}: {base:.3f} -> {value:.3f} ({change:+.0%})")
+
+    check("peak memory mb", result["peak memory mb"], baseline.get("peak memory mb"))
+    for name, value in result["relative"].items():
+        base = baseline.get("relative", {}).get(name, 0.0)
+        if name == "corpus":
+            check("parse_character_page cpu ms per corpus", value * calibration_ms, base * calibration_ms)
+        else:
+            check(f"{name} cpu ms", value * calibration_ms, base * calibration_ms, min_change=min_ms)
+
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the parsers on saved character pages and compare with a baseline.")
+    parser.add_argument("-d", "--directory", type=str, default=FIXTURES_DIR, help="Directory with the saved pages.")
+    parser.add_argument("-r", "--repeat", type=int, default=20, help="Number of runs per page, the fastest one is reported.")
+    parser.add_argument("-p", "--parser", choices=PARSER_BACKENDS, default="html.parser", help="BeautifulSoup backend.")
+    parser.add_argument("-b", "--baseline", type=str, default=BASELINE_PATH, help="File path of the baseline.")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2, help="Allowed slowdown against the baseline (0.2 = 20%%).")
+    parser.add_argument("--min-ms", type=float, default=0.1, help="Smallest growth of a function's CPU time per page, in ms, reported as a regression.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the new baseline instead of comparing.")
+
+    args = parser.parse_args()
+
+    result = run_benchmark(args.directory, args.repeat, args.parser)
+
+    print(f"{result['pages']} pages, {result['pages per second']:.1f} pages/s, peak memory {result['peak memory mb']:.1f} MB")
+    for name, ms in sorted(result["cpu ms"].items(), key=lambda item: item[1], reverse=True):
+        print(f"{name:>24}: {ms:8.2f} ms CPU per page")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(result, file, indent=2)
+        print(f"Saved the baseline to {args.baseline}")
+
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+
+        if baseline.get("corpus sha256") != result["corpus sha256"] or baseline.get("parser") != result["parser"]:
+            # The numbers are not comparable, a regression or an improvement would be made up
+            print("✖ - The baseline was recorded on a different corpus or parser, record it again with --save-baseline")
+            raise SystemExit(1)
+
+        print(f"Calibration loop: {result['calibration ms']:.2f} ms (baseline {baseline.get('calibration ms', 0.0):.2f} ms)")
+
+        regressions = find_regressions(result, baseline, args.threshold, args.min_ms)
+        if regressions:
+            print(f"✖ - Regressions beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            raise SystemExit(1)
+
+        print(f"✔ - No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+    else:
+        print(f"No baseline at {args.baseline}, record one with --save-baseline")
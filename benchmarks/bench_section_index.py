@@ -0,0 +1,86 @@
+"""
+Compares the section lookups of the parsers: repeated whole-document scans versus `build_section_index`.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_section_index [-d fixtures/pages] [-r 10]
+"""
+from character_parser import build_section_index, find_element_from_page, parse_character_page
+from fixture_server import fixture_names, FIXTURES_DIR
+from text_utils import make_soup, PARSER_BACKENDS
+
+import contextlib
+import argparse
+import time
+import io
+import os
+
+
+def scan_sections(soup, char_element):
+    """
+    The lookups the parsers made before the index: one scan of the document per section.
+    """
+    found = {}
+
+    for title in ("Best Light Cones", "Traces priority", "Synergy"):
+        for div in soup.find_all('div', class_=f'content-header {char_element}'):
+            if title in div.get_text():
+                found[title] = div
+                break
+
+    for title in ("Best Relic Sets", "Best Planetary Sets", "Special Planetary Sets"):
+        found[title] = soup.find('h6', string=title)
+
+    best_stats_section = soup.find('div', class_='build-stats')
+    if best_stats_section:
+        for div in best_stats_section.find_all('div', class_=f'content-header {char_element}'):
+            if 'Recommended endgame stats' in div.get_text():
+                found['Recommended endgame stats'] = div
+                break
+
+    found['team-container-moc'] = soup.find('div', class_='team-container-moc')
+
+    return found
+
+
+def cpu_time(function, *args, repeat: int = 1) -> float:
+    start = time.process_time()
+    for _ in range(repeat):
+        function(*args)
+    return (time.process_time() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark section lookups on saved character pages.")
+    parser.add_argument("-d", "--directory", type=str, default=FIXTURES_DIR, help="Directory with the saved pages.")
+    parser.add_argument("-r", "--repeat", type=int, default=10, help="Number of runs per page.")
+    parser.add_argument("-p", "--parser", choices=PARSER_BACKENDS, default="html.parser", help="BeautifulSoup backend.")
+
+    args = parser.parse_args()
+
+    names = fixture_names(args.directory)
+    if not names:
+        raise SystemExit(f"No saved pages found in {args.directory}")
+
+    totals = {"scans": 0.0, "index": 0.0, "parse page": 0.0}
+
+    for name in names:
+        with open(os.path.join(args.directory, f"{name}.html"), 'r', encoding='utf-8') as file:
+            soup = make_soup(file.read(), args.parser)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            char_element = find_element_from_page(soup)
+
+            scans = cpu_time(scan_sections, soup, char_element, repeat=args.repeat)
+            index = cpu_time(build_section_index, soup, char_element, repeat=args.repeat)
+            parse = cpu_time(parse_character_page, soup, char_element, repeat=args.repeat)
+
+        totals["scans"] += scans
+        totals["index"] += index
+        totals["parse page"] += parse
+        print(f"{name:<30} scans {scans * 1000:8.2f} ms   index {index * 1000:8.2f} ms   parse page {parse * 1000:8.2f} ms")
+
+    print(f"\nPer page CPU time over {len(names)} pages:")
+    for name, seconds in totals.items():
+        print(f"{name:>12}: {seconds / len(names) * 1000:.2f} ms")
+    print(f"Lookup speedup: {totals['scans'] / totals['index']:.1f}x")
@@ -0,0 +1,77 @@
+"""
+Compares pickle and the versioned Arrow/JSON format on the saved characters: load time and size on disk,
+the time to read a single section ("teams (MoC)") through `LazyResult`, and the
+size of the same data pickled as a `records.CharacterRecord`.
+
+Run from the repository root after saving some characters as pickles:
+
+    python -m benchmarks.bench_serialization [-d data] [-r 5]
+"""
+from records import CharacterRecord
+from file_io import (
+    load_result_from_file,
+    load_result_from_dir,
+    save_result_to_dir,
+    result_size,
+    LazyResult,
+    RESULT_FORMATS,
+)
+
+import argparse
+import tempfile
+import pickle
+import glob
+import time
+import os
+
+
+def timed(function, *args, repeat: int = 1) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(*args)
+    return (time.perf_counter() - start) / repeat
+
+
+def read_teams(path):
+    return LazyResult(path)["teams (MoC)"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pickle against the Arrow/JSON result format.")
+    parser.add_argument("-d", "--directory", type=str, default="data", help="Directory with the pickle files.")
+    parser.add_argument("-r", "--repeat", type=int, default=5, help="Number of loads per file.")
+
+    args = parser.parse_args()
+
+    pickles = sorted(glob.glob(os.path.join(args.directory, f"*{RESULT_FORMATS['pickle']}")))
+    if not pickles:
+        raise SystemExit(f"No pickle files found in {args.directory}")
+
+    totals = {"pickle": [0.0, 0], "arrow (mmap)": [0.0, 0], "arrow (read)": [0.0, 0]}
+    section_totals = {"pickle": 0.0, "arrow (lazy)": 0.0}
+    records_size = 0
+
+    with tempfile.TemporaryDirectory() as output:
+        for filename in pickles:
+            result = load_result_from_file(filename)
+            dirname = os.path.join(output, os.path.basename(filename)[:-len(RESULT_FORMATS['pickle'])] + RESULT_FORMATS["arrow"])
+            save_result_to_dir(result, dirname)
+
+            totals["pickle"][0] += timed(load_result_from_file, filename, repeat=args.repeat)
+            totals["pickle"][1] += result_size(filename)
+            totals["arrow (mmap)"][0] += timed(load_result_from_dir, dirname, True, repeat=args.repeat)
+            totals["arrow (mmap)"][1] += result_size(dirname)
+            totals["arrow (read)"][0] += timed(load_result_from_dir, dirname, False, repeat=args.repeat)
+            totals["arrow (read)"][1] += result_size(dirname)
+
+            section_totals["pickle"] += timed(read_teams, filename, repeat=args.repeat)
+            section_totals["arrow (lazy)"] += timed(read_teams, dirname, repeat=args.repeat)
+
+            records_size += len(pickle.dumps(CharacterRecord.from_result(result)))
+
+    print(f"{len(pickles)} characters, {args.repeat} loads each")
+    for name, (seconds, size) in totals.items():
+        print(f"{name:>14}: load all {seconds * 1000:8.1f} ms, size {size / 1024:8.1f} KB")
+    for name, seconds in section_totals.items():
+        print(f"{name:>14}: load teams {seconds * 1000:8.1f} ms")
+    print(f"{'records':>14}: pickled size {records_size / 1024:8.1f} KB")
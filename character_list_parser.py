@@ -1,34 +1,46 @@
 import requests
 from bs4 import BeautifulSoup
 
-def fetch_character_names(url="https://www.prydwen.gg/star-rail/characters"):
+def extract_character_names(html):
+    """
+    Extracts a sorted list of unique character names from the HTML of the character list page.
+
+    Args:
+        html (str): HTML of the page containing character links.
+
+    Returns:
+        list: A list of unique character.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    base_url = "https://www.prydwen.gg"
+
+    # Extract unique character links
+    character_links = {
+        base_url + link['href']
+        for link in soup.find_all('a', href=True)
+        if link['href'].startswith('/star-rail/characters/') and link['href'] != '/star-rail/characters/'
+    }
+
+    # Remove base URL from character links
+    return sorted([link[44:] for link in character_links])
+
+
+def fetch_character_names(url="https://www.prydwen.gg/star-rail/characters", session=None):
     """
     Fetches a list of unique character names from the specified URL.
 
     Args:
         url (str): URL of the page containing character links.
+        session (requests.Session, optional): A session to reuse connections.
 
     Returns:
         list: A list of unique character.
         int: HTTP status code of the response.
     """
     try:
-        response = requests.get(url)
+        response = (session or requests).get(url)
         if response.status_code == 200:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            base_url = "https://www.prydwen.gg"
-
-            # Extract unique character links
-            character_links = {
-                base_url + link['href']
-                for link in soup.find_all('a', href=True)
-                if link['href'].startswith('/star-rail/characters/') and link['href'] != '/star-rail/characters/'
-            }
-
-            # Remove base URL from character links
-            characters = sorted([link[44:] for link in character_links])
-
-            return characters, response.status_code
+            return extract_character_names(response.text), response.status_code
         else:
             return [], response.status_code
         
@@ -36,7 +48,6 @@ def fetch_character_names(url="https://www.prydwen.gg/star-rail/characters"):
         print(f"An error occurred while fetching the page: {e}")
         return [], None
 
-
 if __name__ == "__main__":
     # URL of the page with the character list
     url = "https://www.prydwen.gg/star-rail/characters"
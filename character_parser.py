@@ -1,37 +1,88 @@
-from text_utils import get_text_with_spaces
+from text_utils import get_text_with_spaces, make_soup
+
+from driver_session import DriverSession
+from stage_timing import stage, timed
+from stat_rules import parse_stat_strings
+from records import CharacterRecord
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import pandas as pd
 
-import requests
-import time
-import re
+import json
 import os
+import re
+
+# Titles of the "content-header" blocks looked up by the parsers
+SECTION_TITLES = ("Best Light Cones", "Recommended endgame stats", "Traces priority", "Synergy")
+
+# Classes of the container blocks looked up by the parsers
+SECTION_BLOCKS = ("build-stats", "team-container-moc")
+
+# Opening tag of the stats block in the raw HTML, for `page_has_build_sections`
+BUILD_STATS_TAG = re.compile(r"""<div\s(?:[^>]*\s)?class=["']?(?:[^"'>]*\s)?build-stats(?=[\s"'>])""")
+
+
+@timed("build_section_index")
+def build_section_index(soup: BeautifulSoup, char_element: str) -> dict:
+    """
+    Collects all section headers of a character page in a single pass over the document.
+
+    Args:
+        soup (bs4.BeautifulSoup): The parsed HTML of the character page.
+        char_element (str): The character element the "content-header" blocks are styled with.
+
+    Returns:
+        dict: A dictionary with three lookup tables, each holding the first match in document order:
+
+            * content-header: title from SECTION_TITLES -> "content-header {char_element}" div containing it.
+            * h6: exact text -> h6 tag.
+            * div: class from SECTION_BLOCKS -> div with that class.
+    """
+    header_class = f'content-header {char_element}'
+    index = {"content-header": {}, "h6": {}, "div": {}}
 
-def parse_light_cones(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
+    for tag in soup.find_all(['div', 'h6']):
+        if tag.name == 'h6':
+            if tag.string is not None:
+                index["h6"].setdefault(str(tag.string), tag)
+            continue
+
+        classes = tag.get('class', [])
+        if ' '.join(classes) == header_class:
+            text = tag.get_text()
+            for title in SECTION_TITLES:
+                if title in text:
+                    index["content-header"].setdefault(title, tag)
+
+        for block in SECTION_BLOCKS:
+            if block in classes:
+                index["div"].setdefault(block, tag)
+
+    return index
+
+
+@timed("parse_light_cones")
+def parse_light_cones(soup: BeautifulSoup, char_element: str, sections: dict | None = None) -> pd.DataFrame:
     """
     Parse the "Best Light Cones" section of a character page into a DataFrame.
 
     Args:
         soup (bs4.BeautifulSoup): The parsed HTML of the character page.
         char_element (str): The character element to narrow down the search.
+        sections (dict, optional): The result of `build_section_index`. Built from the page if not given.
 
     Returns:
         pandas.DataFrame: A DataFrame with columns "name", "%", "rarity", "superimposition", and "description".
     """
     light_cones_data = []
 
+    if sections is None:
+        sections = build_section_index(soup, char_element)
+
     # Search for the "Best Light Cone" section by partial text
-    light_cones_section = None
-    for div in soup.find_all('div', class_=f'content-header {char_element}'):
-        if 'Best Light Cones' in div.get_text():
-            light_cones_section = div
-            break
+    light_cones_section = sections["content-header"].get('Best Light Cones')
 
     if light_cones_section:
         print("✔ - Best Light Cones")
@@ -74,7 +125,8 @@ def parse_light_cones(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
     return pd.DataFrame(light_cones_data)
 
 
-def parse_relics(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
+@timed("parse_relics")
+def parse_relics(soup: BeautifulSoup, char_element: str, sections: dict | None = None) -> pd.DataFrame:
     """
     Parse the Best Relics section of the webpage into a DataFrame.
 
@@ -84,6 +136,8 @@ def parse_relics(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
         The parsed HTML of the webpage.
     char_element : str
         The character element to narrow down the search.
+    sections : dict, optional
+        The result of `build_section_index`. Built from the page if not given.
 
     Returns
     -------
@@ -100,12 +154,20 @@ def parse_relics(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
     """
     relics_data = []
 
+    if sections is None:
+        sections = build_section_index(soup, char_element)
+
     # Parse Best Relics
-    build_relics_section = soup.find('h6', string='Best Relic Sets')
+    build_relics_section = sections["h6"].get('Best Relic Sets')
 
     if build_relics_section:
         print("✔ - Best Relic Sets Found")
 
+        # Everything after the "Best Planetary Sets" header belongs to the planar sets.
+        # Collected once instead of searching backwards from every relic.
+        planar_header = sections["h6"].get('Best Planetary Sets')
+        after_planar_header = set(map(id, planar_header.find_all_next('div'))) if planar_header else set()
+
         # Find all relic containers
         relics_containers = build_relics_section.find_next_siblings('div', class_='detailed-cones moc extra planar')
 
@@ -123,7 +185,7 @@ def parse_relics(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
 
             # Relic processing inside the container to "Best Planetary Sets"
             for relic in relic_elements:
-                if relic.find_previous('h6', string='Best Planetary Sets'):
+                if id(relic) in after_planar_header:
                     break
 
                 # Checking the availability of "flex-placeholder" for each relic with "with-notes"
@@ -179,7 +241,8 @@ def parse_relics(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
     return relics_df
 
 
-def parse_planar_sets(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
+@timed("parse_planar_sets")
+def parse_planar_sets(soup: BeautifulSoup, char_element: str, sections: dict | None = None) -> pd.DataFrame:
     """
     Parse the Best Planetary Sets and Special Planetary Sets sections of the webpage into DataFrames.
 
@@ -189,6 +252,8 @@ def parse_planar_sets(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
         The parsed HTML of the webpage.
     char_element : str
         The character element to narrow down the search.
+    sections : dict, optional
+        The result of `build_section_index`. Built from the page if not given.
 
     Returns
     -------
@@ -208,7 +273,9 @@ def parse_planar_sets(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
             * ul: The text of the <ul> element following the Best Planetary Sets section.
 
     """
-    
+    if sections is None:
+        sections = build_section_index(soup, char_element)
+
     def extract_planar_sets(section_header: str) -> tuple[list, dict]:
         """
         Extracts planar sets data from the given section header.
@@ -223,7 +290,7 @@ def parse_planar_sets(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
         planar_sets_data = []
         additional_info = {"p": None, "ul": None}
 
-        section = soup.find('h6', string=section_header)
+        section = sections["h6"].get(section_header)
         if section:
             print(f"✔ - {section_header}")
 
@@ -302,16 +369,21 @@ def parse_planar_sets(soup: BeautifulSoup, char_element: str) -> pd.DataFrame:
     return planar_sets_df, best_additional_info
 
 
+@timed("characteristics_to_df")
 def characteristics_to_df(data: list[str]) -> pd.DataFrame:
     """
     Parse a list of strings in the format 'Characteristic: value' into a DataFrame.
 
+    Every value is matched against the precompiled rules in `stat_rules.STAT_RULES`,
+    once per rule, and the first match wins. `stat_rules.extract_stats` gives the
+    same frame for many characters at once.
+
     Parameters
     ----------
     data : list of str
         A list of strings, where each string is in the format 'Characteristic: value'.
         The value can be a range (e.g. '1-2'), a single value with a comment (e.g. '3 (foo)'),
-        or a single value with a plus sign (e.g. '4+').
+        a single value with a plus sign (e.g. '4+') or fixed values (e.g. '134 / 160').
 
     Returns
     -------
@@ -319,169 +391,22 @@ def characteristics_to_df(data: list[str]) -> pd.DataFrame:
         A DataFrame with the following columns:
 
         * characteristic: The name of the characteristic (e.g. 'ATK')
-        * min: The minimum value of the characteristic (e.g. 1)
-        * max: The maximum value of the characteristic (e.g. 2)
+        * min: The minimum value of the characteristic (e.g. 1.0)
+        * max: The maximum value of the characteristic (e.g. 2.0)
         * plus: A boolean indicating whether the value has a plus sign (e.g. True)
-        * fix1, fix2, fix3: The fixed values of the characteristic (e.g. 3, 4, 5)
-        * min comment, max comment,fix1 comment, fix2 comment, fix3 comment: The comments associated with the values
+        * unit: '%' if the values are percentages, otherwise None
+        * fix1, fix2, fix3: The fixed values of the characteristic (e.g. 3.0, 4.0, 5.0)
+        * min comment, max comment, fix1 comment, fix2 comment, fix3 comment: The comments associated with the values
         * text: The text value of the characteristic (e.g. 'foo')
         * raw: The original string (e.g. 'Characteristic: 1-2 (foo)')
 
+        The value columns are floats, NaN when the value does not have them.
     """
+    return parse_stat_strings(data)
 
-    # Initialize lists to store extracted data
-    characteristics = []
-    mins = []
-    maxs = []
-    plus_flags = []
-    fix1s = []
-    fix2s = []
-    fix3s = []
-    min_comments = []
-    max_comments = []
-    fix1_comments = []
-    fix2_comments = []
-    fix3_comments = []
-    texts = []
-    raws = []
-
-    for item in data:
-        raw = item
-        parts = item.split(":", 1)
-
-        if len(parts) == 2:
-            char_name, value = parts
-        else:
-            char_name = parts[0]
-            value = ""
-
-        # Remove excess spaces
-        char_name = char_name.strip()
-        value = value.strip()
-        
-        # Default placeholders
-        min_val, max_val, fix1, fix2, fix3 = None, None, None, None, None
-        min_comment, max_comment, fix1_comment, fix2_comment, fix3_comment = None, None, None, None, None
-        plus_flag, text = False, None
-
-        # Default placeholders
-        min_val, max_val, fix1, fix2, fix3 = None, None, None, None, None
-        min_comment, max_comment, fix1_comment, fix2_comment, fix3_comment = None, None, None, None, None
-        plus_flag, text = False, None
 
-        try:
-            # Specific case handling
-            if "1-2 Speed slower than carry" in value:
-                match = re.match(r"(1-2 Speed slower than carry)(.*?)\s*/\s*(\d+\+?)\s*(\(.*\))?", value)
-                if match:
-                    text = match.group(1)
-                    min_val = match.group(3)
-                    if min_val.endswith("+"):
-                        plus_flag = True
-                        min_val = min_val[:-1]
-                    if match.group(4):
-                        min_comment = match.group(4)
-            elif "1-2 Speed slower than the carry" in value:
-                match = re.match(r"(1-2 Speed slower than the carry.*?)(,\s*)(\d+\+?)\s*(.*)", value)
-                if match:
-                    text = match.group(1)
-                    min_val = match.group(3)
-                    if min_val.endswith("+"):
-                        plus_flag = True
-                        min_val = min_val[:-1]
-                    min_comment = match.group(4)
-            elif "Base Speed" in value:
-                match = re.match(r"(Base Speed.*?/\s*)(\d+)", value)
-                if match:
-                    fix1 = match.group(1).strip()
-                    fix2 = match.group(2)
-            elif re.match(r"(\d+\+?)\s*(\(.*?\))\s*/\s*(\d+\+?)\s*(\(.*\))", value):
-                match = re.match(r"(\d+\+?)\s*(\(.*?\))\s*/\s*(\d+\+?)\s*(\(.*\))", value)
-                if match:
-                    fix1 = match.group(1)
-                    fix1_comment = match.group(2)
-                    fix2 = match.group(3)
-                    fix2_comment = match.group(4)
-            else:
-                # Default handling for ranges and fixed values
-                if "/" in value:
-                    fixed_parts = [part.strip() for part in value.split("/")]
-                    fix1 = fixed_parts[0] if len(fixed_parts) > 0 else None
-                    fix2 = fixed_parts[1] if len(fixed_parts) > 1 else None
-                    fix3 = fixed_parts[2] if len(fixed_parts) > 2 else None
-
-                    # Extract comments if present
-                    if fix3 and "(" in fix3:
-                        fix3, fix3_comment = re.match(r"(.*?)(\(.*\))", fix3).groups()
-                        fix3 = fix3.strip()
-                    elif fix2 and "(" in fix2:
-                        fix2, fix2_comment = re.match(r"(.*?)(\(.*\))", fix2).groups()
-                        fix2 = fix2.strip()
-                    elif fix1 and "(" in fix1:
-                        fix1, fix1_comment = re.match(r"(.*?)(\(.*\))", fix1).groups()
-                        fix1 = fix1.strip()
-                else:
-                    range_with_comment = re.match(r"(\d+\.?\d*%?)\s*(\(.*?\))?\s*-\s*(\d+\.?\d*%?)\+?\s*(\(.*?\))?", value)
-                    single_value_with_comment = re.match(r"(\d+\.?\d*%?)\+?\s*(\(.*\))?", value)
-
-                    if range_with_comment:
-                        min_val = range_with_comment.group(1)
-                        if range_with_comment.group(2):
-                            min_comment = range_with_comment.group(2)
-                        max_val = range_with_comment.group(3)
-                        if range_with_comment.group(4):
-                            max_comment = range_with_comment.group(4)
-                        plus_flag = "+" in value
-
-                    elif single_value_with_comment:
-                        min_val = single_value_with_comment.group(1)
-                        if single_value_with_comment.group(2):
-                            min_comment = single_value_with_comment.group(2)
-                        plus_flag = "+" in value
-                    else:
-                        text = value
-
-        except Exception as e:
-            print(f"Error processing value '{value}': {e}")
-
-        # Append to lists
-        characteristics.append(char_name)
-        mins.append(min_val)
-        maxs.append(max_val)
-        plus_flags.append(plus_flag)
-        fix1s.append(fix1)
-        fix2s.append(fix2)
-        fix3s.append(fix3)
-        min_comments.append(min_comment)
-        max_comments.append(max_comment)
-        fix1_comments.append(fix1_comment)
-        fix2_comments.append(fix2_comment)
-        fix3_comments.append(fix3_comment)
-        texts.append(text)
-        raws.append(raw)
-
-    # Create DataFrame
-    df = pd.DataFrame({
-        'characteristic': characteristics,
-        'min': mins,
-        'max': maxs,
-        'plus': plus_flags,
-        'fix1': fix1s,
-        'fix2': fix2s,
-        'fix3': fix3s,
-        'min comment': min_comments,
-        'max comment': max_comments,
-        'fix1 comment': fix1_comments,
-        'fix2 comment': fix2_comments,
-        'fix3 comment': fix3_comments,
-        'text': texts,
-        'raw': raws
-    })
-
-    return df
-
-
-def parse_stats(soup: BeautifulSoup, char_element: str) -> tuple[pd.DataFrame, dict, dict, str, str, str, pd.DataFrame]:
+@timed("parse_stats")
+def parse_stats(soup: BeautifulSoup, char_element: str, sections: dict | None = None) -> tuple[pd.DataFrame, dict, dict, str, str, str, pd.DataFrame]:
     """
     Parse the Best Stats section of the webpage into a DataFrame.
 
@@ -491,6 +416,8 @@ def parse_stats(soup: BeautifulSoup, char_element: str) -> tuple[pd.DataFrame, d
         The parsed HTML of the webpage.
     char_element : str
         The character element to narrow down the search.
+    sections : dict, optional
+        The result of `build_section_index`. Built from the page if not given.
 
     Returns
     -------
@@ -524,8 +451,11 @@ def parse_stats(soup: BeautifulSoup, char_element: str) -> tuple[pd.DataFrame, d
     stats_dict = {}
     substats_dict = {}
 
+    if sections is None:
+        sections = build_section_index(soup, char_element)
+
     # Search for “Best Stats” section
-    best_stats_section = soup.find('div', class_='build-stats')
+    best_stats_section = sections["div"].get('build-stats')
     if best_stats_section:
         print("✔ - Best Stats")
 
@@ -583,11 +513,14 @@ def parse_stats(soup: BeautifulSoup, char_element: str) -> tuple[pd.DataFrame, d
         comments_text = get_text_with_spaces(comments_section.find('p')) if comments_section else ""
         
         # Parsing Recommended endgame stats
-        endgame_header = None
-        for div in best_stats_section.find_all('div', class_=f'content-header {char_element}'):
-            if 'Recommended endgame stats' in div.get_text():
-                endgame_header = div
-                break
+        endgame_header = sections["content-header"].get('Recommended endgame stats')
+        if endgame_header is not None and best_stats_section not in endgame_header.parents:
+            # The first header on the page is outside of the stats block, search inside it
+            endgame_header = None
+            for div in best_stats_section.find_all('div', class_=f'content-header {char_element}'):
+                if 'Recommended endgame stats' in div.get_text():
+                    endgame_header = div
+                    break
 
         endgame_data = []
         if endgame_header:
@@ -627,25 +560,26 @@ def parse_stats(soup: BeautifulSoup, char_element: str) -> tuple[pd.DataFrame, d
     return pd.DataFrame(), {}, {}, "", "", "", pd.DataFrame()
 
 
-def parse_traces_priority(soup: BeautifulSoup, char_element: str) -> dict:
+@timed("parse_traces_priority")
+def parse_traces_priority(soup: BeautifulSoup, char_element: str, sections: dict | None = None) -> dict:
     """
     Parse the "Traces priority" section of a character page into a dictionary.
 
     Args:
         soup (bs4.BeautifulSoup): The parsed HTML of the character page.
         char_element (str): The character element to narrow down the search.
+        sections (dict, optional): The result of `build_section_index`. Built from the page if not given.
 
     Returns:
         dict: A dictionary with two keys: "Skills priority" and "Major Traces priority".
     """
     traces_dict = {}
 
+    if sections is None:
+        sections = build_section_index(soup, char_element)
+
     # Search for “Traces priority” section
-    traces_section = None
-    for div in soup.find_all('div', class_=f'content-header {char_element}'):
-        if 'Traces priority' in div.get_text():
-            traces_section = div
-            break
+    traces_section = sections["content-header"].get('Traces priority')
 
     if traces_section:
         print("✔ - Traces priority")
@@ -682,7 +616,8 @@ def parse_traces_priority(soup: BeautifulSoup, char_element: str) -> dict:
     return traces_dict
 
 
-def parse_synergy(soup: BeautifulSoup, char_element: str) -> list[str]:
+@timed("parse_synergy")
+def parse_synergy(soup: BeautifulSoup, char_element: str, sections: dict | None = None) -> list[str]:
     """
     Parse the "Synergy" section of a character page into a list of strings.
 
@@ -692,6 +627,8 @@ def parse_synergy(soup: BeautifulSoup, char_element: str) -> list[str]:
         The parsed HTML content of the character page.
     char_element : str
         The character element to narrow down the search.
+    sections : dict, optional
+        The result of `build_section_index`. Built from the page if not given.
 
     Returns
     -------
@@ -701,12 +638,11 @@ def parse_synergy(soup: BeautifulSoup, char_element: str) -> list[str]:
 
     characters = []
 
+    if sections is None:
+        sections = build_section_index(soup, char_element)
+
     # Searching for “Synergy” section
-    synergy_section = None
-    for div in soup.find_all('div', class_=f'content-header {char_element}'):
-        if 'Synergy' in div.get_text():
-            synergy_section = div
-            break
+    synergy_section = sections["content-header"].get('Synergy')
 
     if synergy_section:
         print("✔ - Synergy")
@@ -725,7 +661,8 @@ def parse_synergy(soup: BeautifulSoup, char_element: str) -> list[str]:
     return characters
 
 
-def parse_teams(soup: BeautifulSoup) -> list[dict]:
+@timed("parse_teams")
+def parse_teams(soup: BeautifulSoup, sections: dict | None = None) -> list[dict]:
     """
     Parse the "Teams (MoC)" section of a character page to extract team data.
 
@@ -733,6 +670,8 @@ def parse_teams(soup: BeautifulSoup) -> list[dict]:
     ----------
     soup : bs4.BeautifulSoup
         The parsed HTML content of the character page.
+    sections : dict, optional
+        The result of `build_section_index`. The container is searched in the page if not given.
 
     Returns
     -------
@@ -747,7 +686,10 @@ def parse_teams(soup: BeautifulSoup) -> list[dict]:
     teams_data = []
 
     # Find the “commands” container
-    container = soup.find('div', class_='team-container-moc')
+    if sections is None:
+        container = soup.find('div', class_='team-container-moc')
+    else:
+        container = sections["div"].get('team-container-moc')
     if not container:
         print("✖ - Teams (MoC)")   
         return teams_data
@@ -787,9 +729,41 @@ def parse_teams(soup: BeautifulSoup) -> list[dict]:
     return teams_data
 
 
-def find_element_from_page(soup: BeautifulSoup) -> str | None:
+# Elements a character can have, in the order used to break ties
+ELEMENTS = ("Physical", "Lightning", "Fire", "Imaginary", "Ice", "Wind", "Quantum")
+
+# Character URL slug -> element, filled from previous runs with `load_known_elements`
+KNOWN_ELEMENTS = {}
+KNOWN_ELEMENTS_PATH = "data/elements.json"
+
+
+def load_known_elements(filename: str = KNOWN_ELEMENTS_PATH):
+    """
+    Loads the table of known character elements saved by `save_known_elements`.
+
+    Args:
+        filename (str): The file path of the table.
+    """
+    if os.path.exists(filename):
+        with open(filename, 'r', encoding='utf-8') as file:
+            KNOWN_ELEMENTS.update(json.load(file))
+
+
+def save_known_elements(filename: str = KNOWN_ELEMENTS_PATH):
+    """
+    Saves the table of known character elements.
+
+    Args:
+        filename (str): The file path of the table.
+    """
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(KNOWN_ELEMENTS, file, indent=2, sort_keys=True)
+
+
+def count_elements(soup: BeautifulSoup) -> dict[str, int]:
     """
-    Finds and returns the most frequent element class from a predefined list within the provided HTML page.
+    Counts the tags carrying each element class in a single pass over the document.
 
     Parameters
     ----------
@@ -798,42 +772,103 @@ def find_element_from_page(soup: BeautifulSoup) -> str | None:
 
     Returns
     -------
-    str or None
-        The element class with the highest occurrence if found; otherwise, None. 
-        Prints a warning if multiple elements are found.
+    dict
+        Element -> number of tags with that class, in the order of ELEMENTS.
     """
+    element_counts = dict.fromkeys(ELEMENTS, 0)
 
-    # List of elements to search for
-    elements_to_find = ["Physical", "Lightning", "Fire", "Imaginary", "Ice", "Wind", "Quantum"]
+    for tag in soup.find_all(class_=True):
+        for element in set(tag['class']).intersection(element_counts):
+            element_counts[element] += 1
 
-    try:
-        # Find each element on the page and count their number
-        element_counts = {element: len(soup.find_all(class_=element)) for element in elements_to_find}
+    return element_counts
 
-        # Leave only the elements that are on the page
-        found_elements = {element: count for element, count in element_counts.items() if count > 0}
 
-        # Checking the results
-        if len(found_elements) == 1:
-            return max(found_elements, key=found_elements.get)
-        elif len(found_elements) >= 2:
-            print(f"Warning, found {len(found_elements)} elements: {found_elements}")
-            return max(found_elements, key=found_elements.get)
-        else:
-            print("Element not found on the page.")
-            return None
+def has_element_header(soup: BeautifulSoup, element: str) -> bool:
+    """
+    Checks that the page has a "content-header" block styled with the element.
+    """
+    return soup.select_one(f'div.content-header.{element}') is not None
+
+
+@timed("find_element_from_page")
+def find_element_from_page(soup: BeautifulSoup, url: str | None = None) -> str | None:
+    """
+    Finds and returns the element of the character on the provided HTML page.
 
-    except requests.exceptions.RequestException as e:
-        print(f"Error when loading the page: {e}")
+    Cheap signals are tried first: the table of known elements by the URL slug,
+    then the class of the first "single-tab" button, which is styled with the
+    character element. Either is only trusted if the page has a "content-header"
+    block of that element. Otherwise the most frequent element class on the page is used.
+
+    Parameters
+    ----------
+    soup : bs4.BeautifulSoup
+        The parsed HTML content of the webpage.
+    url : str, optional
+        URL of the character page, used to look up KNOWN_ELEMENTS.
+
+    Returns
+    -------
+    str or None
+        The element of the character if found; otherwise, None.
+        Prints a warning if multiple elements are found by counting.
+    """
+    if url is not None:
+        known_element = KNOWN_ELEMENTS.get(url.rstrip('/').rsplit('/', 1)[-1])
+        if known_element and has_element_header(soup, known_element):
+            return known_element
+
+    first_tab = soup.find(class_='single-tab')
+    if first_tab is not None:
+        tab_elements = [element for element in ELEMENTS if element in first_tab['class']]
+        if len(tab_elements) == 1 and has_element_header(soup, tab_elements[0]):
+            return tab_elements[0]
+
+    # Leave only the elements that are on the page
+    found_elements = {element: count for element, count in count_elements(soup).items() if count > 0}
+
+    # Checking the results
+    if len(found_elements) == 1:
+        return max(found_elements, key=found_elements.get)
+    elif len(found_elements) >= 2:
+        print(f"Warning, found {len(found_elements)} elements: {found_elements}")
+        return max(found_elements, key=found_elements.get)
+    else:
+        print("Element not found on the page.")
         return None
 
 
-def fetch_character_data_with_selenium(url: str) -> dict:
+class TabNotFoundError(Exception):
     """
-    Fetches data from a Star Rail character page using Selenium.
+    Raised when the "Build and teams" tab is missing from a loaded character page.
+    """
+
+
+class scroll_finished:
+    """
+    An expected condition that is met when the page scroll position stops changing between two polls.
+    """
+
+    def __init__(self):
+        self.last_position = None
+
+    def __call__(self, driver):
+        position = driver.execute_script("return window.scrollY;")
+        finished = position == self.last_position
+        self.last_position = position
+        return finished
+
+
+@timed("parse")
+def parse_character_page(soup: BeautifulSoup, char_element: str | None = None, url: str | None = None) -> dict:
+    """
+    Parses the "Build and teams" content of a character page into the result dictionary.
 
     Args:
-        url (str): URL of the character page.
+        soup (bs4.BeautifulSoup): The parsed HTML of the character page with the "Build and teams" tab loaded.
+        char_element (str, optional): The character element. Detected from the page if not given.
+        url (str, optional): URL of the character page, used to look up the element in KNOWN_ELEMENTS.
 
     Returns:
         dict: A dictionary containing the following keys:
@@ -853,54 +888,115 @@ def fetch_character_data_with_selenium(url: str) -> dict:
             * synergy: A list of synergy characters.
             * teams (MoC): A list of teams with rank, usage%, and rounds.
             * element: The element of the character.
+    """
+    if char_element is None:
+        char_element = find_element_from_page(soup, url)
+
+    # One pass over the document finds the headers of all sections
+    sections = build_section_index(soup, char_element)
+
+    light_cones_df = parse_light_cones(soup, char_element, sections)
+    relics_df = parse_relics(soup, char_element, sections)
+    planar_sets_df, additional_planar_sets = parse_planar_sets(soup, char_element, sections)
+    stats_df, stats_dict, substats_dict, substats, details_info, comments, endgame_df = parse_stats(soup, char_element, sections)
+    traces_dict = parse_traces_priority(soup, char_element, sections)
+    synergy_characters = parse_synergy(soup, char_element, sections)
+    teams_data = parse_teams(soup, sections)
+
+    # Combine all results into a dictionary
+    result = {
+        "light cones": light_cones_df,
+        "relics": relics_df,
+        "planar sets": planar_sets_df,
+        "additional planar sets": additional_planar_sets,
+        "relic main stats": stats_df,
+        "relic main stats dict": stats_dict,
+        "substats": substats,
+        "substats dict": substats_dict,
+        "substats details": details_info,
+        "substats comments": comments,
+        "endgame stats": endgame_df,
+        "traces priority": traces_dict,
+        "synergy": synergy_characters,
+        "teams (MoC)": teams_data,
+        "element": char_element,
+    }
+
+    return result
+
+
+def has_build_sections(soup: BeautifulSoup, char_element: str | None) -> bool:
+    """
+    Checks whether the "Build and teams" content is already present in the page.
 
-    Note:
-        Requires Selenium and a Chrome driver to be installed.
+    Args:
+        soup (bs4.BeautifulSoup): The parsed HTML of the character page.
+        char_element (str): The character element.
+
+    Returns:
+        bool: True if the light cones header and the stats block are found.
     """
-    options = webdriver.ChromeOptions()
-    options.add_argument('--headless') # without opening a browser window
-    options.add_argument('--disable-gpu')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--log-level=3')                
-    options.add_argument('--ignore-certificate-errors')
-    options.add_argument('--enable-unsafe-swiftshader')
-    options.add_argument('--ignore-ssl-errors')
-    options.add_argument('--show-capture=no')
-    options.add_argument("--disable-logging");
-    options.add_argument("--disable-dev-shm-usage");
-    options.add_argument("--output=/dev/null");
-    
-    # Перенаправление логов в os.devnull
-    service = Service(log_path=os.devnull)
+    if char_element is None or soup.find('div', class_='build-stats') is None:
+        return False
 
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.get(url)
+    return any(
+        'Best Light Cones' in div.get_text()
+        for div in soup.find_all('div', class_=f'content-header {char_element}')
+    )
 
-    try:
-        wait = WebDriverWait(driver, 10)
 
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-        char_element = find_element_from_page(soup)
+def page_has_build_sections(html: str) -> bool:
+    """
+    Checks the raw HTML for the "Build and teams" content without parsing it.
+
+    A cheaper and looser `has_build_sections` for callers that parse the page
+    elsewhere: the stats block and the light cones header have to be present, but
+    the element of the header is not checked.
+
+    Args:
+        html (str): The HTML of the character page.
+
+    Returns:
+        bool: True if the stats block and the light cones header are found.
+    """
+    return 'Best Light Cones' in html and BUILD_STATS_TAG.search(html) is not None
+
 
-        # Waiting for all buttons “single-tab char_element”
-        tabs = wait.until(
-            EC.presence_of_all_elements_located((By.CLASS_NAME, f"single-tab.{char_element}"))
-        )
+def fetch_character_html_with_selenium(url: str, session: DriverSession) -> str:
+    """
+    Opens a Star Rail character page in the browser and clicks the "Build and teams" tab.
+
+    Args:
+        url (str): URL of the character page.
+        session (DriverSession): The browser session to use.
 
-        # Selecting the desired button by text
-        build_and_teams_tab = None
-        for tab in tabs:
-            if "Build and teams" in tab.text:
-                build_and_teams_tab = tab
-                break
+    Returns:
+        str: The page source after the tab content has loaded.
+    """
+    driver = session.get(url)
+
+    # Waiting for all buttons “single-tab”. The element is detected later from the
+    # loaded tab, so the page is not parsed before the click.
+    tabs = session.wait(
+        EC.presence_of_all_elements_located((By.CLASS_NAME, "single-tab")),
+        "tabs"
+    )
+
+    # Selecting the desired button by text
+    build_and_teams_tab = None
+    for tab in tabs:
+        if "Build and teams" in tab.text:
+            build_and_teams_tab = tab
+            break
 
-        if build_and_teams_tab is None:
-            raise Exception("Кнопка 'Build and teams' не найдена.")
+    if build_and_teams_tab is None:
+        raise TabNotFoundError("Кнопка 'Build and teams' не найдена.")
 
+    with stage("tab click"):
         # Scroll slightly above the button so the “header” doesn't overlap
         driver.execute_script("arguments[0].scrollIntoView(true);", build_and_teams_tab)
         driver.execute_script("window.scrollBy({top: -100, left: 0, behavior: 'smooth'});")
-        time.sleep(1)  # Ждём прокрутки
+        session.wait(scroll_finished(), "scroll", required=False)
 
         # If the element is overlapped, we use JavaScript to click it
         try:
@@ -908,39 +1004,44 @@ def fetch_character_data_with_selenium(url: str) -> dict:
         except:
             driver.execute_script("arguments[0].click();", build_and_teams_tab)
 
-        time.sleep(2)  # Waiting for the content to load
-
-        soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-        light_cones_df = parse_light_cones(soup, char_element)
-        relics_df = parse_relics(soup, char_element)
-        planar_sets_df, additional_planar_sets = parse_planar_sets(soup, char_element)
-        stats_df, stats_dict, substats_dict, substats, details_info, comments, endgame_df = parse_stats(soup, char_element)
-        traces_dict = parse_traces_priority(soup, char_element)
-        synergy_characters = parse_synergy(soup, char_element)
-        teams_data = parse_teams(soup)
-
-        # Combine all results into a dictionary
-        result = {
-            "light cones": light_cones_df,
-            "relics": relics_df,
-            "planar sets": planar_sets_df,
-            "additional planar sets": additional_planar_sets,
-            "relic main stats": stats_df,
-            "relic main stats dict": stats_dict,
-            "substats": substats,
-            "substats dict": substats_dict,
-            "substats details": details_info,
-            "substats comments": comments,
-            "endgame stats": endgame_df,
-            "traces priority": traces_dict,
-            "synergy": synergy_characters,
-            "teams (MoC)": teams_data,
-            "element": char_element,
-        }
-
-        return result
-
-    finally:
-        driver.quit()
+    # Waiting for the content of the tab to load. "build-stats" is only rendered
+    # once the tab is switched, unlike the "content-header" blocks of the other tabs.
+    session.wait(
+        EC.presence_of_element_located((By.CLASS_NAME, "build-stats")),
+        "build and teams"
+    )
+
+    with stage("page source"):
+        return driver.page_source
+
+
+def fetch_character_data_with_selenium(url: str, session: DriverSession | None = None, parser: str = "html.parser",
+                                       as_record: bool = False) -> dict | CharacterRecord:
+    """
+    Fetches data from a Star Rail character page using Selenium.
+
+    Args:
+        url (str): URL of the character page.
+        session (DriverSession, optional): A browser session to reuse. If not given,
+            a temporary browser is started and closed after the page is parsed.
+        parser (str): The BeautifulSoup backend, one of `text_utils.PARSER_BACKENDS`.
+        as_record (bool): Return a compact `records.CharacterRecord` instead of the result dictionary.
+
+    Returns:
+        dict: The result dictionary described in `parse_character_page`,
+        or a `records.CharacterRecord` if `as_record` is True.
+
+    Note:
+        Requires Selenium and a Chrome driver to be installed.
+    """
+    if session is None:
+        with DriverSession() as temporary_session:
+            return fetch_character_data_with_selenium(url, temporary_session, parser, as_record)
+
+    html = fetch_character_html_with_selenium(url, session)
+    result = parse_character_page(make_soup(html, parser), url=url)
+
+    if as_record:
+        return CharacterRecord.from_result(result, url.rstrip('/').rsplit('/', 1)[-1])
 
+    return result
@@ -0,0 +1,145 @@
+from file_io import open_all_results
+from stat_rules import roster_endgame_stats, raw_endgame_stats
+
+import pandas as pd
+
+import argparse
+import os
+
+# Result dictionary key -> name of the consolidated table
+SECTION_TABLES = {
+    "light cones": "light_cones",
+    "relics": "relics",
+    "planar sets": "planar_sets",
+    "relic main stats": "main_stats",
+    "endgame stats": "endgame_stats",
+    "teams (MoC)": "teams",
+}
+
+DATASET_FORMATS = ("parquet", "feather")
+
+
+def read_sections(results: dict) -> dict[str, dict]:
+    """
+    Reads the sections in SECTION_TABLES of every character.
+
+    Characters whose saved result cannot be read (e.g. a corrupt pickle) are skipped
+    with a warning, so one bad file does not abort the export.
+
+    Returns:
+        dict: Character name -> section key -> value.
+    """
+    sections = {}
+
+    for char, result in results.items():
+        try:
+            sections[char] = {key: result.get(key) for key in SECTION_TABLES}
+        except Exception as e:
+            print(f"✖ - Skipping {char}, could not load the saved result: {e}")
+
+    return sections
+
+
+def build_section_tables(results: dict) -> dict[str, pd.DataFrame]:
+    """
+    Concatenates every section across all characters into one table per section.
+
+    Args:
+        results (dict): Character name -> result dictionary or `file_io.LazyResult`.
+            Only the sections in SECTION_TABLES are read from lazy results.
+
+    Returns:
+        dict: Table name -> DataFrame with a leading "character" column.
+        "teams" has the columns "rank", "usage", "rounds" and "team" (list of names).
+        "endgame_stats" is built by `stat_rules.roster_endgame_stats`, with float value columns.
+    """
+    results = read_sections(results)
+    tables = {}
+
+    for key, table_name in SECTION_TABLES.items():
+        if key == "endgame stats":
+            # Parsed again from the raw strings in one pass, with numeric columns
+            tables[table_name] = roster_endgame_stats(raw_endgame_stats(results))
+            continue
+
+        frames = []
+
+        for char, result in results.items():
+            section = result.get(key)
+            if section is None or len(section) == 0:
+                continue
+
+            frame = pd.DataFrame(section)
+            frame.insert(0, "character", char)
+            frames.append(frame)
+
+        table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame({"character": []})
+        table["character"] = table["character"].astype("category")
+        tables[table_name] = table
+
+    return tables
+
+
+def write_dataset(results: dict, directory: str, dataset_format: str = "parquet") -> dict[str, str]:
+    """
+    Writes the consolidated section tables of all characters to a directory.
+
+    Args:
+        results (dict): Character name -> result dictionary.
+        directory (str): The output directory.
+        dataset_format (str): "parquet" or "feather" (Arrow IPC).
+
+    Returns:
+        dict: Table name -> file path.
+    """
+    if dataset_format not in DATASET_FORMATS:
+        raise ValueError(f"Unknown dataset format '{dataset_format}', expected one of {DATASET_FORMATS}")
+
+    os.makedirs(directory, exist_ok=True)
+    paths = {}
+
+    for table_name, table in build_section_tables(results).items():
+        path = os.path.join(directory, f"{table_name}.{dataset_format}")
+
+        if dataset_format == "parquet":
+            table.to_parquet(path, index=False)
+        else:
+            table.to_feather(path)
+
+        paths[table_name] = path
+
+    return paths
+
+
+def read_section(directory: str, table_name: str, columns: list[str] | None = None, dataset_format: str = "parquet") -> pd.DataFrame:
+    """
+    Reads one consolidated table, loading only the requested columns.
+
+    Args:
+        directory (str): The dataset directory.
+        table_name (str): One of the values of SECTION_TABLES.
+        columns (list of str, optional): Columns to read. All columns if not given.
+        dataset_format (str): "parquet" or "feather".
+
+    Returns:
+        pandas.DataFrame: The table.
+    """
+    path = os.path.join(directory, f"{table_name}.{dataset_format}")
+
+    if dataset_format == "parquet":
+        return pd.read_parquet(path, columns=columns)
+
+    return pd.read_feather(path, columns=columns)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the consolidated dataset from the saved character files.")
+    parser.add_argument("-d", "--data-dir", type=str, default="data", help="Directory with the saved character files.")
+    parser.add_argument("-o", "--output", type=str, default="data/dataset", help="Output directory of the dataset.")
+    parser.add_argument("-f", "--format", choices=DATASET_FORMATS, default="parquet", help="Format of the tables.")
+
+    args = parser.parse_args()
+
+    results = open_all_results(args.data_dir)
+    for table_name, path in write_dataset(results, args.output, args.format).items():
+        print(f"Saved {table_name} to {path} (file size: {os.path.getsize(path) / 1024:.2f} KB)")
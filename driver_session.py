@@ -0,0 +1,189 @@
+from stage_timing import stage, add_stage
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import WebDriverException, TimeoutException
+
+import time
+import os
+
+
+def create_chrome_driver() -> webdriver.Chrome:
+    """
+    Starts a new headless Chrome instance with logging suppressed.
+
+    Returns:
+        selenium.webdriver.Chrome: The started driver.
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless') # without opening a browser window
+    options.add_argument('--disable-gpu')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--log-level=3')
+    options.add_argument('--ignore-certificate-errors')
+    options.add_argument('--enable-unsafe-swiftshader')
+    options.add_argument('--ignore-ssl-errors')
+    options.add_argument('--show-capture=no')
+    options.add_argument("--disable-logging")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--output=/dev/null")
+
+    # Redirecting logs to os.devnull
+    service = Service(log_path=os.devnull)
+
+    return webdriver.Chrome(service=service, options=options)
+
+
+class DriverSession:
+    """
+    A long-lived Chrome session that is reused between character pages.
+
+    The browser is started lazily on the first navigation and restarted when it
+    crashes, after `max_pages` pages, or when the JS heap of the current page
+    exceeds `max_memory_mb`.
+
+    Every explicit wait made through `wait` is recorded in `wait_log`.
+
+    Args:
+        max_pages (int): Restart the browser after this many pages (0 - never).
+        max_memory_mb (int): Restart the browser when the page heap exceeds this size in MB (0 - never).
+        wait_timeout (float): Maximum number of seconds a single wait may take.
+    """
+
+    def __init__(self, max_pages: int = 50, max_memory_mb: int = 0, wait_timeout: float = 10):
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.wait_timeout = wait_timeout
+        self.driver = None
+        self.url = None
+        self.pages_loaded = 0
+        self.restarts = 0
+        self.wait_log = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def start(self):
+        """
+        Starts the browser if it is not running yet.
+        """
+        if self.driver is None:
+            with stage("browser start"):
+                self.driver = create_chrome_driver()
+            self.pages_loaded = 0
+
+    def close(self):
+        """
+        Quits the browser, ignoring errors from an already crashed instance.
+        """
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except WebDriverException:
+                pass
+            self.driver = None
+
+    def restart(self, reason: str):
+        """
+        Closes the current browser and starts a fresh one.
+
+        Args:
+            reason (str): Why the browser is restarted, printed to the log.
+        """
+        print(f"Restarting browser: {reason}")
+        self.close()
+        self.restarts += 1
+        self.start()
+
+    def memory_usage_mb(self) -> float | None:
+        """
+        Returns the JS heap size of the current page in MB, or None if it is not available.
+        """
+        try:
+            used = self.driver.execute_script(
+                "return window.performance.memory ? window.performance.memory.usedJSHeapSize : null;"
+            )
+        except WebDriverException:
+            return None
+
+        return used / (1024 * 1024) if used else None
+
+    def _needs_restart(self) -> str | None:
+        if self.max_pages and self.pages_loaded >= self.max_pages:
+            return f"page limit reached ({self.pages_loaded})"
+
+        if self.max_memory_mb:
+            memory = self.memory_usage_mb()
+            if memory is not None and memory >= self.max_memory_mb:
+                return f"memory limit reached ({memory:.0f} MB)"
+
+        return None
+
+    def get(self, url: str) -> webdriver.Chrome:
+        """
+        Navigates the shared browser to the given URL.
+
+        If the browser has crashed, it is restarted and the navigation is retried once.
+
+        Args:
+            url (str): URL of the page to open.
+
+        Returns:
+            selenium.webdriver.Chrome: The driver with the page loaded.
+        """
+        self.start()
+        self.url = url
+
+        reason = self._needs_restart()
+        if reason:
+            self.restart(reason)
+
+        try:
+            with stage("driver.get"):
+                self.driver.get(url)
+        except WebDriverException as e:
+            self.restart(f"browser crashed ({e.__class__.__name__})")
+            with stage("driver.get"):
+                self.driver.get(url)
+
+        self.pages_loaded += 1
+
+        return self.driver
+
+    def wait(self, condition, name: str, required: bool = True):
+        """
+        Waits until the condition is met and records how long it took.
+
+        Args:
+            condition (callable): A Selenium expected condition.
+            name (str): Name of the wait in the log.
+            required (bool): If False, a timeout is logged and None is returned instead of raising.
+
+        Returns:
+            The value returned by the condition, or None if an optional wait timed out.
+        """
+        start = time.perf_counter()
+        timed_out = False
+
+        try:
+            return WebDriverWait(self.driver, self.wait_timeout, poll_frequency=0.1).until(condition)
+
+        except TimeoutException:
+            timed_out = True
+            if required:
+                raise
+            print(f"✖ - Waiting for {name} timed out after {self.wait_timeout} s")
+            return None
+
+        finally:
+            add_stage(f"wait {name}", time.perf_counter() - start)
+            self.wait_log.append({
+                "url": self.url,
+                "wait": name,
+                "seconds": time.perf_counter() - start,
+                "timed out": timed_out,
+            })
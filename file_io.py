@@ -1,22 +1,150 @@
+from stage_timing import timed
+
+import pyarrow as pa
+import pandas as pd
+
+from collections.abc import Mapping
+import threading
+import tempfile
+import shutil
 import pickle
+import glob
+import json
+import re
 import os
 
-def save_result_to_file(result, filename):
+# Version of the directory format written by `save_result_to_dir`
+SCHEMA_VERSION = 1
+
+# Output format -> extension of the saved path
+RESULT_FORMATS = {"pickle": ".pickle", "arrow": ".hsr"}
+
+# Result dictionary key -> file name stem inside a result directory
+SECTION_FILES = {
+    "light cones": "light_cones",
+    "relics": "relics",
+    "planar sets": "planar_sets",
+    "additional planar sets": "additional_planar_sets",
+    "relic main stats": "relic_main_stats",
+    "relic main stats dict": "relic_main_stats_dict",
+    "substats": "substats",
+    "substats dict": "substats_dict",
+    "substats details": "substats_details",
+    "substats comments": "substats_comments",
+    "endgame stats": "endgame_stats",
+    "traces priority": "traces_priority",
+    "synergy": "synergy",
+    "teams (MoC)": "teams_moc",
+    "element": "element",
+}
+
+def _read_umask():
+    # The umask can only be read by setting it, so it is read once at import, before any thread starts
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Permissions that `open` and `os.makedirs` give new files and directories. `tempfile`
+# creates them private (0600 and 0700), and a rename keeps the permissions of the
+# temporary file, so they are set to these before the rename.
+_UMASK = _read_umask()
+FILE_MODE = 0o666 & ~_UMASK
+DIR_MODE = 0o777 & ~_UMASK
+
+# Directories whose entries changed since the last `fsync_pending_dirs`
+PENDING_FSYNC_DIRS = set()
+_pending_lock = threading.Lock()
+
+
+def fsync_dir(dirname):
+    """
+    Flushes the entries of a directory (e.g. a rename) to disk.
+    """
+    if os.name == 'nt':
+        # Directories cannot be opened on Windows, renames there are flushed with the file
+        return
+
+    fd = os.open(dirname or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _sync_dir(dirname, fsync_dir_now):
+    if fsync_dir_now:
+        fsync_dir(dirname)
+    else:
+        with _pending_lock:
+            PENDING_FSYNC_DIRS.add(dirname or ".")
+
+
+def fsync_pending_dirs():
+    """
+    Flushes all directories collected by saves with `fsync_dir_now=False`.
+
+    Call it once at the end of a run to batch the directory syncs of all saved characters.
+    """
+    with _pending_lock:
+        dirnames = sorted(PENDING_FSYNC_DIRS)
+        PENDING_FSYNC_DIRS.clear()
+
+    for dirname in dirnames:
+        fsync_dir(dirname)
+
+
+def _write_synced(target, write, mode):
+    with open(target, mode, **({} if 'b' in mode else {"encoding": "utf-8"})) as file:
+        write(file)
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def atomic_write(filename, write, mode='wb', fsync_dir_now=True):
+    """
+    Writes a file through a temporary file in the same directory and an atomic rename.
+
+    An interrupted write leaves the previous version of the file (or no file) instead
+    of a truncated one.
+
+    Args:
+        filename (str): The target file path.
+        write (callable): `write(file)` that writes the content to the open temporary file.
+        mode (str): 'wb' or 'w' (UTF-8 text).
+        fsync_dir_now (bool): Sync the directory right away. If False, it is added to
+            PENDING_FSYNC_DIRS for `fsync_pending_dirs`.
+    """
+    dirname = os.path.dirname(filename)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=dirname or ".", prefix=f".{os.path.basename(filename)}.", suffix=".tmp")
+    try:
+        _write_synced(fd, write, mode)
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, filename)
+
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    _sync_dir(dirname, fsync_dir_now)
+
+@timed("save")
+def save_result_to_file(result, filename, fsync_dir_now=True):
     """
     Saves the result dictionary containing DataFrames, lists, and other structures into a file.
+
+    The file is replaced atomically, and errors are raised to the caller.
     
     Args:
         result (dict): The dictionary to save.
         filename (str): The file path to save the data.
+        fsync_dir_now (bool): Sync the directory right away instead of in `fsync_pending_dirs`.
     """
-
-    try:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'wb') as file:
-            pickle.dump(result, file)
-    
-    except Exception as e:
-        print(f"Error saving data: {e}")
+    atomic_write(filename, lambda file: pickle.dump(result, file), fsync_dir_now=fsync_dir_now)
 
 
 def load_result_from_file(filename):
@@ -37,4 +165,382 @@ def load_result_from_file(filename):
     
     except Exception as e:
         print(f"Error loading data: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def _section_file(key):
+    return SECTION_FILES.get(key) or re.sub(r'[^0-9a-z]+', '_', key.lower()).strip('_')
+
+
+def _to_json(value):
+    # JSON only has string keys, dictionaries with other keys (e.g. priorities) are stored as pairs
+    if isinstance(value, dict):
+        if all(isinstance(key, str) for key in value):
+            return {key: _to_json(item) for key, item in value.items()}
+        return {"__pairs__": [[key, _to_json(item)] for key, item in value.items()]}
+
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+
+    return value
+
+
+def _from_json(value):
+    if isinstance(value, dict):
+        if set(value) == {"__pairs__"}:
+            return {key: _from_json(item) for key, item in value["__pairs__"]}
+        return {key: _from_json(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+
+    return value
+
+
+def _write_table(file, table):
+    with pa.ipc.new_file(file, table.schema) as writer:
+        writer.write_table(table)
+
+
+@timed("save")
+def save_result_to_dir(result, dirname, fsync_dir_now=True):
+    """
+    Saves the result dictionary in the versioned directory format.
+
+    DataFrames are written as Arrow IPC files, all other sections as JSON files,
+    and `meta.json` lists the sections with the schema version. Unlike pickle, the
+    format does not execute code on load and does not depend on the pandas version.
+
+    The sections are written to a temporary directory that then replaces the
+    previous save, so an interrupted run never leaves a mix of old and new sections.
+
+    Args:
+        result (dict): The dictionary to save.
+        dirname (str): The directory to save the data to (e.g. "data/kafka.hsr").
+        fsync_dir_now (bool): Sync the parent directory right away instead of in `fsync_pending_dirs`.
+    """
+    parent = os.path.dirname(dirname.rstrip(os.sep))
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+
+    tmp_dir = tempfile.mkdtemp(dir=parent or ".", prefix=f".{os.path.basename(dirname)}.", suffix=".tmp")
+    old_dir = f"{tmp_dir}.old"
+
+    try:
+        sections = {}
+
+        for key, value in result.items():
+            stem = _section_file(key)
+
+            if isinstance(value, pd.DataFrame):
+                file_name = f"{stem}.arrow"
+                table = pa.Table.from_pandas(value, preserve_index=False)
+                _write_synced(os.path.join(tmp_dir, file_name), lambda file: _write_table(file, table), 'wb')
+                sections[key] = {"kind": "table", "file": file_name}
+
+            else:
+                file_name = f"{stem}.json"
+                _write_synced(os.path.join(tmp_dir, file_name), lambda file: json.dump(_to_json(value), file, ensure_ascii=False), 'w')
+                sections[key] = {"kind": "json", "file": file_name}
+
+        # Written last: a directory without meta.json is an incomplete save
+        meta = {"schema_version": SCHEMA_VERSION, "sections": sections}
+        _write_synced(os.path.join(tmp_dir, "meta.json"), lambda file: json.dump(meta, file, ensure_ascii=False, indent=2), 'w')
+        fsync_dir(tmp_dir)
+        os.chmod(tmp_dir, DIR_MODE)
+
+        # A non-empty directory cannot be replaced in one rename, the old one is moved aside first
+        if os.path.exists(dirname):
+            os.replace(dirname, old_dir)
+        os.replace(tmp_dir, dirname)
+
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if os.path.exists(old_dir) and not os.path.exists(dirname):
+            os.replace(old_dir, dirname)
+        raise
+
+    shutil.rmtree(old_dir, ignore_errors=True)
+    _sync_dir(parent, fsync_dir_now)
+
+
+def read_result_meta(dirname):
+    """
+    Reads the list of sections of a result directory.
+
+    Args:
+        dirname (str): The result directory.
+
+    Returns:
+        dict: Result dictionary key -> {"kind": "table" or "json", "file": file name}.
+    """
+    with open(os.path.join(dirname, "meta.json"), 'r', encoding='utf-8') as file:
+        meta = json.load(file)
+
+    if meta.get("schema_version", 0) > SCHEMA_VERSION:
+        raise ValueError(f"{dirname} has schema version {meta['schema_version']}, "
+                         f"this version supports up to {SCHEMA_VERSION}")
+
+    return meta["sections"]
+
+
+def load_section_from_dir(dirname, section, memory_map=True):
+    """
+    Loads one section of a result directory.
+
+    Args:
+        dirname (str): The result directory.
+        section (dict): The entry of the section in `read_result_meta`.
+        memory_map (bool): Memory-map Arrow files instead of reading them into memory first.
+
+    Returns:
+        The section value: a DataFrame for tables, a dict, list or string otherwise.
+    """
+    path = os.path.join(dirname, section["file"])
+
+    if section["kind"] == "table":
+        source = pa.memory_map(path, 'r') if memory_map else pa.OSFile(path, 'rb')
+        with source:
+            return pa.ipc.open_file(source).read_all().to_pandas()
+
+    with open(path, 'r', encoding='utf-8') as file:
+        return _from_json(json.load(file))
+
+
+def load_result_from_dir(dirname, memory_map=True):
+    """
+    Loads the result dictionary saved by `save_result_to_dir`.
+
+    Args:
+        dirname (str): The result directory.
+        memory_map (bool): Memory-map Arrow files instead of reading them into memory first.
+
+    Returns:
+        dict: The loaded result dictionary.
+    """
+    return {
+        key: load_section_from_dir(dirname, section, memory_map)
+        for key, section in read_result_meta(dirname).items()
+    }
+
+
+class LazyResult(Mapping):
+    """
+    A read-only view of a saved result that loads every section on first access.
+
+    It has the same keys as the result dictionary. For a ".hsr" directory only the
+    accessed sections are read, so e.g. `LazyResult(path)["teams (MoC)"]` does not
+    touch any table. A ".pickle" file can only be read as a whole; it is loaded on
+    the first access of any section.
+
+    Args:
+        path (str): A ".hsr" directory or a ".pickle" file.
+        memory_map (bool): Memory-map Arrow files of a ".hsr" directory.
+    """
+
+    def __init__(self, path, memory_map=True):
+        self.path = path
+        self.memory_map = memory_map
+        self._loaded = {}
+
+        if path.endswith(RESULT_FORMATS["arrow"]):
+            self._sections = read_result_meta(path)
+        else:
+            self._sections = None
+
+    def _load_pickle(self):
+        result = load_result_from_file(self.path)
+        if result is None:
+            raise ValueError(f"Could not load {self.path}")
+
+        self._loaded = dict(result)
+
+    def __getitem__(self, key):
+        if key in self._loaded:
+            return self._loaded[key]
+
+        if self._sections is None:
+            self._load_pickle()
+            return self._loaded[key]
+
+        value = load_section_from_dir(self.path, self._sections[key], self.memory_map)
+        self._loaded[key] = value
+
+        return value
+
+    def __contains__(self, key):
+        # Checking a key must not load the section
+        if self._sections is not None:
+            return key in self._sections
+
+        if not self._loaded:
+            self._load_pickle()
+
+        return key in self._loaded
+
+    def __iter__(self):
+        if self._sections is None and not self._loaded:
+            self._load_pickle()
+
+        return iter(self._sections if self._sections is not None else self._loaded)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"LazyResult({self.path!r}, loaded={sorted(self._loaded)})"
+
+    def to_dict(self):
+        """
+        Loads all sections and returns them as a regular result dictionary.
+        """
+        return {key: self[key] for key in self}
+
+
+def result_path(char, directory="data", result_format="pickle"):
+    """
+    Returns the path a character is saved to in the given format.
+
+    Args:
+        char (str): The character name.
+        directory (str): The data directory.
+        result_format (str): One of RESULT_FORMATS.
+
+    Returns:
+        str: The file or directory path.
+    """
+    return os.path.join(directory, f"{char}{RESULT_FORMATS[result_format]}")
+
+
+def save_result(result, path, fsync_dir_now=True):
+    """
+    Saves the result dictionary in the format given by the extension of the path.
+
+    Args:
+        result (dict): The dictionary to save.
+        path (str): A ".hsr" directory or a ".pickle" file.
+        fsync_dir_now (bool): Sync the directory right away instead of in `fsync_pending_dirs`.
+    """
+    if path.endswith(RESULT_FORMATS["arrow"]):
+        save_result_to_dir(result, path, fsync_dir_now)
+    else:
+        save_result_to_file(result, path, fsync_dir_now)
+
+
+def load_result(path, memory_map=True):
+    """
+    Loads the result dictionary from a ".hsr" directory or a ".pickle" file.
+
+    Args:
+        path (str): The saved path.
+        memory_map (bool): Memory-map Arrow files of a ".hsr" directory.
+
+    Returns:
+        dict: The loaded result dictionary, or None if it could not be loaded.
+    """
+    if path.endswith(RESULT_FORMATS["arrow"]):
+        try:
+            return load_result_from_dir(path, memory_map)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return None
+
+    return load_result_from_file(path)
+
+
+def result_size(path):
+    """
+    Returns the size of a saved file or directory in bytes.
+    """
+    if os.path.isdir(path):
+        return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+    return os.path.getsize(path)
+
+
+def find_saved_results(directory="data"):
+    """
+    Finds the saved result of every character in a directory.
+
+    Args:
+        directory (str): The directory with the saved files.
+
+    Returns:
+        dict: Character name -> path. The ".hsr" format wins if both exist.
+    """
+    paths = {}
+
+    for extension in (RESULT_FORMATS["pickle"], RESULT_FORMATS["arrow"]):
+        for path in sorted(glob.glob(os.path.join(directory, f"*{extension}"))):
+            if extension == RESULT_FORMATS["arrow"] and not os.path.exists(os.path.join(path, "meta.json")):
+                continue
+            paths[os.path.basename(path)[:-len(extension)]] = path
+
+    return paths
+
+
+def open_all_results(directory="data", memory_map=True):
+    """
+    Opens the saved results of all characters in a directory without loading them.
+
+    Args:
+        directory (str): The directory with the saved files.
+        memory_map (bool): Memory-map Arrow files of ".hsr" directories.
+
+    Returns:
+        dict: Character name -> LazyResult. Directories with an unreadable
+        `meta.json` are skipped.
+    """
+    results = {}
+
+    for char, path in find_saved_results(directory).items():
+        try:
+            results[char] = LazyResult(path, memory_map)
+        except Exception as e:
+            print(f"Error loading data: {e}")
+
+    return results
+
+
+def load_section(directory, key, memory_map=True):
+    """
+    Loads one section of every character saved in a directory.
+
+    Args:
+        directory (str): The directory with the saved files.
+        key (str): The result dictionary key (e.g. "teams (MoC)").
+        memory_map (bool): Memory-map Arrow files of ".hsr" directories.
+
+    Returns:
+        dict: Character name -> section value, for the characters that have the section.
+    """
+    sections = {}
+
+    for char, result in open_all_results(directory, memory_map).items():
+        try:
+            if key in result:
+                sections[char] = result[key]
+        except Exception as e:
+            print(f"Error loading data: {e}")
+
+    return sections
+
+
+def load_all_results(directory="data"):
+    """
+    Loads the result dictionaries of all characters saved in a directory.
+
+    Args:
+        directory (str): The directory with the saved files.
+
+    Returns:
+        dict: Character name -> result dictionary. Files that fail to load are skipped.
+    """
+    results = {}
+
+    for char, path in find_saved_results(directory).items():
+        result = load_result(path)
+        if result is not None:
+            results[char] = result
+
+    return results
\ No newline at end of file
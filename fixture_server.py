@@ -0,0 +1,78 @@
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from functools import partial
+
+import argparse
+import threading
+import os
+
+FIXTURES_DIR = "fixtures/pages"
+
+
+class FixtureRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves saved Prydwen pages under the same paths as the real site.
+
+    * /star-rail/characters -> characters.html
+    * /star-rail/characters/<name> -> <name>.html
+    * any other path is served from the fixtures directory as is (e.g. page-data JSON).
+    """
+
+    def translate_path(self, path):
+        path = path.split('?', 1)[0].split('#', 1)[0].rstrip('/')
+
+        if path == "/star-rail/characters":
+            path = "/characters.html"
+        elif path.startswith("/star-rail/characters/"):
+            path = f"/{path.rsplit('/', 1)[-1]}.html"
+
+        return super().translate_path(path)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def fixture_names(directory: str = FIXTURES_DIR) -> list[str]:
+    """
+    Returns the names of the characters whose pages are saved in the fixtures directory.
+    """
+    return sorted(
+        name[:-len(".html")] for name in os.listdir(directory)
+        if name.endswith(".html") and name != "characters.html"
+    )
+
+
+def start_fixture_server(directory: str = FIXTURES_DIR, port: int = 0) -> ThreadingHTTPServer:
+    """
+    Starts the fixture server in a background thread.
+
+    Args:
+        directory (str): Directory with the saved pages.
+        port (int): Port to listen on (0 - any free port).
+
+    Returns:
+        http.server.ThreadingHTTPServer: The running server. Its base URL is
+        f"http://127.0.0.1:{server.server_port}". Call `shutdown()` to stop it.
+    """
+    handler = partial(FixtureRequestHandler, directory=os.path.abspath(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve saved character pages as a local stand-in for Prydwen.")
+    parser.add_argument("-d", "--directory", type=str, default=FIXTURES_DIR, help="Directory with the saved pages.")
+    parser.add_argument("-p", "--port", type=int, default=8000, help="Port to listen on.")
+
+    args = parser.parse_args()
+
+    server = start_fixture_server(args.directory, args.port)
+    print(f"Serving {args.directory} at http://127.0.0.1:{server.server_port}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
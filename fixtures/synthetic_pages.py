@@ -0,0 +1,268 @@
+"""
+Generates the synthetic character pages in fixtures/pages.
+
+The pages have the markup of Prydwen character pages with the "Build and teams"
+tab loaded, but made-up content, so they can be committed and used offline by the
+parser benchmark, the fixture server and the tests. Run from the repository root
+after changing the characters below:
+
+    python fixtures/synthetic_pages.py
+"""
+from html import escape
+
+import argparse
+import os
+
+CHARACTERS = {
+    "seele": {
+        "element": "Quantum",
+        "light cones": [
+            ("In the Night", 5, 1, "100%", "Signature, the best option by far."),
+            ("Cruising in the Stellar Sea", 5, 1, "92.5%", "Great CRIT Rate source."),
+            ("Only Silence Remains", 4, 5, "81%", "Free to play option."),
+        ],
+        "relics": [
+            ("Genius of Brilliant Stars", "100%", "Quantum DMG +10%.", "Ignores 10% DEF.", False, None),
+            ("Musketeer of Wild Wheat", "90%", "ATK +12%.", "SPD +6%.", True, "Any 2-piece ATK% set works."),
+        ],
+        "planar sets": [
+            ("Rutilant Arena", "100%", "CRIT Rate +8%.", None),
+            ("Izumo Gensei and Takama Divine Realm", "95%", "ATK +12%.", "Needs another Hunt teammate."),
+        ],
+        "main stats": {
+            "Body": ["CRIT Rate", "CRIT DMG"],
+            "Feet": ["SPD", "ATK%"],
+            "Planar Sphere": ["Quantum DMG"],
+            "Link Rope": ["ATK%"],
+        },
+        "substats": "CRIT Rate = CRIT DMG > ATK% > SPD",
+        "details": "Aim for a 1:2 CRIT ratio.",
+        "comments": "SPD is only needed to reach the next breakpoint.",
+        "endgame stats": [
+            "ATK: 3000-3400",
+            "CRIT Rate: 70-80%",
+            "CRIT DMG: 160%+",
+            "SPD: 134 / 160+ if using Messenger",
+            "SPD: 120-134 / 160",
+        ],
+        "skills": "Ultimate > Skill > Talent > Basic ATK",
+        "major traces": "Nightshade > Lacerate > Rippling Waves",
+        "synergy": ["Sparkle", "Silver Wolf", "Tingyun"],
+        "teams": [
+            (1, "12.5%", "3.2", ["seele", "sparkle", "silver-wolf", "fu-xuan"]),
+            (2, "6.1%", "4.8", ["seele", "tingyun", "pela", "luocha"]),
+        ],
+    },
+    "kafka": {
+        "element": "Lightning",
+        "light cones": [
+            ("Patience Is All You Need", 5, 1, "100%", "Signature."),
+            ("Good Night and Sleep Well", 4, 5, "88%", "Best 4-star option."),
+        ],
+        "relics": [
+            ("Prisoner in Deep Confinement", "100%", "ATK +12%.", "Ignores DEF per DoT.", False, None),
+        ],
+        "planar sets": [
+            ("Firmament Frontline: Glamoth", "100%", "ATK +12%.", "Only with enough SPD."),
+            ("Space Sealing Station", "90%", "ATK +12%.", None),
+        ],
+        "main stats": {
+            "Body": ["ATK%"],
+            "Feet": ["SPD", "ATK%"],
+            "Planar Sphere": ["Lightning DMG", "ATK%"],
+            "Link Rope": ["ATK%"],
+        },
+        "substats": "SPD > ATK% > Effect Hit Rate = Break Effect",
+        "details": "",
+        "comments": "Effect Hit Rate only matters against high-resistance enemies.",
+        "endgame stats": [
+            "ATK: 3200+",
+            "SPD: 134-145 (with E1)",
+            "Effect Hit Rate: 0-70% (depends on the enemy)",
+            "SPD: Base Speed / 134",
+            "Break Effect: 180% (with Ruan Mei) / 250% (without)",
+        ],
+        "skills": "Skill = Talent > Ultimate > Basic ATK",
+        "major traces": "Thorns > Torture > Plunder",
+        "synergy": ["Black Swan", "Ruan Mei"],
+        "teams": [
+            (1, "22.3%", "5.1", ["kafka", "black-swan", "ruan-mei", "huohuo"]),
+            (2, "9.4%", "6.0", ["kafka", "black-swan", "sparkle", "fu-xuan"]),
+        ],
+    },
+    "jingliu": {
+        "element": "Ice",
+        "light cones": [
+            ("I Shall Be My Own Sword", 5, 1, "100%", "Signature."),
+            ("On the Fall of an Aeon", 5, 1, "85%", "Universal option."),
+        ],
+        "relics": [
+            ("Hunter of Glacial Forest", "100%", "Ice DMG +10%.", "CRIT DMG +25% after Ultimate.", False, None),
+        ],
+        "planar sets": [
+            ("Rutilant Arena", "100%", "CRIT Rate +8%.", None),
+        ],
+        "main stats": {
+            "Body": ["CRIT DMG"],
+            "Feet": ["SPD"],
+            "Planar Sphere": ["Ice DMG"],
+            "Link Rope": ["ATK%"],
+        },
+        "substats": "CRIT DMG > CRIT Rate > SPD > ATK%",
+        "details": "",
+        "comments": "",
+        "endgame stats": [
+            "HP: 4000+",
+            "CRIT DMG: 190-220%",
+            "SPD: 1-2 Speed slower than the carry, 134+ (with Bronya)",
+        ],
+        "skills": "Skill > Ultimate > Talent",
+        "major traces": "Deathrealm > Sword Champion > Frost Wraith",
+        "synergy": ["Bronya", "Pela"],
+        "teams": [
+            (1, "10.0%", "4.2", ["jingliu", "bronya", "pela", "huohuo"]),
+        ],
+    },
+}
+
+
+def light_cones_html(character: dict) -> str:
+    element = character["element"]
+    cones = "".join(
+        f'<div class="detailed-cones moc">'
+        f'<div class="percentage">{percentage}</div>'
+        f'<span class="hsr-set-name rarity-{rarity}">{escape(name)}</span> <span class="cone-super">(S{superimposition})</span>'
+        f'<div class="information {element}">{escape(description)}</div>'
+        f'</div>'
+        for name, rarity, superimposition, percentage, description in character["light cones"]
+    )
+
+    return f'<div class="content-header {element}">Best Light Cones</div><div class="cones">{cones}</div>'
+
+
+def set_html(element: str, name: str, percentage: str, pieces: dict, flex: bool = False, notes: bool = False) -> str:
+    descriptions = "".join(
+        f'<div><span class="set-piece">({piece})</span><p>{escape(text)}</p></div>' for piece, text in pieces.items()
+    )
+    flex_placeholder = '<div class="flex-placeholder">Flex</div>' if flex else ""
+    classes = f"single-cone with-notes {element}" if notes else f"single-cone {element}"
+
+    return (
+        f'<div class="{classes}">{flex_placeholder}'
+        f'<div class="percentage"><p>{percentage}</p></div>'
+        f'<div class="accordion-item"><button>{escape(name)}</button>'
+        f'<div class="hsr-set-description">{descriptions}</div></div>'
+        f'</div>'
+    )
+
+
+def sets_html(character: dict) -> str:
+    element = character["element"]
+
+    relics = ""
+    for name, percentage, piece_2, piece_4, flex, info in character["relics"]:
+        relics += set_html(element, name, percentage, {2: piece_2, 4: piece_4}, flex, info is not None)
+        if info is not None:
+            relics += f'<div class="information {element}">{escape(info)}</div>'
+
+    planar_sets = ""
+    for name, percentage, piece_2, info in character["planar sets"]:
+        planar_sets += set_html(element, name, percentage, {2: piece_2}, notes=info is not None)
+        if info is not None:
+            planar_sets += f'<div class="information {element}">{escape(info)}</div>'
+
+    return (
+        f'<div class="sets">'
+        f'<h6>Best Relic Sets</h6><div class="detailed-cones moc extra planar">{relics}</div>'
+        f'<h6>Best Planetary Sets</h6><div class="detailed-cones moc extra planar">{planar_sets}'
+        f'<p class="with-margin-top">Other sets:</p><ul class="with-sets"><li>Space Sealing Station</li></ul></div>'
+        f'</div>'
+    )
+
+
+def stats_html(character: dict) -> str:
+    element = character["element"]
+    columns = "".join(
+        f'<div class="col"><div class="stats-header">{escape(part)}</div><div class="list-stats">'
+        + "".join(f'<div class="hsr-stat"><span>{escape(stat)}</span></div>' for stat in stats)
+        + '</div></div>'
+        for part, stats in character["main stats"].items()
+    )
+    endgame = "".join(f'<li><p>{escape(stat)}</p></li>' for stat in character["endgame stats"])
+
+    return (
+        f'<div class="build-stats">'
+        f'<div class="main-stats">{columns}</div>'
+        f'<div class="sub-stats">{escape(character["substats"])}</div>'
+        f'<button>Details about the Stats</button><div class="accordion-body">{escape(character["details"])}</div>'
+        f'<div class="stats-comments"><p>{escape(character["comments"])}</p></div>'
+        f'<div class="content-header {element}">Recommended endgame stats</div>'
+        f'<div><div class="raw list"><ul>{endgame}</ul></div></div>'
+        f'</div>'
+    )
+
+
+def traces_html(character: dict) -> str:
+    element = character["element"]
+
+    return (
+        f'<div class="content-header {element}">Traces priority</div>'
+        f'<div class="row"><div class="box sub-stats"><p>{escape(character["skills"])}</p></div></div>'
+        f'<div class="row"><div class="box sub-stats"><p>{escape(character["major traces"])}</p></div></div>'
+    )
+
+
+def synergy_html(character: dict) -> str:
+    element = character["element"]
+    names = "".join(f'<li><span class="inline-name">{escape(name)}</span></li>' for name in character["synergy"])
+
+    return f'<div class="synergy"><div class="content-header {element}">Synergy</div><ul class="bigger-margin">{names}</ul></div>'
+
+
+def teams_html(character: dict) -> str:
+    rows = "".join(
+        f'<div class="team-row"><p class="rank">Rank {rank}</p><p class="usage">App. rate: {usage}</p>'
+        f'<p class="rounds">Avg. cycles: {rounds}</p>'
+        + "".join(f'<a href="/star-rail/characters/{member}">{member}</a>' for member in members)
+        + '</div>'
+        for rank, usage, rounds, members in character["teams"]
+    )
+
+    return f'<div class="team-container-moc">{rows}</div>'
+
+
+def character_page(name: str, character: dict) -> str:
+    element = character["element"]
+
+    return (
+        f'<!DOCTYPE html>\n<html><head><title>{name.capitalize()} | Honkai: Star Rail | Prydwen</title></head><body>\n'
+        f'<div class="tabs"><div class="single-tab {element} active">Profile</div>'
+        f'<div class="single-tab {element}">Build and teams</div></div>\n'
+        f'{light_cones_html(character)}\n{sets_html(character)}\n{stats_html(character)}\n'
+        f'{traces_html(character)}\n{synergy_html(character)}\n{teams_html(character)}\n'
+        f'</body></html>\n'
+    )
+
+
+def character_list_page(names) -> str:
+    links = "".join(f'<a href="/star-rail/characters/{name}">{name}</a>' for name in names)
+
+    return f'<!DOCTYPE html>\n<html><body><div class="characters">{links}</div></body></html>\n'
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write the synthetic character pages.")
+    parser.add_argument("-d", "--directory", type=str, default="fixtures/pages", help="Output directory.")
+
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+
+    for name, character in CHARACTERS.items():
+        with open(os.path.join(args.directory, f"{name}.html"), 'w', encoding='utf-8') as file:
+            file.write(character_page(name, character))
+
+    with open(os.path.join(args.directory, "characters.html"), 'w', encoding='utf-8') as file:
+        file.write(character_list_page(CHARACTERS))
+
+    print(f"Saved {len(CHARACTERS)} pages to {args.directory}")
@@ -0,0 +1,129 @@
+import threading
+import hashlib
+import json
+import time
+import os
+
+CACHE_DIR = "cache/html"
+
+
+class HtmlCache:
+    """
+    A content-addressed on-disk cache of character page HTML.
+
+    Pages are stored once per distinct content in `objects/<sha256>.html`, and
+    `index.json` maps every URL to the hash of its latest page. Entries older
+    than `ttl` seconds are dropped, and the least recently used ones are evicted
+    when the total size exceeds `max_bytes`.
+
+    Args:
+        directory (str): Directory of the cache.
+        ttl (float): Lifetime of an entry in seconds (0 - unlimited).
+        max_bytes (int): Maximum total size of the stored pages (0 - unlimited).
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, ttl: float = 7 * 24 * 3600, max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(directory, "index.json")
+        self._objects_dir = os.path.join(directory, "objects")
+
+        os.makedirs(self._objects_dir, exist_ok=True)
+
+        if os.path.exists(self._index_path):
+            with open(self._index_path, 'r', encoding='utf-8') as file:
+                self._index = json.load(file)
+        else:
+            self._index = {}
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self._objects_dir, f"{content_hash}.html")
+
+    def _is_expired(self, entry: dict, now: float) -> bool:
+        return bool(self.ttl) and now - entry["stored at"] > self.ttl
+
+    def _save_index(self):
+        with open(self._index_path, 'w', encoding='utf-8') as file:
+            json.dump(self._index, file, indent=2, sort_keys=True)
+
+    def flush(self):
+        """
+        Writes the index, including the access times of pages read since the last write.
+        """
+        with self._lock:
+            self._save_index()
+
+    def urls(self) -> list[str]:
+        """
+        Returns the URLs of all cached pages that have not expired.
+        """
+        now = time.time()
+        with self._lock:
+            return sorted(url for url, entry in self._index.items() if not self._is_expired(entry, now))
+
+    def get(self, url: str) -> str | None:
+        """
+        Returns the cached HTML of the URL, or None if it is missing or expired.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._index.get(url)
+            if entry is None or self._is_expired(entry, now):
+                return None
+
+            try:
+                with open(self._object_path(entry["hash"]), 'r', encoding='utf-8', newline='') as file:
+                    html = file.read()
+            except FileNotFoundError:
+                del self._index[url]
+                self._save_index()
+                return None
+
+            # Persisted on the next `put` or `flush`
+            entry["accessed at"] = now
+
+        return html
+
+    def put(self, url: str, html: str):
+        """
+        Stores the HTML of the URL and evicts old entries if the cache is over its limits.
+        """
+        data = html.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        now = time.time()
+
+        with self._lock:
+            path = self._object_path(content_hash)
+            if not os.path.exists(path):
+                with open(path, 'wb') as file:
+                    file.write(data)
+
+            self._index[url] = {"hash": content_hash, "size": len(data), "stored at": now, "accessed at": now}
+            self._evict(now)
+            self._save_index()
+
+    def _evict(self, now: float):
+        for url in [url for url, entry in self._index.items() if self._is_expired(entry, now)]:
+            del self._index[url]
+
+        if self.max_bytes:
+            # Pages with identical content share one object, count it once
+            sizes = {entry["hash"]: entry["size"] for entry in self._index.values()}
+            total = sum(sizes.values())
+
+            for url, entry in sorted(self._index.items(), key=lambda item: item[1]["accessed at"]):
+                if total <= self.max_bytes:
+                    break
+
+                del self._index[url]
+                if all(other["hash"] != entry["hash"] for other in self._index.values()):
+                    total -= entry["size"]
+
+        # Remove objects that are no longer referenced
+        referenced = {f"{entry['hash']}.html" for entry in self._index.values()}
+        for name in os.listdir(self._objects_dir):
+            if name not in referenced:
+                os.remove(os.path.join(self._objects_dir, name))
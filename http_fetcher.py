@@ -0,0 +1,123 @@
+from character_parser import (
+    find_element_from_page,
+    has_build_sections,
+    page_has_build_sections,
+    parse_character_page,
+    fetch_character_html_with_selenium,
+)
+from driver_session import DriverSession
+from text_utils import make_soup
+from stage_timing import timed
+
+from bs4 import BeautifulSoup
+import requests
+
+FETCH_MODES = ("selenium", "http", "auto")
+
+
+class BuildDataNotFoundError(Exception):
+    """
+    The server-rendered page has no build data, and the mode does not allow the browser.
+
+    Unlike `character_parser.TabNotFoundError` this is not retried: the server
+    sends the same static page on every download.
+    """
+
+
+@timed("http get")
+def fetch_character_html_with_requests(url: str, http_session: requests.Session | None = None, timeout: float = 10) -> str:
+    """
+    Downloads the server-rendered HTML of a character page without a browser.
+
+    Args:
+        url (str): URL of the character page.
+        http_session (requests.Session, optional): A session to reuse connections.
+        timeout (float): Request timeout in seconds.
+
+    Returns:
+        str: The HTML of the page.
+    """
+    response = (http_session or requests).get(url, timeout=timeout)
+    response.raise_for_status()
+
+    return response.text
+
+
+def fetch_character_page(url: str, session: DriverSession, mode: str = "auto", http_session: requests.Session | None = None,
+                         parser: str = "html.parser", parse: bool = True, html: str | None = None) -> tuple[str, BeautifulSoup | None]:
+    """
+    Fetches a character page with the "Build and teams" content loaded.
+
+    In "auto" mode the page is first downloaded over plain HTTP. The browser is
+    used only when the server-rendered HTML does not contain the build sections.
+    In "http" mode such a page raises `BuildDataNotFoundError`.
+
+    Args:
+        url (str): URL of the character page.
+        session (DriverSession): The browser session used by the "selenium" mode and the fallback.
+        mode (str): One of "selenium", "http" or "auto".
+        http_session (requests.Session, optional): A session to reuse connections.
+        parser (str): The BeautifulSoup backend, one of `text_utils.PARSER_BACKENDS`.
+        parse (bool): If False, the page is not parsed at all, for callers that parse the
+            HTML elsewhere (e.g. in a parser process). The build sections are then looked
+            up in the raw HTML with `page_has_build_sections`.
+        html (str, optional): The page already downloaded over plain HTTP (e.g. by
+            `manifest.check_page`), used instead of downloading it again in "http" and "auto" mode.
+
+    Returns:
+        str: The HTML of the page.
+        bs4.BeautifulSoup or None: The parsed page, None if `parse` is False.
+    """
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode '{mode}', expected one of {FETCH_MODES}")
+
+    if mode in ("http", "auto"):
+        if html is None:
+            html = fetch_character_html_with_requests(url, http_session)
+
+        if parse:
+            soup = make_soup(html, parser)
+            found = has_build_sections(soup, find_element_from_page(soup, url))
+        else:
+            soup, found = None, page_has_build_sections(html)
+
+        if found:
+            print("✔ - Build data found in the server-rendered page")
+            return html, soup
+
+        if mode == "http":
+            raise BuildDataNotFoundError("Build data not found in the server-rendered page")
+
+        print("✖ - Build data not found in the server-rendered page, using the browser")
+
+    html = fetch_character_html_with_selenium(url, session)
+
+    return html, make_soup(html, parser) if parse else None
+
+
+def parse_server_rendered_page(url: str, status: int, html: str, parser: str = "html.parser") -> tuple[str, dict | None]:
+    """
+    Parses a page downloaded over plain HTTP if it already contains the build data.
+
+    Args:
+        url (str): URL of the character page.
+        status (int): HTTP status code of the response.
+        html (str): The HTML of the page.
+        parser (str): The BeautifulSoup backend, one of `text_utils.PARSER_BACKENDS`.
+
+    Returns:
+        str: The HTML of the page.
+        dict or None: The result dictionary, or None if the page has to be opened in the browser.
+    """
+    if status != 200:
+        response = requests.Response()
+        response.status_code = status
+        raise requests.HTTPError(f"{status} error for url: {url}", response=response)
+
+    soup = make_soup(html, parser)
+    char_element = find_element_from_page(soup, url)
+
+    if not has_build_sections(soup, char_element):
+        return html, None
+
+    return html, parse_character_page(soup, char_element)
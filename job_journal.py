@@ -0,0 +1,113 @@
+import threading
+import json
+import time
+import os
+
+JOURNAL_PATH = "data/journal.jsonl"
+
+JOB_STATUSES = ("pending", "done", "failed")
+
+
+class JobJournal:
+    """
+    An append-only JSON lines log of the status of every character in a run.
+
+    A run starts with a "start" record listing its characters. Every character then
+    gets a "pending" record when a worker takes it and a "done" or "failed" record
+    when it is finished, so an interrupted run can be continued with `remaining`.
+
+    Args:
+        filename (str): The file path of the journal.
+    """
+
+    def __init__(self, filename: str = JOURNAL_PATH):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._attempts = {}
+
+    def _append(self, record: dict):
+        record["at"] = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.filename) or ".", exist_ok=True)
+            with open(self.filename, 'a', encoding='utf-8') as file:
+                file.write(line)
+                file.flush()
+                os.fsync(file.fileno())
+
+    def read(self) -> tuple[list[str], dict]:
+        """
+        Replays the last run of the journal.
+
+        Returns:
+            list: The characters of the last run, in their original order.
+            dict: Character name -> {"status", "reason", "attempt"} of its latest record.
+            Characters without records are missing.
+        """
+        char_list, states = [], {}
+
+        if not os.path.exists(self.filename):
+            return char_list, states
+
+        with open(self.filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # The last line of a killed run may be cut off
+                    continue
+
+                if record.get("event") == "start":
+                    char_list, states = record["characters"], {}
+                elif record.get("status") in JOB_STATUSES:
+                    states[record["character"]] = {
+                        "status": record["status"],
+                        "reason": record.get("reason"),
+                        "attempt": record.get("attempt", 1),
+                    }
+
+        return char_list, states
+
+    def start(self, char_list: list[str]):
+        """
+        Starts a new run with the given characters.
+        """
+        self._attempts = {}
+        self._append({"event": "start", "characters": list(char_list)})
+
+    def resume(self) -> list[str]:
+        """
+        Continues the last run.
+
+        Returns:
+            list: The characters of the last run that are not done yet (never started,
+            interrupted or failed), in their original order.
+        """
+        char_list, states = self.read()
+        self._attempts = {char: state["attempt"] for char, state in states.items()}
+
+        return [char for char in char_list if states.get(char, {}).get("status") != "done"]
+
+    def pending(self, char: str):
+        """
+        Records that a character was taken by a worker.
+        """
+        with self._lock:
+            attempt = self._attempts.get(char, 0) + 1
+            self._attempts[char] = attempt
+
+        self._append({"character": char, "status": "pending", "attempt": attempt})
+
+    def finish(self, char: str, failed: bool = False, reason: str | None = None):
+        """
+        Records that a character is done, or failed with the given reason.
+        """
+        with self._lock:
+            attempt = self._attempts.get(char, 1)
+
+        record = {"character": char, "status": "failed" if failed else "done", "attempt": attempt}
+        if reason:
+            record["reason"] = reason
+
+        self._append(record)
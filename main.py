@@ -1,58 +1,582 @@
 import argparse
-from file_io import save_result_to_file
+from file_io import save_result, result_path, result_size, open_all_results, fsync_pending_dirs, RESULT_FORMATS
+from dataset_writer import write_dataset, DATASET_FORMATS
 from character_list_parser import fetch_character_names
-from character_parser import fetch_character_data_with_selenium
+from character_parser import parse_character_page, load_known_elements, save_known_elements, KNOWN_ELEMENTS
+from http_fetcher import fetch_character_page, parse_server_rendered_page, FETCH_MODES
+from async_fetcher import AsyncFetcher, fetch_character_names_async
+from driver_session import DriverSession
+from rate_limiter import RateLimiter
+from manifest import load_manifest, save_manifest, check_page, check_result, mark_parsed
+from html_cache import HtmlCache, CACHE_DIR
+from sqlite_store import SQLiteStore, DB_PATH
+from job_journal import JobJournal, JOURNAL_PATH
+from retry_policy import classify_failure, is_retryable, backoff_delay
+from stage_timing import StageLog, add_stage
+from parse_pool import create_parse_pool, parse_html
+from text_utils import make_soup, PARSER_BACKENDS
 
+from functools import partial
+import contextlib
 import requests
+import threading
+import asyncio
+import queue
 import time
 import os
 
-def process_characters(char_list):
+BASE_URL = "https://www.prydwen.gg"
+
+DEFAULT_OPTIONS = {
+    "max_pages": 50,
+    "max_memory_mb": 0,
+    "wait_timeout": 10,
+    "workers": 1,
+    "delay": 5,
+    "mode": "selenium",
+    "base_url": BASE_URL,
+    "html_dir": None,
+    "incremental": False,
+    "cache_dir": CACHE_DIR,
+    "cache_ttl": 7 * 24 * 3600,
+    "cache_max_mb": 500,
+    "from_cache": False,
+    "parser": "html.parser",
+    "dataset_dir": None,
+    "dataset_format": "parquet",
+    "result_format": "pickle",
+    "db_path": DB_PATH,
+    "batch_fsync": False,
+    "journal_path": JOURNAL_PATH,
+    "resume": False,
+    "max_retries": 3,
+    "retry_backoff": 2.0,
+    "timings_path": None,
+    "parse_workers": 0,
+}
+
+def process_characters(char_list, **options):
+    options = {**DEFAULT_OPTIONS, **options}
+
     error_list = []
+    report = {"refreshed": [], "skipped": [], "failed": error_list}
+    wait_log = []
+    manifest = load_manifest() if options["incremental"] else None
+    lock = threading.Lock()
+    rate_limiter = RateLimiter(options["delay"])
+    cache = open_cache(options)
+    store = SQLiteStore(options["db_path"]) if options["result_format"] == "sqlite" else None
+    journal = JobJournal(options["journal_path"]) if options["journal_path"] else None
+    stage_log = StageLog(options["timings_path"])
+    parse_pool = create_parse_pool(options["parse_workers"]) if options["parse_workers"] > 0 else None
+    load_known_elements()
+
+    if journal is not None:
+        if options["resume"]:
+            # Restores the attempt counts of the interrupted run
+            journal.resume()
+        else:
+            journal.start(char_list)
 
+    if options["from_cache"]:
+        # Re-parse cached pages only, without touching the network
+        process_characters_from_cache(char_list, options, cache, report, store, journal, stage_log)
+        char_list = []
+
+    elif options["mode"] == "async":
+        # Pages without the build data in the server-rendered HTML go to the browser workers
+        char_list = asyncio.run(process_characters_async(char_list, options, cache, report, store, journal, stage_log, parse_pool))
+        options["mode"] = "selenium"
+
+    # (earliest start time on the monotonic clock, index, character, attempt), ready characters first.
+    # Every item is marked done only after its retry, if any, is queued, so `join` waits for retries too.
+    char_queue = queue.PriorityQueue()
     for i, char in enumerate(char_list):
-        try:
-            char_str = f' {char} ({i+1}/{len(char_list)}) '
-            print(f'{char_str:-^50}')
+        char_queue.put((0.0, i, char, 1))
 
-            url = f"https://www.prydwen.gg/star-rail/characters/{char}"
-            data = fetch_character_data_with_selenium(url)
+    # (character, url, html, manifest entry, timing record, future of the parser process).
+    # Bounded, so the browsers wait instead of piling up pages in memory when parsing falls behind.
+    parsed_queue = queue.Queue(maxsize=2 * max(1, options["parse_workers"]))
 
-            save_result_to_file(data, f"data/{char}.pickle")
-            print(f'Saved to file data/{char}.pickle (file size: {os.path.getsize(f"data/{char}.pickle") / 1024:.2f} KB)')
+    def saver():
+        # Saves the pages parsed by the parser processes, so the browsers never wait for parsing
+        while True:
+            item = parsed_queue.get()
+            if item is None:
+                return
 
-        except requests.ReadTimeout:
-            print(f"Waiting time has expired for character {char}. Skip...")
-            error_list.append(char)
+            char, url, html, entry, record, future = item
+            status, failure = "refreshed", None
 
-        except Exception as e:
-            print(f"Error for {char}: {e}")
-            error_list.append(char)
+            # Waiting for the parser process is not timed: the time spent parsing comes from the process itself
+            try:
+                data, parse_record = future.result()
+            except Exception as e:
+                data, parse_record, error = None, None, e
+            else:
+                error = None
 
-        print('')
-        
-        if i != len(char_list) - 1:
-            time.sleep(5)
+            with stage_log.character(char, record):
+                if parse_record is not None:
+                    record["total"] += parse_record["total"]
+                    for name, seconds in parse_record["stages"].items():
+                        add_stage(name, seconds)
+
+                if error is not None:
+                    print(f"Error for {char}: {error}")
+                    status, failure = "failed", (classify_failure(error, "parse"), str(error))
+                else:
+                    unchanged = False
+                    if entry is not None:
+                        entry, unchanged = check_unchanged(char, data, entry, options, store)
+
+                    if unchanged:
+                        status = "skipped"
+                    else:
+                        failure = save_with_retries(char, html, data, options, store)
+                        if failure is not None:
+                            status = "failed"
+
+            with lock:
+                record_status(report, journal, char, status, f"{failure[0]}: {failure[1]}" if failure else None)
+                if manifest is not None and entry is not None and status != "failed":
+                    manifest[char] = mark_parsed(entry) if status == "refreshed" else entry
+
+    def worker():
+        # Each worker keeps its own long-lived browser
+        with DriverSession(max_pages=options["max_pages"], max_memory_mb=options["max_memory_mb"], wait_timeout=options["wait_timeout"]) as session, \
+                requests.Session() as http_session:
+            record = None
+
+            def defer_parse(char, url, html, entry):
+                parsed_queue.put((char, url, html, entry, record, parse_pool.submit(parse_html, html, url, options["parser"])))
+
+            while True:
+                not_before, i, char, attempt = char_queue.get()
+                if char is None:
+                    wait_log.extend(session.wait_log)
+                    char_queue.task_done()
+                    return
+
+                try:
+                    backoff = not_before - time.monotonic()
+                    if backoff > 0:
+                        # Only retries in backoff are left: put it back and look again shortly,
+                        # so a retry queued meanwhile by another worker is not held up
+                        char_queue.put((not_before, i, char, attempt))
+                        time.sleep(min(backoff, 0.5))
+                        continue
+
+                    if journal is not None:
+                        journal.pending(char)
+
+                    rate_limiter.wait()
+                    with stage_log.character(char, final=parse_pool is None, attempt=attempt) as record:
+                        status, entry, failure = process_character(char, i, len(char_list), session, http_session, options, cache, manifest, store,
+                                                                   defer_parse if parse_pool is not None else None)
+
+                    if status == "parsing":
+                        continue
+
+                    if parse_pool is not None:
+                        stage_log.finish(record)
+
+                    if failure is not None and is_retryable(failure[0]) and attempt <= options["max_retries"]:
+                        delay = backoff_delay(attempt, options["retry_backoff"])
+                        print(f"✖ - {char}: {failure[0]}, retry {attempt}/{options['max_retries']} in {delay:.1f} s")
+                        char_queue.put((time.monotonic() + delay, i, char, attempt + 1))
+                        continue
+
+                    with lock:
+                        record_status(report, journal, char, status, f"{failure[0]}: {failure[1]}" if failure else None)
+                        if manifest is not None and entry is not None:
+                            manifest[char] = entry
+
+                finally:
+                    char_queue.task_done()
+
+    saver_thread = threading.Thread(target=saver)
+    saver_thread.start()
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, min(options["workers"], len(char_list))))]
+    for thread in threads:
+        thread.start()
+
+    # Workers stay up until every character, including its retries, is finished
+    # (or until all of them have died, e.g. because no browser could be started)
+    while char_queue.unfinished_tasks and any(thread.is_alive() for thread in threads):
+        time.sleep(0.1)
+    for thread in threads:
+        char_queue.put((float("inf"), -1, None, 0))
+    for thread in threads:
+        thread.join()
+
+    parsed_queue.put(None)
+    saver_thread.join()
+
+    if parse_pool is not None:
+        parse_pool.shutdown()
+
+    if manifest is not None:
+        save_manifest(manifest)
+
+    if cache is not None:
+        cache.flush()
+
+    if store is not None:
+        store.close()
+
+    if options["batch_fsync"]:
+        fsync_pending_dirs()
+
+    save_known_elements()
+
+    if options["dataset_dir"]:
+        # Rebuilt from all saved files, so skipped and earlier characters are included too
+        for table_name, path in write_dataset(open_all_results("data"), options["dataset_dir"], options["dataset_format"]).items():
+            print(f"Saved {table_name} to {path}")
+
+    print_wait_summary(wait_log)
+    stage_log.print_summary()
+    print(f'Refreshed: {len(report["refreshed"])}, skipped (unchanged): {len(report["skipped"])}, failed: {len(report["failed"])}')
 
     if len(error_list) > 0:
         print(f'List of characters missed due to an error:{error_list}')
     else:
         print('All characters have been successfully processed.')
 
+
+def record_status(report, journal, char, status, reason=None):
+    report[status].append(char)
+
+    if journal is not None:
+        journal.finish(char, failed=status == "failed", reason=reason)
+
+
+def print_wait_summary(wait_log):
+    waits = {}
+    for record in wait_log:
+        waits.setdefault(record["wait"], []).append(record)
+
+    for name, records in waits.items():
+        seconds = [record["seconds"] for record in records]
+        timeouts = sum(record["timed out"] for record in records)
+        print(f'Wait "{name}": total {sum(seconds):.2f} s, avg {sum(seconds) / len(seconds):.2f} s, max {max(seconds):.2f} s, timeouts {timeouts}')
+
+
+def open_cache(options):
+    if not options["cache_dir"]:
+        return None
+
+    return HtmlCache(options["cache_dir"], options["cache_ttl"], options["cache_max_mb"] * 1024 * 1024)
+
+
+def cached_characters(options):
+    prefix = f"{options['base_url']}/star-rail/characters/"
+    return [url[len(prefix):] for url in open_cache(options).urls() if url.startswith(prefix)]
+
+
+def character_url(char, options):
+    return f"{options['base_url']}/star-rail/characters/{char}"
+
+
+def process_characters_from_cache(char_list, options, cache, report, store=None, journal=None, stage_log=None):
+    for i, char in enumerate(char_list):
+        char_str = f' {char} ({i+1}/{len(char_list)}) '
+        print(f'{char_str:-^50}')
+
+        if journal is not None:
+            journal.pending(char)
+
+        url = character_url(char, options)
+        html = cache.get(url)
+        if html is None:
+            print(f"Page of {char} is not in the cache. Skip...")
+            record_status(report, journal, char, "failed", "not in the cache")
+            print('')
+            continue
+
+        try:
+            with stage_log.character(char) if stage_log else contextlib.nullcontext():
+                data = parse_character_page(make_soup(html, options["parser"]), url=url)
+                save_character(char, html, data, options, store)
+            record_status(report, journal, char, "refreshed")
+        except Exception as e:
+            print(f"Error for {char}: {e}")
+            record_status(report, journal, char, "failed", str(e))
+
+        print('')
+
+
+async def fetch_character_list_async(url, options):
+    async with AsyncFetcher(concurrency=1, interval=options["delay"]) as fetcher:
+        return await fetch_character_names_async(fetcher, url)
+
+
+async def process_characters_async(char_list, options, cache, report, store=None, journal=None, stage_log=None, parse_pool=None):
+    urls = {character_url(char, options): char for char in char_list}
+    needs_browser = []
+
+    async with AsyncFetcher(concurrency=options["workers"], interval=options["delay"]) as fetcher:
+        async for url, parsed, error in fetcher.iter_parsed(list(urls), partial(parse_server_rendered_page, parser=options["parser"]), parse_pool):
+            char = urls[url]
+
+            if error is not None:
+                failure_class = classify_failure(error, "fetch")
+                if is_retryable(failure_class) and options["max_retries"] > 0:
+                    # Retried by the browser workers with backoff
+                    print(f"✖ - {char}: {failure_class}, retrying with the browser")
+                    needs_browser.append(char)
+                    continue
+
+                print(f"Error for {char}: {error}")
+                record_status(report, journal, char, "failed", f"{failure_class}: {error}")
+                continue
+
+            html, data = parsed
+            if data is None:
+                print(f"✖ - {char}: build data not found in the server-rendered page, using the browser")
+                needs_browser.append(char)
+                continue
+
+            try:
+                # Parsing ran in the executor, only the save is timed here
+                with stage_log.character(char) if stage_log else contextlib.nullcontext():
+                    if cache is not None:
+                        cache.put(url, html)
+                    failure = save_with_retries(char, html, data, options, store)
+            except Exception as e:
+                print(f"Error for {char}: {e}")
+                failure = classify_failure(e, "save"), str(e)
+
+            if failure is not None:
+                record_status(report, journal, char, "failed", f"{failure[0]}: {failure[1]}")
+            else:
+                record_status(report, journal, char, "refreshed")
+
+    return needs_browser
+
+
+def save_with_retries(char, html, data, options, store=None):
+    """
+    Saves a parsed character, retrying write errors with backoff.
+
+    Returns the failure as (failure class, message), or None if the character was saved.
+    """
+    for attempt in range(1, options["max_retries"] + 2):
+        try:
+            save_character(char, html, data, options, store)
+            return None
+        except Exception as e:
+            print(f"Error for {char}: {e}")
+            if attempt > options["max_retries"]:
+                return classify_failure(e, "save"), str(e)
+
+            delay = backoff_delay(attempt, options["retry_backoff"])
+            print(f"✖ - {char}: write error, retry {attempt}/{options['max_retries']} in {delay:.1f} s")
+            time.sleep(delay)
+
+
+def check_unchanged(char, data, entry, options, store=None):
+    """
+    Adds the hash of the parsed build data to the manifest entry of a character.
+
+    Returns the updated entry and True if the build data has not changed since the
+    character was saved, so the save can be skipped.
+    """
+    changed, entry = check_result(entry, data)
+    if changed or not is_saved(char, options, store):
+        return entry, False
+
+    print(f"✔ - Build data has not changed since {entry.get('parsed at')}. Skip...")
+    return entry, True
+
+
+def is_saved(char, options, store=None):
+    if store is not None:
+        return store.has_character(char)
+
+    return os.path.exists(result_path(char, result_format=options["result_format"]))
+
+
+def save_character(char, html, data, options, store=None):
+    if data["element"]:
+        # Lets the next run skip element detection for this character
+        KNOWN_ELEMENTS[char] = data["element"]
+
+    if options["html_dir"]:
+        os.makedirs(options["html_dir"], exist_ok=True)
+        with open(os.path.join(options["html_dir"], f"{char}.html"), 'w', encoding='utf-8') as file:
+            file.write(html)
+
+    if store is not None:
+        # All sections of the character are replaced in one transaction
+        store.upsert_character(char, data)
+        print(f'Saved to {store.filename}')
+        return
+
+    path = result_path(char, result_format=options["result_format"])
+    save_result(data, path, fsync_dir_now=not options["batch_fsync"])
+    print(f'Saved to {path} (size: {result_size(path) / 1024:.2f} KB)')
+
+
+def process_character(char, i, total, session, http_session, options, cache=None, manifest=None, store=None, defer_parse=None):
+    """
+    Fetches, parses and saves one character.
+
+    Returns the status of the character ("refreshed", "skipped" or "failed"),
+    the manifest entry to store for it (None if the manifest is not used or the character failed)
+    and the failure as (failure class, message) (None unless it failed).
+
+    If `defer_parse(char, url, html, entry)` is given, the fetched page is handed to it
+    instead of being parsed and saved here, and the status is "parsing".
+    """
+    entry = None
+    page = None
+    stage = "fetch"
+
+    try:
+        char_str = f' {char} ({i+1}/{total}) '
+        print(f'{char_str:-^50}')
+
+        url = character_url(char, options)
+
+        if manifest is not None:
+            changed, entry, page = check_page(url, manifest.get(char), http_session)
+            if not changed and is_saved(char, options, store):
+                print(f"✔ - Page has not changed since {entry.get('parsed at')}. Skip...")
+                return "skipped", entry, None
+
+        # The response of the conditional request is the whole page, it is not downloaded again
+        html, soup = fetch_character_page(url, session, options["mode"], http_session, options["parser"], parse=defer_parse is None, html=page)
+        if cache is not None:
+            cache.put(url, html)
+
+        if defer_parse is not None:
+            # Parsed in a parser process and saved by the saver thread
+            defer_parse(char, url, html, entry)
+            return "parsing", entry, None
+
+        stage = "parse"
+        data = parse_character_page(soup, url=url)
+
+        if entry is not None:
+            entry, unchanged = check_unchanged(char, data, entry, options, store)
+            if unchanged:
+                return "skipped", entry, None
+
+        # Write errors are retried here, so the page is not fetched again
+        failure = save_with_retries(char, html, data, options, store)
+        if failure is not None:
+            return "failed", None, failure
+
+    except requests.ReadTimeout:
+        print(f"Waiting time has expired for character {char}. Skip...")
+        return "failed", None, ("navigation timeout", "read timeout")
+
+    except Exception as e:
+        print(f"Error for {char}: {e}")
+        return "failed", None, (classify_failure(e, stage), str(e))
+
+    finally:
+        print('')
+
+    return "refreshed", mark_parsed(entry) if entry is not None else None, None
+
+
+def run_options(args):
+    return {
+        "max_pages": args.max_pages,
+        "max_memory_mb": args.max_memory_mb,
+        "wait_timeout": args.wait_timeout,
+        "workers": args.workers,
+        "delay": args.delay,
+        "mode": args.mode,
+        "base_url": args.base_url,
+        "html_dir": args.save_html,
+        "incremental": args.incremental,
+        "cache_dir": None if args.no_cache else args.cache_dir,
+        "cache_ttl": args.cache_ttl * 3600,
+        "cache_max_mb": args.cache_max_mb,
+        "from_cache": args.from_cache,
+        "parser": args.parser,
+        "dataset_dir": args.dataset,
+        "dataset_format": args.dataset_format,
+        "result_format": args.format,
+        "db_path": args.db,
+        "batch_fsync": args.batch_fsync,
+        "journal_path": args.journal,
+        "resume": args.resume,
+        "max_retries": args.max_retries,
+        "retry_backoff": args.retry_backoff,
+        "timings_path": args.timings,
+        "parse_workers": args.parse_workers,
+    }
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Parsing of character data.")
     parser.add_argument("-c", "--character", type=str, help="The name of the character to be parsed.")
     parser.add_argument("-a", "--all", action="store_true", help="Process all characters.")
+    parser.add_argument("--max-pages", type=int, default=50, help="Restart the browser after this many pages (0 - never).")
+    parser.add_argument("--max-memory-mb", type=int, default=0, help="Restart the browser when the page heap exceeds this size in MB (0 - never).")
+    parser.add_argument("--wait-timeout", type=float, default=10, help="Maximum number of seconds to wait for page content to appear.")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of browsers processing characters in parallel.")
+    parser.add_argument("--delay", type=float, default=5, help="Minimum delay in seconds between page requests across all workers.")
+    parser.add_argument("-m", "--mode", choices=FETCH_MODES + ("async",), default="selenium", help="How to fetch pages: browser only, plain HTTP only, HTTP with browser fallback, or concurrent async HTTP with browser fallback.")
+    parser.add_argument("--base-url", type=str, default=BASE_URL, help="Base URL of the site (e.g. a local fixture server).")
+    parser.add_argument("--save-html", type=str, help="Directory to save the fetched HTML of each character page to.")
+    parser.add_argument("-i", "--incremental", action="store_true", help="Skip characters whose pages have not changed since the last run.")
+    parser.add_argument("--cache-dir", type=str, default=CACHE_DIR, help="Directory of the raw HTML cache.")
+    parser.add_argument("--cache-ttl", type=float, default=7 * 24, help="Lifetime of a cached page in hours (0 - unlimited).")
+    parser.add_argument("--cache-max-mb", type=int, default=500, help="Maximum size of the HTML cache in MB (0 - unlimited).")
+    parser.add_argument("--no-cache", action="store_true", help="Do not store fetched pages in the HTML cache.")
+    parser.add_argument("--from-cache", action="store_true", help="Parse pages from the HTML cache only, without network access.")
+    parser.add_argument("-p", "--parser", choices=PARSER_BACKENDS, default="html.parser", help="BeautifulSoup backend used to parse pages.")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Number of processes parsing pages while the browsers fetch the next ones (0 - parse in the fetching thread).")
+    parser.add_argument("--dataset", type=str, help="Directory to write one consolidated table per section for all saved characters to.")
+    parser.add_argument("--dataset-format", choices=DATASET_FORMATS, default="parquet", help="Format of the consolidated tables.")
+    parser.add_argument("-f", "--format", choices=tuple(RESULT_FORMATS) + ("sqlite",), default="pickle", help="Format of the saved character data: a pickle file, a versioned Arrow/JSON directory, or rows in a single SQLite database.")
+    parser.add_argument("--db", type=str, default=DB_PATH, help="File path of the SQLite database used with --format sqlite.")
+    parser.add_argument("--journal", type=str, default=JOURNAL_PATH, help="File path of the journal with the status of every character of the run.")
+    parser.add_argument("-r", "--resume", action="store_true", help="Continue the last run from the journal: process only the characters that were not finished or failed.")
+    parser.add_argument("--max-retries", type=int, default=3, help="Retries of a character after a transient failure (timeout, missing tab or network error) and of a failed save.")
+    parser.add_argument("--retry-backoff", type=float, default=2.0, help="Upper bound of the random delay before the first retry in seconds, doubled for every next retry.")
+    parser.add_argument("--timings", type=str, help="JSON lines file to append the per-stage durations of every character to.")
+    parser.add_argument("--batch-fsync", action="store_true", help="Sync the data directory once at the end of the run instead of after every saved character.")
 
     args = parser.parse_args()
 
-    if args.all:
-        char_list = fetch_character_names("https://www.prydwen.gg/star-rail/characters")[0]
-        process_characters(char_list)
+    if args.incremental and args.mode == "async":
+        parser.error("--incremental cannot be combined with --mode async")
+
+    if args.from_cache and args.no_cache:
+        parser.error("--from-cache cannot be combined with --no-cache")
+
+    if args.resume and args.character:
+        parser.error("--resume cannot be combined with --character")
+
+    if args.resume:
+        char_list = JobJournal(args.journal).resume()
+        if char_list:
+            print(f"Resuming the last run: {len(char_list)} characters left")
+            process_characters(char_list, **run_options(args))
+        else:
+            print("Nothing to resume: every character of the last run is done.")
+
+    elif args.all:
+        if args.from_cache:
+            char_list = cached_characters(run_options(args))
+        elif args.mode == "async":
+            char_list = asyncio.run(fetch_character_list_async(f"{args.base_url}/star-rail/characters", run_options(args)))[0]
+        else:
+            char_list = fetch_character_names(f"{args.base_url}/star-rail/characters")[0]
+        process_characters(char_list, **run_options(args))
 
     elif args.character:
         try:
-            process_characters([args.character])
+            # Not journaled: only --all starts a new run, so an interrupted one can still be resumed
+            process_characters([args.character], **{**run_options(args), "journal_path": None})
 
         except Exception as e:
             print(f"Error during character processing '{args.character}': {e}")
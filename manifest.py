@@ -0,0 +1,125 @@
+from records import CharacterRecord
+
+import requests
+
+import hashlib
+import json
+import time
+import os
+
+MANIFEST_PATH = "data/manifest.json"
+
+
+def load_manifest(filename: str = MANIFEST_PATH) -> dict:
+    """
+    Loads the manifest of previously parsed characters.
+
+    Args:
+        filename (str): The file path of the manifest.
+
+    Returns:
+        dict: Character name -> {"etag", "last modified", "content hash", "parsed at"}.
+        Empty if the manifest does not exist yet.
+    """
+    if not os.path.exists(filename):
+        return {}
+
+    with open(filename, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+
+def save_manifest(manifest: dict, filename: str = MANIFEST_PATH):
+    """
+    Saves the manifest of parsed characters.
+
+    Args:
+        manifest (dict): The manifest to save.
+        filename (str): The file path of the manifest.
+    """
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def build_data_hash(result) -> str:
+    """
+    Hashes the parsed build data of a character.
+
+    Only what the parsers extract counts, so a new site build with different asset
+    names or markup is not a change, while a change of the build data is noticed
+    even when the browser renders it from a script.
+
+    Args:
+        result (dict): The result dictionary described in `character_parser.parse_character_page`.
+
+    Returns:
+        str: The SHA-256 hex digest of the parsed data.
+    """
+    return hashlib.sha256(repr(CharacterRecord.from_result(result)).encode('utf-8')).hexdigest()
+
+
+def check_page(url: str, entry: dict | None, http_session: requests.Session | None = None, timeout: float = 10) -> tuple[bool, dict, str | None]:
+    """
+    Checks whether a character page changed since it was parsed, using a conditional request.
+
+    Unless the server answers 304, the response is the whole page. It is returned, so
+    the "http" and "auto" modes do not download it again, and whether the build data
+    changed is decided by `check_result` once the page is parsed.
+
+    Args:
+        url (str): URL of the character page.
+        entry (dict or None): The manifest entry of the character.
+        http_session (requests.Session, optional): A session to reuse connections.
+        timeout (float): Request timeout in seconds.
+
+    Returns:
+        bool: True if the page has to be fetched and parsed again.
+        dict: The manifest entry to store once the page is parsed.
+        str or None: The HTML of the page, None if it has not changed.
+    """
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last modified"):
+            headers["If-Modified-Since"] = entry["last modified"]
+
+    response = (http_session or requests).get(url, headers=headers, timeout=timeout)
+
+    if response.status_code == 304 and entry:
+        return False, entry, None
+
+    response.raise_for_status()
+
+    new_entry = {
+        "etag": response.headers.get("ETag"),
+        "last modified": response.headers.get("Last-Modified"),
+        "content hash": entry.get("content hash") if entry else None,
+        "parsed at": entry.get("parsed at") if entry else None,
+    }
+
+    return True, new_entry, response.text
+
+
+def check_result(entry: dict, result) -> tuple[bool, dict]:
+    """
+    Checks whether the parsed build data of a character changed since it was last saved.
+
+    Args:
+        entry (dict): The manifest entry returned by `check_page`.
+        result (dict): The freshly parsed result dictionary.
+
+    Returns:
+        bool: True if the character has to be saved again.
+        dict: The manifest entry with the hash of the parsed data.
+    """
+    content_hash = build_data_hash(result)
+
+    return entry.get("content hash") != content_hash, {**entry, "content hash": content_hash}
+
+
+def mark_parsed(entry: dict) -> dict:
+    """
+    Returns a copy of the manifest entry with the parse timestamp set to now.
+    """
+    return {**entry, "parsed at": time.strftime('%Y-%m-%dT%H:%M:%S%z')}
@@ -0,0 +1,86 @@
+from file_io import load_result_from_file, load_result_from_dir, save_result_to_dir, result_path, RESULT_FORMATS
+
+import pandas as pd
+
+import argparse
+import glob
+import os
+
+
+def results_equal(left: dict, right: dict) -> bool:
+    """
+    Checks that two result dictionaries hold the same data.
+    """
+    if left.keys() != right.keys():
+        return False
+
+    for key, value in left.items():
+        other = right[key]
+
+        if isinstance(value, pd.DataFrame):
+            try:
+                # Arrow may store an all-empty column with another dtype, compare the values only
+                pd.testing.assert_frame_equal(value.reset_index(drop=True), other, check_dtype=False)
+            except AssertionError:
+                return False
+
+        elif value != other:
+            return False
+
+    return True
+
+
+def migrate_pickles(directory: str = "data", remove: bool = False) -> tuple[list, list]:
+    """
+    Converts every pickle file in a directory to the versioned ".hsr" directory format.
+
+    Args:
+        directory (str): The directory with the pickle files.
+        remove (bool): Delete a pickle file once its converted copy is verified.
+
+    Returns:
+        list: Characters converted successfully.
+        list: Characters that failed to convert or verify.
+    """
+    converted, failed = [], []
+
+    for filename in sorted(glob.glob(os.path.join(directory, f"*{RESULT_FORMATS['pickle']}"))):
+        char = os.path.basename(filename)[:-len(RESULT_FORMATS['pickle'])]
+        result = load_result_from_file(filename)
+
+        if result is None:
+            failed.append(char)
+            continue
+
+        try:
+            path = result_path(char, directory, "arrow")
+            save_result_to_dir(result, path)
+
+            if not results_equal(result, load_result_from_dir(path)):
+                raise ValueError("the converted data differs from the pickle")
+
+        except Exception as e:
+            print(f"Error for {char}: {e}")
+            failed.append(char)
+            continue
+
+        if remove:
+            os.remove(filename)
+
+        print(f"✔ - {char} -> {path}")
+        converted.append(char)
+
+    return converted, failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert saved pickle files to the versioned Arrow/JSON format.")
+    parser.add_argument("-d", "--directory", type=str, default="data", help="Directory with the pickle files.")
+    parser.add_argument("--remove", action="store_true", help="Delete each pickle file after its converted copy is verified.")
+
+    args = parser.parse_args()
+
+    converted, failed = migrate_pickles(args.directory, args.remove)
+    print(f"Converted: {len(converted)}, failed: {len(failed)}")
+    if failed:
+        print(f"List of characters that failed to convert:{failed}")
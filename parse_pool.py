@@ -0,0 +1,52 @@
+from character_parser import parse_character_page, load_known_elements
+from stage_timing import StageLog
+from text_utils import make_soup
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+
+def create_parse_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Starts a pool of processes that parse character pages.
+
+    Every process loads the known elements table once, so `find_element_from_page`
+    can skip element detection for characters parsed in earlier runs.
+
+    The processes are started by a fork server (or spawned where it is not available)
+    instead of being forked from the scraper: the pool starts them on the first
+    `submit`, from a browser thread, while other threads may hold locks (stdout, the
+    stage log, Selenium) that a forked child would inherit locked.
+
+    Args:
+        workers (int): Number of parser processes.
+
+    Returns:
+        concurrent.futures.ProcessPoolExecutor: The pool. Shut it down when the run is over.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method), initializer=load_known_elements)
+
+
+def parse_html(html: str, url: str | None = None, parser: str = "html.parser") -> tuple[dict, dict]:
+    """
+    Parses a character page from its HTML. Runs in a parser process.
+
+    Only the HTML string is sent to the process: soups cannot be pickled
+    efficiently, while the result dictionary is plain DataFrames and lists.
+
+    Args:
+        html (str): The HTML of the page with the "Build and teams" content loaded.
+        url (str, optional): URL of the page, used to look up the known element.
+        parser (str): The BeautifulSoup backend, one of `text_utils.PARSER_BACKENDS`.
+
+    Returns:
+        dict: The result dictionary described in `character_parser.parse_character_page`.
+        dict: The timing record of the process, {"total": seconds, "stages": {stage: seconds}},
+        to be added to the character timings.
+    """
+    with StageLog().character(url) as record:
+        data = parse_character_page(make_soup(html, parser), url=url)
+
+    return data, record
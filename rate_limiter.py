@@ -0,0 +1,32 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    A thread-safe limiter that spaces out requests by a fixed interval.
+
+    All workers share one instance, so the total request rate against the site
+    does not grow with the number of workers.
+
+    Args:
+        interval (float): Minimum number of seconds between two requests.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """
+        Blocks until the caller is allowed to make the next request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
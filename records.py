@@ -0,0 +1,232 @@
+from stat_rules import parse_stat_strings
+
+import pandas as pd
+
+from dataclasses import dataclass, field
+from typing import ClassVar
+import math
+
+
+def _scalar(value):
+    # Missing cells of a DataFrame come back as NaN
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+@dataclass(slots=True)
+class LightCone:
+    name: str | None
+    percentage: str | None = None
+    rarity: str | None = None
+    superimposition: str | None = None
+    description: str | None = None
+
+    # Field -> column of the "light cones" DataFrame
+    COLUMNS: ClassVar[dict] = {
+        "name": "name", "percentage": "%", "rarity": "rarity",
+        "superimposition": "superimposition", "description": "description",
+    }
+
+
+@dataclass(slots=True)
+class RelicSet:
+    name: str | None
+    percentage: str | None = None
+    piece_2: str | None = None
+    piece_4: str | None = None
+    flex: bool | None = None
+    info: str | None = None
+
+    COLUMNS: ClassVar[dict] = {
+        "name": "name", "percentage": "%", "piece_2": "2 piece",
+        "piece_4": "4 piece", "flex": "flex", "info": "info",
+    }
+
+
+@dataclass(slots=True)
+class PlanarSet:
+    name: str | None
+    percentage: str | None = None
+    piece_2: str | None = None
+    info: str | None = None
+
+    COLUMNS: ClassVar[dict] = {"name": "name", "percentage": "%", "piece_2": "2 piece", "info": "info"}
+
+
+@dataclass(slots=True)
+class MainStat:
+    part: str
+    priority: int
+    stat: str
+
+
+@dataclass(slots=True)
+class Trace:
+    kind: str
+    priority: int
+    name: str
+
+
+@dataclass(slots=True)
+class Team:
+    members: tuple[str, ...]
+    rank: int | None = None
+    usage: float | None = None
+    rounds: float | None = None
+
+
+def records_from_frame(cls, frame: pd.DataFrame | None) -> list:
+    """
+    Converts the rows of a section DataFrame to records of `cls` using `cls.COLUMNS`.
+    """
+    if frame is None or len(frame) == 0:
+        return []
+
+    return [
+        cls(**{name: _scalar(row.get(column)) for name, column in cls.COLUMNS.items()})
+        for row in frame.to_dict('records')
+    ]
+
+
+def frame_from_records(cls, records: list) -> pd.DataFrame:
+    """
+    Builds the section DataFrame of the result dictionary from records of `cls`.
+    """
+    return pd.DataFrame(
+        [{column: getattr(record, name) for name, column in cls.COLUMNS.items()} for record in records],
+        columns=list(cls.COLUMNS.values()),
+    )
+
+
+@dataclass(slots=True)
+class CharacterRecord:
+    """
+    The parsed data of one character as compact records instead of small DataFrames.
+
+    Keeping the whole roster resident or pickling it costs a fraction of the result
+    dictionaries. The DataFrames of the result dictionary are built on demand by
+    the `*_frame` methods and `to_result`.
+    """
+    name: str | None = None
+    element: str | None = None
+    light_cones: list[LightCone] = field(default_factory=list)
+    relics: list[RelicSet] = field(default_factory=list)
+    planar_sets: list[PlanarSet] = field(default_factory=list)
+    additional_planar_sets: dict = field(default_factory=dict)
+    main_stats: list[MainStat] = field(default_factory=list)
+    substats: str = ""
+    substats_priority: list[tuple[str, ...]] = field(default_factory=list)
+    substats_details: str = ""
+    substats_comments: str = ""
+    endgame_stats: list[str] = field(default_factory=list)
+    traces: list[Trace] = field(default_factory=list)
+    synergy: list[str] = field(default_factory=list)
+    teams: list[Team] = field(default_factory=list)
+
+    @classmethod
+    def from_result(cls, result, name: str | None = None) -> "CharacterRecord":
+        """
+        Converts a result dictionary (or `file_io.LazyResult`) to a record.
+
+        Args:
+            result (dict): The result dictionary described in `character_parser.parse_character_page`.
+            name (str, optional): The character name.
+
+        Returns:
+            CharacterRecord: The record.
+        """
+        endgame_stats = result.get("endgame stats")
+        traces = []
+        for kind, priorities in (result.get("traces priority") or {}).items():
+            for priority, names in priorities.items():
+                # "Major Traces priority" holds one name per level, "Skills priority" a list
+                for trace in ([names] if isinstance(names, str) else names):
+                    traces.append(Trace(kind, int(priority), trace))
+
+        return cls(
+            name=name,
+            element=result.get("element"),
+            light_cones=records_from_frame(LightCone, result.get("light cones")),
+            relics=records_from_frame(RelicSet, result.get("relics")),
+            planar_sets=records_from_frame(PlanarSet, result.get("planar sets")),
+            additional_planar_sets=dict(result.get("additional planar sets") or {}),
+            main_stats=[
+                MainStat(part, int(priority), stat)
+                for part, priorities in (result.get("relic main stats dict") or {}).items()
+                for priority, stats in priorities.items()
+                for stat in stats
+            ],
+            substats=result.get("substats") or "",
+            substats_priority=[tuple(stats) for _, stats in sorted((result.get("substats dict") or {}).items())],
+            substats_details=result.get("substats details") or "",
+            substats_comments=result.get("substats comments") or "",
+            endgame_stats=list(endgame_stats["raw"]) if endgame_stats is not None and "raw" in endgame_stats else [],
+            traces=traces,
+            synergy=list(result.get("synergy") or []),
+            teams=[
+                Team(tuple(team.get("team", [])), team.get("rank"), team.get("usage"), team.get("rounds"))
+                for team in result.get("teams (MoC)") or []
+            ],
+        )
+
+    def light_cones_frame(self) -> pd.DataFrame:
+        return frame_from_records(LightCone, self.light_cones)
+
+    def relics_frame(self) -> pd.DataFrame:
+        return frame_from_records(RelicSet, self.relics)
+
+    def planar_sets_frame(self) -> pd.DataFrame:
+        return frame_from_records(PlanarSet, self.planar_sets)
+
+    def main_stats_dict(self) -> dict:
+        stats_dict = {}
+        for main_stat in self.main_stats:
+            stats_dict.setdefault(main_stat.part, {}).setdefault(main_stat.priority, []).append(main_stat.stat)
+        return stats_dict
+
+    def main_stats_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            [{"Part": part, "Stats": ', '.join(stat for stats in priorities.values() for stat in stats)}
+             for part, priorities in self.main_stats_dict().items()],
+            columns=["Part", "Stats"],
+        )
+
+    def endgame_stats_frame(self) -> pd.DataFrame:
+        return parse_stat_strings(self.endgame_stats)
+
+    def traces_dict(self) -> dict:
+        traces_dict = {}
+        for trace in self.traces:
+            priorities = traces_dict.setdefault(trace.kind, {})
+            if trace.kind == "Major Traces priority":
+                priorities[trace.priority] = trace.name
+            else:
+                priorities.setdefault(trace.priority, []).append(trace.name)
+        return traces_dict
+
+    def to_result(self) -> dict:
+        """
+        Builds the result dictionary described in `character_parser.parse_character_page`.
+        """
+        return {
+            "light cones": self.light_cones_frame(),
+            "relics": self.relics_frame(),
+            "planar sets": self.planar_sets_frame(),
+            "additional planar sets": dict(self.additional_planar_sets),
+            "relic main stats": self.main_stats_frame(),
+            "relic main stats dict": self.main_stats_dict(),
+            "substats": self.substats,
+            "substats dict": {priority: list(stats) for priority, stats in enumerate(self.substats_priority)},
+            "substats details": self.substats_details,
+            "substats comments": self.substats_comments,
+            "endgame stats": self.endgame_stats_frame(),
+            "traces priority": self.traces_dict(),
+            "synergy": list(self.synergy),
+            "teams (MoC)": [
+                {"team": list(team.members), "rank": team.rank, "usage": team.usage, "rounds": team.rounds}
+                for team in self.teams
+            ],
+            "element": self.element,
+        }
+
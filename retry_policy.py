@@ -0,0 +1,80 @@
+from character_parser import TabNotFoundError
+from http_fetcher import BuildDataNotFoundError
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import requests
+import aiohttp
+import asyncio
+import random
+
+# Failure class -> whether the character is fetched again. Parse errors and missing
+# build data in a server-rendered page come from the page content itself and fail the
+# same way every time. Write errors are retried in place by `main.save_with_retries`,
+# without fetching the page again.
+FAILURE_CLASSES = {
+    "navigation timeout": True,
+    "tab not found": True,
+    "network error": True,
+    "write error": False,
+    "build data not found": False,
+    "http error": False,
+    "parse error": False,
+    "unknown": False,
+}
+
+
+def classify_failure(error: BaseException, stage: str) -> str:
+    """
+    Maps an exception raised while processing a character to a failure class.
+
+    Args:
+        error (BaseException): The raised exception.
+        stage (str): "fetch", "parse" or "save" - the step that raised it.
+
+    Returns:
+        str: One of the keys of FAILURE_CLASSES.
+    """
+    if stage == "save":
+        return "write error"
+
+    if stage == "parse":
+        return "parse error"
+
+    if isinstance(error, BuildDataNotFoundError):
+        return "build data not found"
+
+    if isinstance(error, TabNotFoundError):
+        return "tab not found"
+
+    if isinstance(error, (TimeoutException, requests.Timeout, asyncio.TimeoutError)):
+        return "navigation timeout"
+
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else None
+        if status is None or status >= 500 or status == 429:
+            return "network error"
+        return "http error"
+
+    if isinstance(error, (WebDriverException, requests.ConnectionError, aiohttp.ClientError)):
+        return "network error"
+
+    return "unknown"
+
+
+def is_retryable(failure_class: str) -> bool:
+    return FAILURE_CLASSES.get(failure_class, False)
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """
+    Returns the delay before the next attempt: exponential backoff with full jitter.
+
+    Args:
+        attempt (int): The number of the failed attempt, starting from 1.
+        base (float): Upper bound of the delay after the first failure in seconds.
+        cap (float): Maximum delay in seconds.
+
+    Returns:
+        float: A random delay between 0 and min(cap, base * 2 ** (attempt - 1)).
+    """
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
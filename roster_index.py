@@ -0,0 +1,289 @@
+from file_io import find_saved_results, LazyResult, RESULT_FORMATS
+from records import CharacterRecord
+from team_graph import TeamGraph
+from text_utils import character_slug
+
+import threading
+import time
+import os
+
+
+def _percentage(value) -> float | None:
+    # Light cones store "100", relics and planar sets "100%"
+    try:
+        return float(str(value).rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+
+def file_signature(path: str) -> tuple[int, int] | None:
+    """
+    Returns (mtime in ns, size) of a saved result, or None if it is gone.
+
+    A ".hsr" directory is replaced as a whole on save, so its "meta.json" stands for it.
+    """
+    if path.endswith(RESULT_FORMATS["arrow"]):
+        path = os.path.join(path, "meta.json")
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    return stat.st_mtime_ns, stat.st_size
+
+
+class RosterIndex:
+    """
+    Keeps the parsed data of all saved characters in memory with inverted indexes.
+
+    Every character is loaded once as a `records.CharacterRecord`. Queries are
+    dictionary lookups over the indexes below, so they do not touch the files:
+
+    * item name -> (character, rank, percentage) for light cones, relics and planar sets,
+      where rank is the position in the character's list (0 is the best);
+    * character -> teams listed on the character's page;
+    * team member -> ids of all teams containing them;
+    * element -> characters;
+    * `graph`, the team co-occurrence graph (`team_graph.TeamGraph`).
+
+    Characters are keyed by the slug of their page, the name of the saved file ("silver-wolf").
+    Team members and query arguments are converted with `text_utils.character_slug`, so
+    "Silver Wolf" and "Silver-wolf" find the same character.
+
+    `reload` re-reads only the characters whose files changed. With `check_interval`
+    set, queries call it themselves at most once per interval.
+
+    Args:
+        directory (str): The directory with the saved files.
+        check_interval (float, optional): Seconds between automatic checks for changed files.
+            Files are only checked on an explicit `reload` if not given.
+    """
+
+    def __init__(self, directory: str = "data", check_interval: float | None = None):
+        self.directory = directory
+        self.check_interval = check_interval
+        self.records = {}
+        self._signatures = {}
+        self._lock = threading.RLock()
+        self._last_check = 0.0
+
+        self.light_cones = {}
+        self.relics = {}
+        self.planar_sets = {}
+        self.elements = {}
+        self.teams = {}
+        self.team_members = {}
+        self._character_teams = {}
+        self._next_team_id = 0
+        self.graph = TeamGraph()
+
+        self.reload()
+
+    def reload(self) -> list[str]:
+        """
+        Loads new and changed characters and drops deleted ones.
+
+        Returns:
+            list: Names of the characters that were loaded or dropped.
+        """
+        with self._lock:
+            paths = find_saved_results(self.directory)
+            changed = []
+
+            for char in list(self.records):
+                if char not in paths:
+                    self._remove(char)
+                    del self.records[char]
+                    del self._signatures[char]
+                    changed.append(char)
+
+            for char, path in paths.items():
+                signature = file_signature(path)
+                if signature is None or self._signatures.get(char) == signature:
+                    continue
+
+                try:
+                    record = CharacterRecord.from_result(LazyResult(path), char)
+                except Exception as e:
+                    print(f"✖ - Could not load {path}: {e}")
+                    continue
+
+                if char in self.records:
+                    self._remove(char)
+                self.records[char] = record
+                self._signatures[char] = signature
+                self._add(record)
+                changed.append(char)
+
+            self._last_check = time.monotonic()
+
+            return changed
+
+    def _check(self):
+        if self.check_interval is not None and time.monotonic() - self._last_check >= self.check_interval:
+            self.reload()
+
+    def _add(self, record: CharacterRecord):
+        char = record.name
+
+        for index, items in ((self.light_cones, record.light_cones),
+                             (self.relics, record.relics),
+                             (self.planar_sets, record.planar_sets)):
+            for rank, item in enumerate(items):
+                if item.name:
+                    index.setdefault(item.name, []).append((char, rank, _percentage(item.percentage)))
+
+        if record.element:
+            self.elements.setdefault(record.element, set()).add(char)
+
+        team_ids = []
+        for team in record.teams:
+            team_id = self._next_team_id
+            self._next_team_id += 1
+
+            self.teams[team_id] = (char, team)
+            team_ids.append(team_id)
+            for member in {character_slug(member) for member in team.members if member}:
+                self.team_members.setdefault(member, set()).add(team_id)
+
+        self._character_teams[char] = team_ids
+        self.graph.update_character(char, record.teams, record.synergy)
+
+    def _remove(self, char: str):
+        record = self.records[char]
+        self.graph.remove_character(char)
+
+        for index, items in ((self.light_cones, record.light_cones),
+                             (self.relics, record.relics),
+                             (self.planar_sets, record.planar_sets)):
+            for name in {item.name for item in items if item.name}:
+                entries = [entry for entry in index[name] if entry[0] != char]
+                if entries:
+                    index[name] = entries
+                else:
+                    del index[name]
+
+        if record.element in self.elements:
+            self.elements[record.element].discard(char)
+            if not self.elements[record.element]:
+                del self.elements[record.element]
+
+        for team_id in self._character_teams.pop(char, []):
+            _, team = self.teams.pop(team_id)
+            for member in {character_slug(member) for member in team.members if member}:
+                self.team_members[member].discard(team_id)
+                if not self.team_members[member]:
+                    del self.team_members[member]
+
+    def character(self, name: str) -> CharacterRecord | None:
+        with self._lock:
+            self._check()
+            return self.records.get(character_slug(name))
+
+    def characters_by_element(self, element: str) -> list[str]:
+        """
+        Returns the names of all characters of an element.
+        """
+        with self._lock:
+            self._check()
+            return sorted(self.elements.get(element, ()))
+
+    def characters_with_light_cone(self, light_cone: str) -> list[tuple[str, int, float | None]]:
+        """
+        Returns (character, rank, percentage) for every character recommending a light cone.
+        """
+        with self._lock:
+            self._check()
+            return list(self.light_cones.get(light_cone, ()))
+
+    def characters_with_relic(self, relic: str) -> list[tuple[str, int, float | None]]:
+        """
+        Returns (character, rank, percentage) for every character recommending a relic set.
+        """
+        with self._lock:
+            self._check()
+            return list(self.relics.get(relic, ()))
+
+    def characters_with_planar_set(self, planar_set: str) -> list[tuple[str, int, float | None]]:
+        """
+        Returns (character, rank, percentage) for every character recommending a planar set.
+        """
+        with self._lock:
+            self._check()
+            return list(self.planar_sets.get(planar_set, ()))
+
+    def teams_of(self, char: str) -> list:
+        """
+        Returns the teams (`records.Team`) listed on the page of a character.
+        """
+        with self._lock:
+            self._check()
+            return [self.teams[team_id][1] for team_id in self._character_teams.get(character_slug(char), ())]
+
+    def teams_containing(self, *members: str) -> list[tuple[str, object]]:
+        """
+        Returns (character whose page lists the team, `records.Team`) for every team
+        containing all given members, by usage from the highest.
+        """
+        with self._lock:
+            self._check()
+
+            if not members:
+                return []
+
+            team_ids = set.intersection(*(self.team_members.get(character_slug(member), set()) for member in members))
+            teams = [self.teams[team_id] for team_id in team_ids]
+
+        return sorted(teams, key=lambda item: item[1].usage or 0.0, reverse=True)
+
+    def best_planar_sets(self, element: str, characters=None) -> list[tuple[str, float, int]]:
+        """
+        Ranks the planar sets recommended to the characters of an element.
+
+        The results have no roles, so a role is narrowed down by passing its characters,
+        e.g. `best_planar_sets("Quantum", characters=["Seele", "Silver Wolf"])`.
+
+        Args:
+            element (str): The element.
+            characters (iterable, optional): Only count these characters of the element.
+
+        Returns:
+            list: (planar set, summed percentage, number of characters), best first.
+        """
+        with self._lock:
+            self._check()
+
+            chars = self.elements.get(element, set())
+            if characters is not None:
+                chars = chars & {character_slug(char) for char in characters}
+
+            scores = {}
+            for char in chars:
+                for planar_set in self.records[char].planar_sets:
+                    if not planar_set.name:
+                        continue
+                    score, count = scores.get(planar_set.name, (0.0, 0))
+                    scores[planar_set.name] = (score + (_percentage(planar_set.percentage) or 0.0), count + 1)
+
+        return sorted(
+            ((name, score, count) for name, (score, count) in scores.items()),
+            key=lambda item: (item[1], item[2]),
+            reverse=True,
+        )
+
+    def top_partners(self, char: str, count: int = 10) -> list[tuple[str, float]]:
+        """
+        Returns (partner, summed usage of the shared teams) for the most frequent teammates of a character.
+        """
+        with self._lock:
+            self._check()
+            return self.graph.top_partners(char, count)
+
+    def best_team(self, *members: str, size: int = 4) -> tuple[tuple[str, ...], float, bool]:
+        """
+        Returns the best team containing all given members; see `team_graph.TeamGraph.best_team`.
+        """
+        with self._lock:
+            self._check()
+            return self.graph.best_team(*members, size=size)
@@ -0,0 +1,313 @@
+from records import CharacterRecord
+from stage_timing import stage
+from stat_rules import split_stat
+
+import threading
+import sqlite3
+import json
+import time
+import os
+
+DB_PATH = "data/characters.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS characters (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    element TEXT,
+    substats TEXT,
+    substats_details TEXT,
+    substats_comments TEXT,
+    additional_planar_sets TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_characters_element ON characters(element);
+
+CREATE TABLE IF NOT EXISTS light_cones (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    percentage TEXT,
+    rarity TEXT,
+    superimposition TEXT,
+    description TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_light_cones_character ON light_cones(character_id);
+CREATE INDEX IF NOT EXISTS idx_light_cones_name ON light_cones(name);
+
+CREATE TABLE IF NOT EXISTS relics (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    percentage TEXT,
+    piece_2 TEXT,
+    piece_4 TEXT,
+    flex INTEGER,
+    info TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_relics_character ON relics(character_id);
+CREATE INDEX IF NOT EXISTS idx_relics_name ON relics(name);
+
+CREATE TABLE IF NOT EXISTS planar_sets (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT,
+    percentage TEXT,
+    piece_2 TEXT,
+    info TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_planar_sets_character ON planar_sets(character_id);
+CREATE INDEX IF NOT EXISTS idx_planar_sets_name ON planar_sets(name);
+
+CREATE TABLE IF NOT EXISTS main_stats (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    part TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    stat TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_main_stats_character ON main_stats(character_id);
+CREATE INDEX IF NOT EXISTS idx_main_stats_stat ON main_stats(stat);
+
+CREATE TABLE IF NOT EXISTS substats (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    priority INTEGER NOT NULL,
+    stat TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_substats_character ON substats(character_id);
+CREATE INDEX IF NOT EXISTS idx_substats_stat ON substats(stat);
+
+CREATE TABLE IF NOT EXISTS endgame_stats (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    characteristic TEXT,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_endgame_stats_character ON endgame_stats(character_id);
+CREATE INDEX IF NOT EXISTS idx_endgame_stats_characteristic ON endgame_stats(characteristic);
+
+CREATE TABLE IF NOT EXISTS traces (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_traces_character ON traces(character_id);
+
+CREATE TABLE IF NOT EXISTS synergy (
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_synergy_character ON synergy(character_id);
+CREATE INDEX IF NOT EXISTS idx_synergy_name ON synergy(name);
+
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    character_id INTEGER NOT NULL REFERENCES characters(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    rank INTEGER,
+    usage REAL,
+    rounds REAL
+);
+CREATE INDEX IF NOT EXISTS idx_teams_character ON teams(character_id);
+
+CREATE TABLE IF NOT EXISTS team_members (
+    team_id INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_team_members_team ON team_members(team_id);
+CREATE INDEX IF NOT EXISTS idx_team_members_name ON team_members(name);
+"""
+
+# Tables with one set of rows per character, replaced on every upsert
+CHILD_TABLES = ("light_cones", "relics", "planar_sets", "main_stats", "substats", "endgame_stats", "traces", "synergy", "teams")
+
+
+class SQLiteStore:
+    """
+    Stores the parsed data of all characters in one SQLite database.
+
+    Every section of the result dictionary goes to its own normalized table,
+    indexed by character and item name. The store can be shared between threads.
+
+    Args:
+        filename (str): The file path of the database.
+    """
+
+    def __init__(self, filename: str = DB_PATH):
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+        self.filename = filename
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        # Readers in other processes are not blocked while a character is written
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def has_character(self, name: str) -> bool:
+        with self._lock:
+            return self.connection.execute("SELECT 1 FROM characters WHERE name = ?", (name,)).fetchone() is not None
+
+    def upsert_character(self, name: str, result: dict):
+        """
+        Replaces all stored data of a character in a single transaction.
+
+        The rows are built from `records.CharacterRecord`, which flattens the sections
+        of the result dictionary the same way for every storage format.
+
+        Args:
+            name (str): The character name.
+            result (dict): The result dictionary of the character.
+        """
+        record = CharacterRecord.from_result(result, name)
+
+        with stage("save"), self._lock, self.connection:
+            cursor = self.connection.cursor()
+
+            cursor.execute(
+                """
+                INSERT INTO characters (name, element, substats, substats_details, substats_comments, additional_planar_sets, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    element = excluded.element,
+                    substats = excluded.substats,
+                    substats_details = excluded.substats_details,
+                    substats_comments = excluded.substats_comments,
+                    additional_planar_sets = excluded.additional_planar_sets,
+                    updated_at = excluded.updated_at
+                """,
+                (
+                    name,
+                    record.element,
+                    record.substats,
+                    record.substats_details,
+                    record.substats_comments,
+                    json.dumps(record.additional_planar_sets, ensure_ascii=False),
+                    time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                ),
+            )
+            character_id = cursor.execute("SELECT id FROM characters WHERE name = ?", (name,)).fetchone()[0]
+
+            for table in CHILD_TABLES:
+                cursor.execute(f"DELETE FROM {table} WHERE character_id = ?", (character_id,))
+
+            cursor.executemany(
+                "INSERT INTO light_cones VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (character_id, i, cone.name, cone.percentage, cone.rarity, cone.superimposition, cone.description)
+                    for i, cone in enumerate(record.light_cones)
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO relics VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (character_id, i, relic.name, relic.percentage, relic.piece_2, relic.piece_4, relic.flex, relic.info)
+                    for i, relic in enumerate(record.relics)
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO planar_sets VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (character_id, i, planar_set.name, planar_set.percentage, planar_set.piece_2, planar_set.info)
+                    for i, planar_set in enumerate(record.planar_sets)
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO main_stats VALUES (?, ?, ?, ?)",
+                [(character_id, main_stat.part, main_stat.priority, main_stat.stat) for main_stat in record.main_stats],
+            )
+            cursor.executemany(
+                "INSERT INTO substats VALUES (?, ?, ?)",
+                [
+                    (character_id, priority, stat)
+                    for priority, stats in enumerate(record.substats_priority)
+                    for stat in stats
+                ],
+            )
+            cursor.executemany(
+                "INSERT INTO endgame_stats VALUES (?, ?, ?, ?)",
+                [(character_id, i, split_stat(raw)[0], raw) for i, raw in enumerate(record.endgame_stats)],
+            )
+            cursor.executemany(
+                "INSERT INTO traces VALUES (?, ?, ?, ?)",
+                [(character_id, trace.kind, trace.priority, trace.name) for trace in record.traces],
+            )
+            cursor.executemany(
+                "INSERT INTO synergy VALUES (?, ?, ?)",
+                [(character_id, i, synergy) for i, synergy in enumerate(record.synergy)],
+            )
+
+            for i, team in enumerate(record.teams):
+                cursor.execute(
+                    "INSERT INTO teams (character_id, position, rank, usage, rounds) VALUES (?, ?, ?, ?, ?)",
+                    (character_id, i, team.rank, team.usage, team.rounds),
+                )
+                team_id = cursor.lastrowid
+                cursor.executemany(
+                    "INSERT INTO team_members VALUES (?, ?, ?)",
+                    [(team_id, position, member) for position, member in enumerate(team.members)],
+                )
+
+    def characters_by_element(self, element: str) -> list[str]:
+        """
+        Returns the names of all characters of an element.
+        """
+        with self._lock:
+            rows = self.connection.execute("SELECT name FROM characters WHERE element = ? ORDER BY name", (element,))
+            return [row[0] for row in rows]
+
+    def characters_with_light_cone(self, light_cone: str) -> list[tuple[str, str]]:
+        """
+        Returns (character, percentage) for every character recommending a light cone.
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                """
+                SELECT c.name, lc.percentage FROM light_cones lc
+                JOIN characters c ON c.id = lc.character_id
+                WHERE lc.name = ? ORDER BY lc.position
+                """,
+                (light_cone,),
+            )
+            return rows.fetchall()
+
+    def teams_containing(self, member: str) -> list[dict]:
+        """
+        Returns all stored teams that contain a character, with usage and rounds.
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                """
+                SELECT t.id, c.name, t.rank, t.usage, t.rounds FROM team_members tm
+                JOIN teams t ON t.id = tm.team_id
+                JOIN characters c ON c.id = t.character_id
+                WHERE tm.name = ? ORDER BY t.usage DESC
+                """,
+                (member,),
+            ).fetchall()
+
+            teams = []
+            for team_id, character, rank, usage, rounds in rows:
+                members = self.connection.execute(
+                    "SELECT name FROM team_members WHERE team_id = ? ORDER BY position", (team_id,)
+                )
+                teams.append({
+                    "character": character,
+                    "rank": rank,
+                    "usage": usage,
+                    "rounds": rounds,
+                    "team": [row[0] for row in members],
+                })
+
+        return teams
@@ -0,0 +1,187 @@
+from contextlib import contextmanager
+import functools
+import threading
+import json
+import time
+import os
+
+# Record of the character processed by the current thread, set by `StageLog.character`
+_local = threading.local()
+
+
+@contextmanager
+def stage(name: str):
+    """
+    Measures the enclosed block as a stage of the character processed by the current thread.
+
+    Does nothing outside of `StageLog.character`, so instrumented code costs a
+    thread-local lookup when timing is off. Repeated stages of one character are summed.
+    """
+    record = getattr(_local, "record", None)
+    if record is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_stage(name, time.perf_counter() - start)
+
+
+def add_stage(name: str, seconds: float):
+    """
+    Adds an already measured duration (e.g. a browser wait) to the current character.
+    """
+    record = getattr(_local, "record", None)
+    if record is not None:
+        record["stages"][name] = record["stages"].get(name, 0.0) + seconds
+
+
+def timed(name: str):
+    """
+    Decorator that measures every call of the function as the stage `name`.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def percentile(values: list[float], q: float) -> float:
+    """
+    Returns the q-th percentile (0-100) of the values with the nearest-rank method.
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+
+    return ordered[int(rank) - 1]
+
+
+class StageLog:
+    """
+    Collects the per-stage durations of every processed character.
+
+    Every finished attempt of a character is appended to `filename` as a JSON line
+    {"character", "attempt", "total", "stages": {stage: seconds}}, so a killed run keeps
+    its timings. The summary merges the attempts of a retried character into one.
+
+    Args:
+        filename (str, optional): The JSON lines file. Records are only kept in memory if not given.
+    """
+
+    def __init__(self, filename: str | None = None):
+        self.filename = filename
+        self.records = []
+        self._lock = threading.Lock()
+
+        if filename:
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+
+    @contextmanager
+    def character(self, char: str, record: dict | None = None, final: bool = True, attempt: int = 1):
+        """
+        Times the enclosed processing of a character, including all stages measured inside.
+
+        Args:
+            char (str): The character name.
+            record (dict, optional): A record yielded earlier with `final=False` to continue,
+                e.g. when a character is fetched and saved by different threads.
+            final (bool): Store the record when the block ends. If False, call `finish` later.
+            attempt (int): The number of the attempt, starting from 1, for retried characters.
+        """
+        if record is None:
+            record = {"character": char, "attempt": attempt, "total": 0.0, "stages": {}}
+
+        previous = getattr(_local, "record", None)
+        _local.record = record
+        start = time.perf_counter()
+
+        try:
+            yield record
+        finally:
+            record["total"] += time.perf_counter() - start
+            _local.record = previous
+
+            if final:
+                self.finish(record)
+
+    def finish(self, record: dict):
+        """
+        Stores a finished record and appends it to the JSON lines file.
+        """
+        with self._lock:
+            self.records.append(record)
+            if self.filename:
+                with open(self.filename, 'a', encoding='utf-8') as file:
+                    file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def per_character(self) -> list[dict]:
+        """
+        Merges the records of all attempts of every character, in the order of their first record.
+
+        Returns:
+            list: {"character", "attempts", "total", "stages"} with the totals and stages
+            of all attempts summed.
+        """
+        merged = {}
+
+        with self._lock:
+            records = list(self.records)
+
+        for record in records:
+            char = merged.setdefault(record["character"], {
+                "character": record["character"], "attempts": 0, "total": 0.0, "stages": {},
+            })
+            char["attempts"] += 1
+            char["total"] += record["total"]
+            for name, seconds in record["stages"].items():
+                char["stages"][name] = char["stages"].get(name, 0.0) + seconds
+
+        return list(merged.values())
+
+    def summary(self) -> dict:
+        """
+        Returns stage -> {"count", "p50", "p95", "max"} in seconds, over all characters
+        that went through the stage. "total" is the whole processing of a character,
+        all attempts of a retried character count as one.
+        """
+        records = self.per_character()
+        durations = {"total": [record["total"] for record in records]}
+        for record in records:
+            for name, seconds in record["stages"].items():
+                durations.setdefault(name, []).append(seconds)
+
+        return {
+            name: {
+                "count": len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "max": max(values),
+            }
+            for name, values in durations.items() if values
+        }
+
+    def slowest(self, count: int = 5) -> list[dict]:
+        """
+        Returns the merged records (see `per_character`) of the characters that took the longest.
+        """
+        return sorted(self.per_character(), key=lambda record: record["total"], reverse=True)[:count]
+
+    def print_summary(self, count: int = 5):
+        summary = self.summary()
+        if not summary:
+            return
+
+        print(f'{"stage":<28}{"count":>7}{"p50, s":>10}{"p95, s":>10}{"max, s":>10}')
+        for name, stats in sorted(summary.items(), key=lambda item: item[1]["p95"], reverse=True):
+            print(f'{name:<28}{stats["count"]:>7}{stats["p50"]:>10.3f}{stats["p95"]:>10.3f}{stats["max"]:>10.3f}')
+
+        print("Slowest characters:")
+        for record in self.slowest(count):
+            top_stage = max(record["stages"].items(), key=lambda item: item[1], default=("-", 0.0))
+            attempts = f', {record["attempts"]} attempts' if record["attempts"] > 1 else ""
+            print(f'  {record["character"]}: {record["total"]:.2f} s (longest stage: {top_stage[0]}, {top_stage[1]:.2f} s{attempts})')
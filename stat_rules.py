@@ -0,0 +1,226 @@
+import pandas as pd
+import numpy as np
+
+import math
+import re
+
+NUMBER = r"\d+(?:\.\d+)?"
+
+
+def _fixed_value(n: int) -> str:
+    # The comment is whatever follows the number up to the next "/" ("(E1)", "if using Messenger")
+    return rf"(?P<fix{n}>{NUMBER})(?P<fix{n}_unit>%)?(?P<fix{n}_plus>\+)?\s*(?P<fix{n}_comment>[^/]*?)"
+
+
+# Rules for the value part of an endgame stat ("SPD: 134-145 (with E1)"), tried in order.
+# Every rule is matched once against the whole value and the first match wins. All rules
+# are anchored at both ends, so no rule can match a prefix and silently drop the rest:
+# text that is not a number ends up in a comment, or the value is kept as text.
+# (name, pattern, group that is always set when the rule matches)
+STAT_RULES = (
+    (
+        "slower than carry",
+        re.compile(r"^(?P<text>1-2 Speed slower than carry.*?)\s*/\s*(?P<min>\d+)(?P<plus>\+)?\s*(?P<min_comment>.*?)\s*$"),
+        "text",
+    ),
+    (
+        "slower than the carry",
+        re.compile(r"^(?P<text>1-2 Speed slower than the carry.*?),\s*(?P<min>\d+)(?P<plus>\+)?\s*(?P<min_comment>.*?)\s*$"),
+        "text",
+    ),
+    (
+        "base speed",
+        re.compile(rf"^(?P<text>Base Speed.*?)\s*/\s*(?P<fix1>{NUMBER})\s*(?P<fix1_comment>.*?)\s*$"),
+        "text",
+    ),
+    (
+        "range or fixed value",
+        re.compile(rf"^(?P<min>{NUMBER})(?P<min_unit>%)?\s*-\s*(?P<max>{NUMBER})(?P<max_unit>%)?(?P<plus>\+)?\s*(?P<max_comment>[^/]*?)\s*/\s*{_fixed_value(1)}\s*$"),
+        "min",
+    ),
+    (
+        "fixed values",
+        re.compile(rf"^{_fixed_value(1)}\s*/\s*{_fixed_value(2)}(?:\s*/\s*{_fixed_value(3)})?\s*$"),
+        "fix1",
+    ),
+    (
+        "range",
+        re.compile(rf"^(?P<min>{NUMBER})(?P<min_unit>%)?\s*(?P<min_comment>\(.*?\))?\s*-\s*(?P<max>{NUMBER})(?P<max_unit>%)?(?P<plus>\+)?\s*(?P<max_comment>.*?)\s*$"),
+        "min",
+    ),
+    (
+        "single value",
+        re.compile(rf"^(?P<min>{NUMBER})(?P<min_unit>%)?(?P<plus>\+)?\s*(?P<min_comment>.*?)\s*$"),
+        "min",
+    ),
+    (
+        "text",
+        re.compile(r"^(?P<text>.+)$", re.DOTALL),
+        "text",
+    ),
+)
+
+# All named groups of the rules, in a fixed order
+GROUPS = list(dict.fromkeys(name for _, pattern, _ in STAT_RULES for name in pattern.groupindex))
+
+NUMERIC_COLUMNS = ("min", "max", "fix1", "fix2", "fix3")
+COMMENT_COLUMNS = ("min_comment", "max_comment", "fix1_comment", "fix2_comment", "fix3_comment")
+
+# Columns of the frame returned by `characteristics_to_df` and `extract_stats`
+STAT_COLUMNS = [
+    "characteristic", "min", "max", "plus", "unit", "fix1", "fix2", "fix3",
+    "min comment", "max comment", "fix1 comment", "fix2 comment", "fix3 comment",
+    "text", "raw",
+]
+
+
+def match_stat(value: str) -> dict:
+    """
+    Matches the value of one endgame stat against the rules.
+
+    Args:
+        value (str): The part after "Characteristic:", stripped.
+
+    Returns:
+        dict: The named groups of the first matching rule (None for groups it does not set).
+        Empty for an empty value.
+    """
+    for _, pattern, _ in STAT_RULES:
+        match = pattern.match(value)
+        if match:
+            return match.groupdict()
+
+    return {}
+
+
+def split_stat(item: str) -> tuple[str, str]:
+    """
+    Splits "Characteristic: value" into the stripped name and value.
+    """
+    name, _, value = item.partition(":")
+
+    return name.strip(), value.strip()
+
+
+# Groups holding the plus sign and the unit of any value
+PLUS_GROUPS = [name for name in GROUPS if name.endswith("plus")]
+UNIT_GROUPS = [name for name in GROUPS if name.endswith("unit")]
+
+# dtypes of the columns that are not strings
+STAT_DTYPES = {**{column: np.float64 for column in NUMERIC_COLUMNS}, "plus": bool}
+
+
+def _number(value: str | None) -> float:
+    return float(value) if value else math.nan
+
+
+def stat_row(item: str) -> tuple:
+    """
+    Parses one "Characteristic: value" string into a row of STAT_COLUMNS.
+
+    Numbers are floats (NaN when missing), "plus" is True when any value has a plus sign,
+    "unit" is the first unit that is set ("%" or None). Empty groups count as missing.
+    """
+    name, value = split_stat(item)
+    groups = match_stat(value)
+    get = groups.get
+
+    return (
+        name,
+        _number(get("min")),
+        _number(get("max")),
+        any(get(group) for group in PLUS_GROUPS),
+        next((get(group) for group in UNIT_GROUPS if get(group)), None),
+        _number(get("fix1")),
+        _number(get("fix2")),
+        _number(get("fix3")),
+        *(get(group) or None for group in COMMENT_COLUMNS),
+        get("text") or None,
+        item,
+    )
+
+
+def parse_stat_strings(data: list[str]) -> pd.DataFrame:
+    """
+    Parses "Characteristic: value" strings; see `character_parser.characteristics_to_df`.
+
+    The rows are collected as plain tuples and the frame is built once at the end from
+    typed column arrays, so a handful of stats costs a few regex matches and one
+    DataFrame construction without any per-column conversion in pandas.
+
+    Returns:
+        pandas.DataFrame: Columns STAT_COLUMNS. "min", "max" and "fix1".."fix3" are floats,
+        "plus" is a bool, "unit" is "%" when a value is a percentage and None otherwise.
+    """
+    rows = [stat_row(item) for item in data]
+    columns = zip(*rows) if rows else [()] * len(STAT_COLUMNS)
+
+    return pd.DataFrame(
+        {name: np.array(values, dtype=STAT_DTYPES.get(name, object)) for name, values in zip(STAT_COLUMNS, columns)},
+        index=pd.RangeIndex(len(rows)),
+        copy=False,
+    )
+
+
+def extract_stats(raws: pd.Series) -> pd.DataFrame:
+    """
+    Parses many stats at once (e.g. the whole roster) into one frame.
+
+    This is the `parse_stat_strings` loop over all strings. Matching the rules with
+    `Series.str.extract` instead was slower: pandas runs one Python-level match per
+    string and rule anyway, and then pays for aligning and typing the extracted frames.
+
+    Args:
+        raws (pandas.Series): "Characteristic: value" strings. Missing values count as "".
+
+    Returns:
+        pandas.DataFrame: Columns STAT_COLUMNS, in the order of `raws` with the index reset to 0..n-1.
+    """
+    return parse_stat_strings(raws.astype(object).fillna("").astype(str).tolist())
+
+
+def roster_endgame_stats(raw_stats: dict[str, list[str]]) -> pd.DataFrame:
+    """
+    Parses the endgame stats of many characters into one table.
+
+    The raw strings of all characters are matched in a single `extract_stats` pass,
+    so comparing e.g. SPD thresholds across the roster needs no per-character frames.
+
+    Args:
+        raw_stats (dict): Character name -> list of "Characteristic: value" strings
+            (the "raw" column of a character's "endgame stats").
+
+    Returns:
+        pandas.DataFrame: A leading categorical "character" column followed by STAT_COLUMNS.
+        "characteristic" and "unit" are categorical, the value columns are floats.
+    """
+    characters = [char for char, raws in raw_stats.items() for _ in raws]
+    raws = pd.Series([raw for raws in raw_stats.values() for raw in raws], dtype=object)
+
+    frame = extract_stats(raws)
+    frame.insert(0, "character", pd.Categorical(characters, categories=list(raw_stats)))
+    frame["characteristic"] = frame["characteristic"].astype("category")
+    frame["unit"] = frame["unit"].astype("category")
+
+    return frame
+
+
+def raw_endgame_stats(results) -> dict[str, list[str]]:
+    """
+    Collects the raw endgame stat strings of saved characters.
+
+    Args:
+        results (dict): Character name -> result dictionary or `file_io.LazyResult`
+            (only the "endgame stats" section is read).
+
+    Returns:
+        dict: Character name -> list of raw strings, for `roster_endgame_stats`.
+    """
+    raw_stats = {}
+
+    for char, result in results.items():
+        endgame_stats = result.get("endgame stats")
+        if endgame_stats is not None and "raw" in endgame_stats:
+            raw_stats[char] = list(endgame_stats["raw"])
+
+    return raw_stats
@@ -0,0 +1,229 @@
+from text_utils import character_slug
+
+import numpy as np
+
+import itertools
+
+# Weight of a team whose usage is not shown on the page
+DEFAULT_WEIGHT = 1.0
+
+
+def _team_members(team) -> tuple[str, ...]:
+    # `records.Team` or a team dictionary of `character_parser.parse_teams`
+    members = team.members if hasattr(team, "members") else team.get("team", [])
+    return tuple(dict.fromkeys(character_slug(member) for member in members if member))
+
+
+def _team_usage(team) -> float | None:
+    return team.usage if hasattr(team, "usage") else team.get("usage")
+
+
+class TeamGraph:
+    """
+    Usage-weighted co-occurrence graph of the teams of all characters.
+
+    `matrix[i, j]` is the summed usage of the teams containing both `names[i]` and
+    `names[j]`, over the pages of all characters (a team listed on two pages counts twice).
+    The diagonal holds the summed usage of the teams containing a character. Next to
+    the matrix the graph keeps an adjacency index: member -> teams containing them,
+    where a team is the frozenset of its members with its summed usage, and
+    name -> characters listing it as synergy.
+
+    Every character adds the teams of its own page, so re-scraping a character
+    only subtracts its old teams and adds the new ones (`update_character`).
+
+    Pages name characters in different ways: team members come from links ("Silver-wolf"),
+    synergy from display names ("Silver Wolf"). Every name, stored or queried, is converted
+    with `text_utils.character_slug`, so the graph is keyed by the slug ("silver-wolf") like
+    the saved files.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.positions = {}
+        self.matrix = np.zeros((0, 0), dtype=np.float64)
+
+        self.team_weights = {}
+        self.team_members = {}
+        self.synergy = {}
+        self.synergy_index = {}
+        self._contributions = {}
+
+    def _position(self, name: str) -> int:
+        position = self.positions.get(name)
+        if position is not None:
+            return position
+
+        position = len(self.names)
+        self.names.append(name)
+        self.positions[name] = position
+
+        # Grow the matrix by doubling, so adding characters one by one stays cheap
+        if position >= len(self.matrix):
+            size = max(16, 2 * len(self.matrix))
+            matrix = np.zeros((size, size), dtype=np.float64)
+            matrix[:len(self.matrix), :len(self.matrix)] = self.matrix
+            self.matrix = matrix
+
+        return position
+
+    def _apply(self, members: frozenset, weight: float):
+        block = np.ix_(*[[self._position(member) for member in members]] * 2)
+        values = self.matrix[block] + weight
+        # Subtracting the teams of a re-scraped character leaves rounding noise instead of zeros
+        values[np.abs(values) < 1e-9] = 0.0
+        self.matrix[block] = values
+
+        total = self.team_weights.get(members, 0.0) + weight
+        if abs(total) < 1e-9:
+            self.team_weights.pop(members, None)
+            for member in members:
+                self.team_members[member].discard(members)
+        else:
+            self.team_weights[members] = total
+            for member in members:
+                self.team_members.setdefault(member, set()).add(members)
+
+    def remove_character(self, char: str):
+        """
+        Subtracts the teams and the synergy added from the page of a character.
+        """
+        char = character_slug(char)
+
+        for members, weight in self._contributions.pop(char, []):
+            self._apply(members, -weight)
+
+        for name in self.synergy.pop(char, []):
+            self.synergy_index[name].discard(char)
+
+    def update_character(self, char: str, teams: list, synergy: list[str] | None = None):
+        """
+        Replaces the teams and the synergy taken from the page of a character.
+
+        Args:
+            char (str): The character name.
+            teams (list): `records.Team` objects or the team dictionaries of `character_parser.parse_teams`.
+            synergy (list, optional): The names of `character_parser.parse_synergy`.
+        """
+        char = character_slug(char)
+        self.remove_character(char)
+
+        contributions = []
+        for team in teams:
+            members = frozenset(_team_members(team))
+            if not members:
+                continue
+
+            usage = _team_usage(team)
+            weight = float(usage) if usage is not None else DEFAULT_WEIGHT
+
+            self._apply(members, weight)
+            contributions.append((members, weight))
+
+        self._contributions[char] = contributions
+        self.synergy[char] = list(dict.fromkeys(character_slug(name) for name in synergy or [] if name))
+        for name in self.synergy[char]:
+            self.synergy_index.setdefault(name, set()).add(char)
+
+    @classmethod
+    def from_results(cls, results) -> "TeamGraph":
+        """
+        Builds the graph from saved characters.
+
+        Args:
+            results (dict): Character name -> result dictionary, `file_io.LazyResult`
+                or `records.CharacterRecord` (only the teams and synergy are read).
+
+        Returns:
+            TeamGraph: The graph.
+        """
+        graph = cls()
+
+        for char, result in results.items():
+            if hasattr(result, "teams"):
+                graph.update_character(char, result.teams, result.synergy)
+            else:
+                graph.update_character(char, result.get("teams (MoC)") or [], result.get("synergy"))
+
+        return graph
+
+    def top_partners(self, char: str, count: int = 10) -> list[tuple[str, float]]:
+        """
+        Returns the characters that share the most team usage with a character.
+
+        Returns:
+            list: (partner, summed usage of the shared teams), best first.
+        """
+        position = self.positions.get(character_slug(char))
+        if position is None:
+            return []
+
+        weights = self.matrix[position, :len(self.names)].copy()
+        weights[position] = 0.0
+
+        count = min(count, int(np.count_nonzero(weights > 0)))
+        if count == 0:
+            return []
+
+        best = np.argpartition(-weights, count - 1)[:count]
+        best = best[np.argsort(-weights[best], kind="stable")]
+
+        return [(self.names[i], float(weights[i])) for i in best]
+
+    def teams_containing(self, *members: str) -> list[tuple[tuple[str, ...], float]]:
+        """
+        Returns (members, summed usage) of every known team containing all given members,
+        by usage from the highest.
+        """
+        if not members:
+            return []
+
+        members = [character_slug(member) for member in members]
+        teams = set.intersection(*(self.team_members.get(member, set()) for member in members))
+
+        return sorted(
+            ((tuple(sorted(team)), self.team_weights[team]) for team in teams),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+
+    def best_team(self, *members: str, size: int = 4) -> tuple[tuple[str, ...], float, bool]:
+        """
+        Finds the best team of `size` characters containing all given members.
+
+        The known team with the highest summed usage wins. If no known team contains
+        all members, the free slots are filled one by one with the character that shares
+        the most usage with the members chosen so far, while anyone shares some.
+
+        Returns:
+            tuple: The members, their score (usage of the known team, or the summed pair
+            weights of the built one) and whether the team is a known one.
+        """
+        members = tuple(dict.fromkeys(character_slug(member) for member in members))
+        known = [(team, weight) for team, weight in self.teams_containing(*members) if len(team) == size]
+        if known:
+            return known[0][0], known[0][1], True
+
+        positions = [self.positions[member] for member in members if member in self.positions]
+        if len(positions) != len(members):
+            return tuple(members), 0.0, False
+
+        chosen = list(positions)
+        while len(chosen) < size:
+            weights = self.matrix[chosen, :len(self.names)].sum(axis=0)
+            weights[chosen] = 0.0
+
+            best = int(np.argmax(weights))
+            if weights[best] <= 0:
+                break
+            chosen.append(best)
+
+        score = sum(float(self.matrix[i, j]) for i, j in itertools.combinations(chosen, 2))
+
+        return tuple(self.names[i] for i in chosen), score, False
+
+    def synergy_of(self, char: str) -> list[str]:
+        """
+        Returns the characters whose page lists `char` in its "Synergy" section.
+        """
+        return sorted(self.synergy_index.get(character_slug(char), ()))
@@ -0,0 +1,83 @@
+from character_parser import parse_character_page
+from file_io import save_result
+from fixture_server import fixture_names, FIXTURES_DIR
+from text_utils import make_soup
+
+import pandas as pd
+
+import contextlib
+import pytest
+import io
+import os
+
+
+@pytest.fixture
+def sample_result():
+    """
+    A result dictionary shaped like the output of `character_parser.parse_character_page`.
+    """
+    return {
+        "light cones": pd.DataFrame({
+            "name": ["In the Night", "Cruising in the Stellar Sea"],
+            "%": ["100", "92.5"],
+            "rarity": ["5", "4"],
+            "superimposition": ["S1", "S5"],
+            "description": ["Signature", None],
+        }),
+        "relics": pd.DataFrame({
+            "name": ["Genius of Brilliant Stars"],
+            "%": ["100"],
+            "2 piece": ["Genius of Brilliant Stars"],
+            "4 piece": ["Genius of Brilliant Stars"],
+            "flex": [False],
+            "info": [None],
+        }),
+        "planar sets": pd.DataFrame({
+            "name": ["Rutilant Arena"],
+            "%": ["100"],
+            "2 piece": ["Rutilant Arena"],
+            "info": [None],
+        }),
+        "additional planar sets": {"Space Sealing Station": "Budget option"},
+        "relic main stats": pd.DataFrame({"Part": ["Body", "Feet"], "Stats": ["CRIT Rate, CRIT DMG", "SPD"]}),
+        "relic main stats dict": {"Body": {1: ["CRIT Rate", "CRIT DMG"]}, "Feet": {1: ["SPD"]}},
+        "substats": "CRIT Rate = CRIT DMG > SPD > ATK%",
+        "substats dict": {0: ["CRIT Rate", "CRIT DMG"], 1: ["SPD"], 2: ["ATK%"]},
+        "substats details": "",
+        "substats comments": "",
+        "endgame stats": pd.DataFrame({"characteristic": ["SPD"], "raw": ["SPD: 134-145"]}),
+        "traces priority": {"Skills priority": {1: ["Ultimate"], 2: ["Skill"]}, "Major Traces priority": {1: "Nocturne"}},
+        "synergy": ["Sparkle", "Tingyun"],
+        "teams (MoC)": [
+            {"team": ["Seele", "Sparkle", "Silver Wolf", "Fu Xuan"], "rank": 1, "usage": 12.5, "rounds": 3.2},
+            {"team": ["Seele", "Tingyun", "Pela", "Luocha"], "rank": None, "usage": None, "rounds": None},
+        ],
+        "element": "Quantum",
+    }
+
+
+@pytest.fixture(scope="session")
+def fixture_results():
+    """
+    Character slug -> result dictionary of every page in fixtures/pages.
+    """
+    results = {}
+
+    for name in fixture_names():
+        with open(os.path.join(FIXTURES_DIR, f"{name}.html"), 'r', encoding='utf-8') as file:
+            html = file.read()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results[name] = parse_character_page(make_soup(html))
+
+    return results
+
+
+@pytest.fixture
+def saved_fixtures(tmp_path, fixture_results):
+    """
+    A data directory with the fixture characters saved as pickles.
+    """
+    for name, result in fixture_results.items():
+        save_result(result, str(tmp_path / f"{name}.pickle"))
+
+    return tmp_path
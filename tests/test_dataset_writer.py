@@ -0,0 +1,31 @@
+from dataset_writer import build_section_tables, SECTION_TABLES
+from stat_rules import roster_endgame_stats, STAT_COLUMNS
+
+import pandas as pd
+
+
+def test_empty_roster():
+    tables = build_section_tables({})
+
+    assert set(tables) == set(SECTION_TABLES.values())
+    assert all(len(table) == 0 for table in tables.values())
+    assert list(tables["endgame_stats"].columns) == ["character"] + STAT_COLUMNS
+    assert isinstance(tables["endgame_stats"]["character"].dtype, pd.CategoricalDtype)
+
+
+def test_roster_without_endgame_stats(sample_result):
+    sample_result["endgame stats"] = pd.DataFrame({"characteristic": [], "raw": []})
+    tables = build_section_tables({"seele": sample_result})
+
+    assert len(tables["light_cones"]) == 2
+    assert len(tables["endgame_stats"]) == 0
+    assert list(tables["endgame_stats"].columns) == ["character"] + STAT_COLUMNS
+    assert list(roster_endgame_stats({"seele": []})["character"].cat.categories) == ["seele"]
+
+
+def test_endgame_stats_table(sample_result):
+    table = build_section_tables({"seele": sample_result, "kafka": sample_result})["endgame_stats"]
+
+    assert list(table["character"]) == ["seele", "kafka"]
+    assert list(table["min"]) == [134.0, 134.0]
+    assert list(table["max"]) == [145.0, 145.0]
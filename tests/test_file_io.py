@@ -0,0 +1,65 @@
+from file_io import (
+    load_result,
+    load_result_from_dir,
+    find_saved_results,
+    save_result,
+    save_result_to_dir,
+    LazyResult,
+    FILE_MODE,
+    DIR_MODE,
+)
+from migrate_pickles import results_equal
+
+import pytest
+import stat
+import os
+
+
+def test_save_and_load_dir_round_trip(tmp_path, sample_result):
+    dirname = str(tmp_path / "seele.hsr")
+
+    save_result_to_dir(sample_result, dirname)
+
+    assert os.path.exists(os.path.join(dirname, "meta.json"))
+    assert results_equal(sample_result, load_result_from_dir(dirname))
+
+
+def test_save_dir_replaces_previous_save(tmp_path, sample_result):
+    dirname = str(tmp_path / "seele.hsr")
+    save_result_to_dir(sample_result, dirname)
+
+    sample_result["synergy"] = ["Bronya"]
+    save_result_to_dir(sample_result, dirname, fsync_dir_now=False)
+
+    assert load_result_from_dir(dirname)["synergy"] == ["Bronya"]
+    assert os.listdir(tmp_path) == ["seele.hsr"]
+
+
+def test_save_result_by_extension(tmp_path, sample_result):
+    for name in ("seele.pickle", "seele.hsr"):
+        path = str(tmp_path / name)
+        save_result(sample_result, path)
+
+        assert results_equal(sample_result, load_result(path))
+
+
+def test_lazy_result_reads_single_section(tmp_path, sample_result):
+    save_result(sample_result, str(tmp_path / "seele.hsr"))
+
+    lazy = LazyResult(find_saved_results(str(tmp_path))["seele"])
+
+    assert lazy["teams (MoC)"] == sample_result["teams (MoC)"]
+    assert results_equal(sample_result, lazy.to_dict())
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="POSIX permissions")
+def test_saved_results_follow_the_umask(tmp_path, sample_result):
+    save_result(sample_result, str(tmp_path / "seele.pickle"))
+    save_result(sample_result, str(tmp_path / "seele.hsr"))
+    umask = os.umask(0)
+    os.umask(umask)
+
+    assert FILE_MODE == 0o666 & ~umask
+    assert stat.S_IMODE(os.stat(tmp_path / "seele.pickle").st_mode) == FILE_MODE
+    assert stat.S_IMODE(os.stat(tmp_path / "seele.hsr").st_mode) == DIR_MODE
+    assert stat.S_IMODE(os.stat(tmp_path / "seele.hsr" / "meta.json").st_mode) == FILE_MODE
@@ -0,0 +1,61 @@
+from character_parser import find_element_from_page, has_build_sections, page_has_build_sections, parse_character_page
+from benchmarks.bench_parsers import corpus_hash, BASELINE_PATH
+from fixture_server import fixture_names, FIXTURES_DIR
+from text_utils import make_soup
+
+import importlib.util
+import json
+import os
+import pytest
+
+spec = importlib.util.spec_from_file_location("synthetic_pages", os.path.join("fixtures", "synthetic_pages.py"))
+synthetic_pages = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(synthetic_pages)
+
+
+def read_page(name):
+    with open(os.path.join(FIXTURES_DIR, f"{name}.html"), 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def test_committed_pages_are_up_to_date():
+    assert fixture_names() == sorted(synthetic_pages.CHARACTERS)
+
+    for name, character in synthetic_pages.CHARACTERS.items():
+        assert read_page(name) == synthetic_pages.character_page(name, character)
+
+
+@pytest.mark.parametrize("name", sorted(synthetic_pages.CHARACTERS))
+def test_parse_fixture_page(name):
+    character = synthetic_pages.CHARACTERS[name]
+    soup = make_soup(read_page(name))
+
+    assert find_element_from_page(soup) == character["element"]
+    assert has_build_sections(soup, character["element"])
+    assert page_has_build_sections(read_page(name))
+
+    result = parse_character_page(soup)
+
+    assert list(result["light cones"]["name"]) == [cone[0] for cone in character["light cones"]]
+    assert list(result["relics"]["name"]) == [relic[0] for relic in character["relics"]]
+    assert list(result["planar sets"]["name"]) == [planar_set[0] for planar_set in character["planar sets"]]
+    assert list(result["endgame stats"]["raw"]) == character["endgame stats"]
+    assert result["synergy"] == character["synergy"]
+    assert [team["usage"] for team in result["teams (MoC)"]] == [float(team[1].rstrip('%')) for team in character["teams"]]
+
+
+@pytest.mark.parametrize("html", [
+    '<div class="tabs"><div class="single-tab Ice active">Profile</div></div>',
+    '<div class="content-header Ice">Best Light Cones</div><div class="build-stats-old"></div>',
+    '<div class="content-header Ice">Best Light Cones</div><div data-class="build-stats"></div>',
+    '<div class="build-stats"></div>',
+])
+def test_page_without_build_sections(html):
+    assert not page_has_build_sections(html)
+
+
+def test_baseline_is_recorded_on_the_committed_pages():
+    with open(BASELINE_PATH, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    assert baseline["corpus sha256"] == corpus_hash(FIXTURES_DIR)
@@ -0,0 +1,63 @@
+from html_cache import HtmlCache
+
+import os
+
+URL = "https://www.prydwen.gg/star-rail/characters/"
+
+
+def test_put_and_get(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put(URL + "kafka", "<html>kafka\r\n</html>")
+
+    assert cache.get(URL + "kafka") == "<html>kafka\r\n</html>"
+    assert cache.get(URL + "seele") is None
+    assert HtmlCache(str(tmp_path)).urls() == [URL + "kafka"]
+
+
+def test_same_content_is_stored_once(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put(URL + "kafka", "<html></html>")
+    cache.put(URL + "seele", "<html></html>")
+
+    assert len(os.listdir(tmp_path / "objects")) == 1
+
+    cache.put(URL + "kafka", "<html>new</html>")
+    cache.put(URL + "seele", "<html>new</html>")
+
+    assert len(os.listdir(tmp_path / "objects")) == 1
+
+
+def test_expired_entries(tmp_path, monkeypatch):
+    cache = HtmlCache(str(tmp_path), ttl=60)
+    cache.put(URL + "kafka", "<html></html>")
+
+    now = os.path.getmtime(tmp_path / "index.json")
+    monkeypatch.setattr("html_cache.time.time", lambda: now + 120)
+
+    assert cache.get(URL + "kafka") is None
+    assert cache.urls() == []
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr("html_cache.time.time", lambda: next(clock))
+
+    cache = HtmlCache(str(tmp_path), ttl=0, max_bytes=25)
+    cache.put(URL + "kafka", "k" * 10)
+    cache.put(URL + "seele", "s" * 10)
+    cache.get(URL + "kafka")
+    cache.put(URL + "jingliu", "j" * 10)
+
+    assert cache.urls() == [URL + "jingliu", URL + "kafka"]
+    assert len(os.listdir(tmp_path / "objects")) == 2
+
+
+def test_missing_object_is_a_miss(tmp_path):
+    cache = HtmlCache(str(tmp_path))
+    cache.put(URL + "kafka", "<html></html>")
+
+    for name in os.listdir(tmp_path / "objects"):
+        os.remove(tmp_path / "objects" / name)
+
+    assert cache.get(URL + "kafka") is None
+    assert cache.urls() == []
@@ -0,0 +1,46 @@
+from job_journal import JobJournal
+
+
+def test_resume_returns_unfinished_characters_in_order(tmp_path):
+    journal = JobJournal(str(tmp_path / "journal.jsonl"))
+    journal.start(["seele", "kafka", "jingliu", "bronya"])
+
+    journal.pending("seele")
+    journal.finish("seele")
+    journal.pending("kafka")
+    journal.finish("kafka", failed=True, reason="TimeoutException: page")
+    journal.pending("jingliu")
+
+    resumed = JobJournal(str(tmp_path / "journal.jsonl"))
+
+    assert resumed.resume() == ["kafka", "jingliu", "bronya"]
+    assert resumed.read()[1]["kafka"] == {"status": "failed", "reason": "TimeoutException: page", "attempt": 1}
+
+
+def test_attempts_continue_after_resume(tmp_path):
+    journal = JobJournal(str(tmp_path / "journal.jsonl"))
+    journal.start(["kafka"])
+    journal.pending("kafka")
+
+    resumed = JobJournal(str(tmp_path / "journal.jsonl"))
+    resumed.resume()
+    resumed.pending("kafka")
+    resumed.finish("kafka")
+
+    assert resumed.read()[1]["kafka"] == {"status": "done", "reason": None, "attempt": 2}
+    assert resumed.resume() == []
+
+
+def test_only_the_last_run_counts_and_cut_lines_are_skipped(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    journal = JobJournal(str(path))
+    journal.start(["seele"])
+    journal.start(["kafka", "jingliu"])
+    journal.pending("kafka")
+    journal.finish("kafka")
+
+    with open(path, 'a', encoding='utf-8') as file:
+        file.write('{"character": "jingliu", "sta')
+
+    assert JobJournal(str(path)).resume() == ["jingliu"]
+    assert JobJournal(str(tmp_path / "missing.jsonl")).resume() == []
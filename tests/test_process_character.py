@@ -0,0 +1,141 @@
+from fixture_server import start_fixture_server
+from http_fetcher import fetch_character_page, BuildDataNotFoundError
+from retry_policy import is_retryable
+import http_fetcher
+import main
+
+import requests
+import pytest
+import shutil
+import time
+import os
+
+
+@pytest.fixture
+def fixture_site(tmp_path):
+    shutil.copy("fixtures/pages/kafka.html", tmp_path / "kafka.html")
+    with open(tmp_path / "profile-only.html", 'w', encoding='utf-8') as file:
+        file.write('<html><body><div class="tabs"><div class="single-tab Ice active">Profile</div></div></body></html>')
+
+    server = start_fixture_server(str(tmp_path))
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def options(fixture_site, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return {**main.DEFAULT_OPTIONS, "mode": "http", "base_url": fixture_site, "retry_backoff": 0.0, "max_retries": 2}
+
+
+@pytest.fixture
+def fetches(monkeypatch):
+    urls = []
+    fetch = main.fetch_character_page
+
+    def counting_fetch(url, *args, **kwargs):
+        urls.append(url)
+        return fetch(url, *args, **kwargs)
+
+    monkeypatch.setattr(main, "fetch_character_page", counting_fetch)
+    return urls
+
+
+def test_missing_build_data_in_http_mode_is_not_retried(options, fetches):
+    with requests.Session() as http_session:
+        status, _, failure = main.process_character("profile-only", 0, 1, None, http_session, options)
+
+    assert status == "failed"
+    assert failure[0] == "build data not found"
+    assert not is_retryable(failure[0])
+    assert len(fetches) == 1
+
+
+def test_write_errors_retry_only_the_save(options, fetches, monkeypatch):
+    saves = []
+    save_character = main.save_character
+
+    def flaky_save(char, *args, **kwargs):
+        saves.append(char)
+        if len(saves) < 3:
+            raise OSError("disk full")
+        save_character(char, *args, **kwargs)
+
+    monkeypatch.setattr(main, "save_character", flaky_save)
+
+    with requests.Session() as http_session:
+        status, _, failure = main.process_character("kafka", 0, 1, None, http_session, options)
+
+    assert (status, failure) == ("refreshed", None)
+    assert len(saves) == 3
+    assert len(fetches) == 1
+
+
+def test_write_error_after_the_last_retry(options, fetches, monkeypatch):
+    def failing_save(char, *args, **kwargs):
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(main, "save_character", failing_save)
+
+    with requests.Session() as http_session:
+        status, _, failure = main.process_character("kafka", 0, 1, None, http_session, options)
+
+    assert status == "failed"
+    assert failure == ("write error", "read-only file system")
+    assert not is_retryable(failure[0])
+    assert len(fetches) == 1
+
+
+def test_unparsed_fetch_does_not_build_a_soup(fixture_site, monkeypatch):
+    def make_soup(*args, **kwargs):
+        raise AssertionError("the page was parsed")
+
+    monkeypatch.setattr(http_fetcher, "make_soup", make_soup)
+
+    with requests.Session() as http_session:
+        html, soup = fetch_character_page(f"{fixture_site}/star-rail/characters/kafka", None, "http", http_session, parse=False)
+        assert "build-stats" in html and soup is None
+
+        with pytest.raises(BuildDataNotFoundError):
+            fetch_character_page(f"{fixture_site}/star-rail/characters/profile-only", None, "http", http_session, parse=False)
+
+
+def test_incremental_run_reuses_the_conditional_response(fixture_site, options, tmp_path, monkeypatch):
+    downloads = []
+    monkeypatch.setattr(http_fetcher, "fetch_character_html_with_requests", lambda url, *args, **kwargs: downloads.append(url))
+
+    manifest = {}
+    with requests.Session() as http_session:
+        status, entry, _ = main.process_character("kafka", 0, 1, None, http_session, options, manifest=manifest)
+        assert status == "refreshed" and entry["content hash"]
+        assert downloads == []
+        manifest["kafka"] = entry
+
+        # Not modified since: answered with 304
+        status, _, _ = main.process_character("kafka", 0, 1, None, http_session, options, manifest=manifest)
+        assert status == "skipped"
+
+        # A new copy of the page with the same build data is parsed, but not saved again
+        page = tmp_path / "kafka.html"
+        html = page.read_text(encoding='utf-8')
+        page.write_text(html.replace("</body>", "<script>window.build = 2;</script></body>"), encoding='utf-8')
+        os.utime(page, (time.time() + 10, time.time() + 10))
+        monkeypatch.setattr(main, "save_character", lambda *args, **kwargs: pytest.fail("saved unchanged build data"))
+
+        status, entry, _ = main.process_character("kafka", 0, 1, None, http_session, options, manifest=manifest)
+        assert status == "skipped" and entry["content hash"] == manifest["kafka"]["content hash"]
+
+
+def test_incremental_run_saves_changed_build_data(fixture_site, options, tmp_path):
+    manifest = {}
+    with requests.Session() as http_session:
+        _, manifest["kafka"], _ = main.process_character("kafka", 0, 1, None, http_session, options, manifest=manifest)
+
+        page = tmp_path / "kafka.html"
+        page.write_text(page.read_text(encoding='utf-8').replace("Ruan Mei</span>", "Robin</span>"), encoding='utf-8')
+        os.utime(page, (time.time() + 10, time.time() + 10))
+
+        status, entry, _ = main.process_character("kafka", 0, 1, None, http_session, options, manifest=manifest)
+
+    assert status == "refreshed"
+    assert entry["content hash"] != manifest["kafka"]["content hash"]
@@ -0,0 +1,39 @@
+from character_parser import TabNotFoundError
+from http_fetcher import BuildDataNotFoundError
+from retry_policy import classify_failure, is_retryable, backoff_delay
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+import requests
+import pytest
+
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+@pytest.mark.parametrize("error, stage, failure_class, retried", [
+    (TimeoutException(), "fetch", "navigation timeout", True),
+    (requests.ReadTimeout(), "fetch", "navigation timeout", True),
+    (TabNotFoundError(), "fetch", "tab not found", True),
+    (BuildDataNotFoundError(), "fetch", "build data not found", False),
+    (WebDriverException(), "fetch", "network error", True),
+    (requests.ConnectionError(), "fetch", "network error", True),
+    (http_error(503), "fetch", "network error", True),
+    (http_error(429), "fetch", "network error", True),
+    (http_error(404), "fetch", "http error", False),
+    (ValueError(), "parse", "parse error", False),
+    (OSError(), "save", "write error", False),
+    (ValueError(), "fetch", "unknown", False),
+])
+def test_classify_failure(error, stage, failure_class, retried):
+    assert classify_failure(error, stage) == failure_class
+    assert is_retryable(failure_class) == retried
+
+
+def test_backoff_delay_doubles_up_to_the_cap():
+    for attempt, bound in ((1, 2.0), (2, 4.0), (3, 8.0), (10, 60.0)):
+        delays = [backoff_delay(attempt, base=2.0, cap=60.0) for _ in range(200)]
+        assert all(0 <= delay <= bound for delay in delays)
+        assert max(delays) > bound / 2
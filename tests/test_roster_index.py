@@ -0,0 +1,62 @@
+from file_io import save_result
+from roster_index import RosterIndex
+
+import os
+
+
+def test_percentages_with_and_without_sign(saved_fixtures):
+    index = RosterIndex(str(saved_fixtures))
+
+    assert index.characters_with_light_cone("In the Night") == [("seele", 0, 100.0)]
+    assert index.characters_with_relic("Musketeer of Wild Wheat") == [("seele", 1, 90.0)]
+    assert sorted(index.characters_with_planar_set("Rutilant Arena")) == [("jingliu", 0, 100.0), ("seele", 0, 100.0)]
+
+
+def test_best_planar_sets_by_percentage(saved_fixtures):
+    index = RosterIndex(str(saved_fixtures))
+
+    assert index.best_planar_sets("Lightning") == [
+        ("Firmament Frontline: Glamoth", 100.0, 1),
+        ("Space Sealing Station", 90.0, 1),
+    ]
+    assert index.best_planar_sets("Quantum")[0] == ("Rutilant Arena", 100.0, 1)
+
+
+def test_queries_accept_any_name_form(saved_fixtures):
+    index = RosterIndex(str(saved_fixtures))
+
+    assert index.character("Seele").element == "Quantum"
+    assert index.characters_by_element("Lightning") == ["kafka"]
+    assert [team.rank for team in index.teams_of("kafka")] == [1, 2]
+    assert [char for char, _ in index.teams_containing("Silver Wolf")] == ["seele"]
+    assert [team.usage for _, team in index.teams_containing("kafka", "black-swan")] == [22.3, 9.4]
+    assert index.top_partners("kafka", count=1)[0][0] == "black-swan"
+    assert index.best_planar_sets("Quantum", characters=["Seele", "Silver Wolf"])[0] == ("Rutilant Arena", 100.0, 1)
+    assert index.best_planar_sets("Quantum", characters=["Silver Wolf"]) == []
+
+
+def test_reload(saved_fixtures, fixture_results):
+    index = RosterIndex(str(saved_fixtures))
+    assert index.reload() == []
+
+    (saved_fixtures / "jingliu.pickle").unlink()
+    result = dict(fixture_results["seele"], **{"teams (MoC)": [{"team": ["seele", "bronya"], "rank": 1, "usage": 3.0, "rounds": None}]})
+    save_result(result, str(saved_fixtures / "seele.pickle"))
+    os.utime(saved_fixtures / "seele.pickle", ns=(1, 1))
+
+    assert sorted(index.reload()) == ["jingliu", "seele"]
+    assert index.character("jingliu") is None
+    assert index.characters_by_element("Ice") == []
+    assert index.characters_with_relic("Hunter of Glacial Forest") == []
+    assert [char for char, _ in index.teams_containing("bronya")] == ["seele"]
+    assert index.teams_containing("silver-wolf") == []
+    assert index.top_partners("seele") == [("bronya", 3.0)]
+
+
+def test_check_interval_reloads_on_query(saved_fixtures):
+    index = RosterIndex(str(saved_fixtures), check_interval=0)
+
+    (saved_fixtures / "kafka.pickle").unlink()
+
+    assert index.character("kafka") is None
+    assert index.characters_by_element("Lightning") == []
@@ -0,0 +1,52 @@
+from records import CharacterRecord
+from sqlite_store import SQLiteStore
+
+import pytest
+
+
+@pytest.fixture
+def store(tmp_path, fixture_results):
+    with SQLiteStore(str(tmp_path / "characters.sqlite")) as store:
+        for name, result in fixture_results.items():
+            store.upsert_character(name, result)
+        yield store
+
+
+def rows(store, query, *params):
+    return store.connection.execute(query, params).fetchall()
+
+
+def test_queries(store):
+    assert store.characters_by_element("Lightning") == ["kafka"]
+    assert store.has_character("seele") and not store.has_character("bronya")
+    assert store.characters_with_light_cone("Patience Is All You Need") == [("kafka", "100")]
+
+    teams = store.teams_containing("Black-swan")
+    assert [team["character"] for team in teams] == ["kafka", "kafka"]
+    assert teams[0]["team"] == ["Kafka", "Black-swan", "Ruan-mei", "Huohuo"]
+    assert teams[0]["usage"] >= teams[1]["usage"]
+
+
+def test_rows_match_the_character_record(store, fixture_results):
+    record = CharacterRecord.from_result(fixture_results["kafka"], "kafka")
+    character_id = rows(store, "SELECT id FROM characters WHERE name = ?", "kafka")[0][0]
+
+    traces = rows(store, "SELECT kind, priority, name FROM traces WHERE character_id = ?", character_id)
+    assert traces == [(trace.kind, trace.priority, trace.name) for trace in record.traces]
+
+    main_stats = rows(store, "SELECT part, priority, stat FROM main_stats WHERE character_id = ?", character_id)
+    assert main_stats == [(main_stat.part, main_stat.priority, main_stat.stat) for main_stat in record.main_stats]
+
+    endgame_stats = rows(store, "SELECT characteristic, raw FROM endgame_stats WHERE character_id = ? ORDER BY position", character_id)
+    assert [raw for _, raw in endgame_stats] == record.endgame_stats
+    assert endgame_stats[1] == ("SPD", "SPD: 134-145 (with E1)")
+
+
+def test_upsert_replaces_the_rows_of_a_character(store, fixture_results):
+    result = {**fixture_results["kafka"], "synergy": ["Robin"], "teams (MoC)": []}
+    store.upsert_character("kafka", result)
+
+    assert rows(store, "SELECT COUNT(*) FROM characters") == [(len(fixture_results),)]
+    assert rows(store, "SELECT s.name FROM synergy s JOIN characters c ON c.id = s.character_id WHERE c.name = 'kafka'") == [("Robin",)]
+    assert store.teams_containing("Black-swan") == []
+    assert rows(store, "SELECT COUNT(*) FROM team_members tm LEFT JOIN teams t ON t.id = tm.team_id WHERE t.id IS NULL") == [(0,)]
@@ -0,0 +1,53 @@
+from stage_timing import StageLog, add_stage, stage
+
+import contextlib
+import json
+import io
+
+
+def test_attempts_of_a_character_are_merged(tmp_path):
+    log = StageLog(str(tmp_path / "timings.jsonl"))
+
+    # Only the stages are made up, the totals are the real (short) durations of the blocks
+    for attempt, seconds in ((1, 1.0), (2, 2.0), (3, 3.0)):
+        with log.character("kafka", attempt=attempt) as record:
+            add_stage("driver.get", seconds)
+            record["total"] += seconds
+    with log.character("seele") as record:
+        add_stage("driver.get", 0.5)
+        record["total"] += 0.5
+        with stage("save"):
+            pass
+
+    summary = log.summary()
+    assert summary["total"]["count"] == 2
+    assert summary["driver.get"]["count"] == 2
+    assert summary["driver.get"]["max"] == 6.0
+    assert summary["save"]["count"] == 1
+
+    slowest = log.slowest()
+    assert [record["character"] for record in slowest] == ["kafka", "seele"]
+    assert slowest[0]["attempts"] == 3
+    assert slowest[0]["stages"] == {"driver.get": 6.0}
+
+    with open(tmp_path / "timings.jsonl", 'r', encoding='utf-8') as file:
+        assert [json.loads(line)["attempt"] for line in file] == [1, 2, 3, 1]
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        log.print_summary()
+    assert output.getvalue().count("kafka") == 1
+    assert "3 attempts" in output.getvalue()
+
+
+def test_record_continued_by_another_block():
+    log = StageLog()
+
+    with log.character("kafka", final=False, attempt=2) as record:
+        add_stage("driver.get", 1.0)
+    with log.character("kafka", record):
+        add_stage("save", 0.5)
+
+    assert log.records == [record]
+    assert record["attempt"] == 2
+    assert log.per_character()[0]["stages"] == {"driver.get": 1.0, "save": 0.5}
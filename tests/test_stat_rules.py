@@ -0,0 +1,123 @@
+from stat_rules import extract_stats, parse_stat_strings, NUMERIC_COLUMNS
+
+import pandas as pd
+import pytest
+import re
+
+# Real endgame stat strings and the columns the rules set for them
+# (NaN, None and False columns are left out).
+CASES = [
+    (
+        "ATK: 3000-3400",
+        {"min": 3000.0, "max": 3400.0},
+    ),
+    (
+        "CRIT Rate: 70-80%",
+        {"min": 70.0, "max": 80.0, "unit": "%"},
+    ),
+    (
+        "CRIT DMG: 160%+",
+        {"min": 160.0, "plus": True, "unit": "%"},
+    ),
+    (
+        "SPD: 134 / 160+ if using Messenger",
+        {"fix1": 134.0, "fix2": 160.0, "plus": True, "fix2 comment": "if using Messenger"},
+    ),
+    (
+        "SPD: 120-134 / 160",
+        {"min": 120.0, "max": 134.0, "fix1": 160.0},
+    ),
+    (
+        "SPD: 134-145 (with E1)",
+        {"min": 134.0, "max": 145.0, "max comment": "(with E1)"},
+    ),
+    (
+        "Effect Hit Rate: 0-70% (depends on the enemy)",
+        {"min": 0.0, "max": 70.0, "unit": "%", "max comment": "(depends on the enemy)"},
+    ),
+    (
+        "SPD: Base Speed / 134",
+        {"text": "Base Speed", "fix1": 134.0},
+    ),
+    (
+        "SPD: 1-2 Speed slower than the carry, 134+ (with Bronya)",
+        {"text": "1-2 Speed slower than the carry", "min": 134.0, "plus": True, "min comment": "(with Bronya)"},
+    ),
+    (
+        "SPD: 1-2 Speed slower than carry / 134+ (E0)",
+        {"text": "1-2 Speed slower than carry", "min": 134.0, "plus": True, "min comment": "(E0)"},
+    ),
+    (
+        "Energy Regen Rate: 19.4%",
+        {"min": 19.4, "unit": "%"},
+    ),
+    (
+        "HP: 4000+",
+        {"min": 4000.0, "plus": True},
+    ),
+    (
+        "Break Effect: 180% (with Ruan Mei) / 250% (without)",
+        {"fix1": 180.0, "fix2": 250.0, "unit": "%", "fix1 comment": "(with Ruan Mei)", "fix2 comment": "(without)"},
+    ),
+    (
+        # The original parser dropped the third value here
+        "SPD: 134 (E0) / 160 (E2) / 171",
+        {"fix1": 134.0, "fix2": 160.0, "fix3": 171.0, "fix1 comment": "(E0)", "fix2 comment": "(E2)"},
+    ),
+    (
+        "Effect RES: 30%+ (if no abundance)",
+        {"min": 30.0, "plus": True, "unit": "%", "min comment": "(if no abundance)"},
+    ),
+    (
+        "DEF: Enough to survive",
+        {"text": "Enough to survive"},
+    ),
+    (
+        # The original parser dropped "with buffs"
+        "ATK: 3200+ with buffs",
+        {"min": 3200.0, "plus": True, "min comment": "with buffs"},
+    ),
+]
+
+EMPTY = {
+    "min": None, "max": None, "plus": False, "unit": None, "fix1": None, "fix2": None, "fix3": None,
+    "min comment": None, "max comment": None, "fix1 comment": None, "fix2 comment": None, "fix3 comment": None,
+    "text": None,
+}
+
+
+def set_columns(row: dict) -> dict:
+    return {
+        column: value for column, value in row.items()
+        if column not in ("characteristic", "raw") and value is not None and value is not False and not pd.isna(value)
+    }
+
+
+@pytest.mark.parametrize("raw, expected", CASES, ids=[case[0] for case in CASES])
+def test_stat_rules(raw, expected):
+    row = parse_stat_strings([raw]).iloc[0].to_dict()
+
+    assert row["characteristic"] == raw.partition(":")[0]
+    assert row["raw"] == raw
+    assert set_columns(row) == expected
+
+
+@pytest.mark.parametrize("raw, expected", CASES, ids=[case[0] for case in CASES])
+def test_no_value_is_dropped(raw, expected):
+    # Every number of the value is kept, either as a number or inside a comment or text
+    row = parse_stat_strings([raw]).iloc[0].to_dict()
+    kept_numbers = {row[column] for column in NUMERIC_COLUMNS if not pd.isna(row[column])}
+    kept_text = " ".join(str(value) for column, value in row.items() if column.endswith("comment") or column == "text")
+
+    for number in re.findall(r"\d+(?:\.\d+)?", raw.partition(":")[2]):
+        assert float(number) in kept_numbers or number in kept_text
+
+
+def test_extract_stats_matches_per_stat_parsing():
+    raws = [case[0] for case in CASES] + ["No colon", ""]
+
+    pd.testing.assert_frame_equal(extract_stats(pd.Series(raws)), parse_stat_strings(raws))
+
+
+def test_empty_value():
+    assert set_columns(parse_stat_strings(["SPD:"]).iloc[0].to_dict()) == {}
@@ -0,0 +1,62 @@
+from team_graph import TeamGraph
+
+import pytest
+
+
+@pytest.fixture
+def graph(fixture_results):
+    return TeamGraph.from_results(fixture_results)
+
+
+def test_names_are_slugs(graph):
+    assert "kafka" in graph.names
+    assert "silver-wolf" in graph.names
+    assert all(name == name.lower() and " " not in name for name in graph.names)
+
+
+def test_top_partners(graph):
+    partners = graph.top_partners("kafka", count=2)
+
+    assert [name for name, _ in partners] == ["black-swan", "huohuo"]
+    assert partners[0][1] == pytest.approx(22.3 + 9.4)
+    assert graph.top_partners("Kafka") == graph.top_partners("kafka")
+    assert graph.top_partners("nobody") == []
+
+
+def test_teams_containing(graph):
+    teams = graph.teams_containing("Kafka", "Black Swan")
+
+    assert teams == [
+        (("black-swan", "huohuo", "kafka", "ruan-mei"), pytest.approx(22.3)),
+        (("black-swan", "fu-xuan", "kafka", "sparkle"), pytest.approx(9.4)),
+    ]
+    assert graph.teams_containing("seele", "kafka") == []
+
+
+def test_best_team(graph):
+    assert graph.best_team("seele", "Silver Wolf") == (("fu-xuan", "seele", "silver-wolf", "sparkle"), pytest.approx(12.5), True)
+
+    members, _, known = graph.best_team("jingliu", "kafka")
+    assert not known
+    assert members[:2] == ("jingliu", "kafka")
+    assert len(members) == 4
+
+
+def test_synergy_of(graph):
+    assert graph.synergy_of("Silver-wolf") == ["seele"]
+    assert graph.synergy_of("black swan") == ["kafka"]
+
+
+def test_update_and_remove_character(graph, fixture_results):
+    graph.update_character("Kafka", [{"team": ["kafka", "sparkle"], "usage": 5.0}], ["Sparkle"])
+
+    assert graph.top_partners("kafka") == [("sparkle", pytest.approx(5.0))]
+    assert graph.synergy_of("sparkle") == ["kafka", "seele"]
+
+    graph.remove_character("kafka")
+    graph.remove_character("seele")
+    graph.remove_character("jingliu")
+
+    assert not graph.matrix.any()
+    assert graph.team_weights == {}
+    assert graph.synergy_of("sparkle") == []
@@ -1,5 +1,11 @@
+from stage_timing import timed
+
+from bs4 import BeautifulSoup
 import re
 
+# BeautifulSoup tree builders that can be selected with --parser
+PARSER_BACKENDS = ("html.parser", "lxml", "html5lib")
+
 def clean_text(text):
     """
     Clean the text by removing spaces before punctuation marks (dots, commas, etc.)
@@ -17,6 +23,25 @@ def clean_text(text):
     return ""
 
 
+def character_slug(name):
+    """
+    Convert a character name to the slug of its page URL, the key used for characters
+    everywhere else (file names, the roster index, the team graph).
+
+    Team members are read from links ("silver-wolf", capitalized to "Silver-wolf")
+    and synergy from display names ("Silver Wolf"); all of them map to "silver-wolf".
+
+    Args:
+        name (str): A display name, a slug or a capitalized slug
+
+    Returns:
+        str: The slug
+    """
+    name = name.lower().replace('&', ' and ')
+
+    return re.sub(r'[^0-9a-z]+', '-', name).strip('-')
+
+
 def get_text_with_spaces(tag):
     """
     Get the text content of a tag, recursively joining all its stripped strings, adding spaces between them.
@@ -30,4 +55,19 @@ def get_text_with_spaces(tag):
     if tag:
         return clean_text(' '.join(tag.stripped_strings))
     
-    return ""
\ No newline at end of file
+    return ""
+
+
+@timed("soup")
+def make_soup(html, parser="html.parser"):
+    """
+    Parse an HTML document with the selected BeautifulSoup backend.
+
+    Args:
+        html (str): The HTML to parse
+        parser (str): One of PARSER_BACKENDS. "lxml" is the fastest, "html5lib" the most lenient.
+
+    Returns:
+        bs4.BeautifulSoup: The parsed document
+    """
+    return BeautifulSoup(html, parser)
\ No newline at end of file